@@ -3,6 +3,7 @@ import os
 from telebot.async_telebot import AsyncTeleBot
 from telebot.types import Message
 from app.controllers.bot_controller import BotController
+from app.database.instrumentation import instrumented
 
 
 load_dotenv()
@@ -30,6 +31,7 @@ async def start_command(message: Message):
 # Проверка кода
 @bot.message_handler(func=lambda message: \
     user_states.get(message.from_user.id) == 'waiting_for_code')
+@instrumented('bot.auth_code_handler')
 async def auth_code_handler(message: Message):
     """Обработчик получения кода авторизации"""
     chat_id = message.from_user.id
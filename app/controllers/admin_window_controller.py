@@ -1,5 +1,9 @@
 from datetime import datetime
 from app.database.session import get_session
+from app.database.instrumentation import instrumented
+from app.database.repositories.pagination import Page
+from app.database.table_specs import TABLES
+from app.services.export import export_table, ExportCancelled
 from app.database.repositories import (AdminRepository, UserRepository,
                                        PublicationRepository, PublisherRepository,
                                        IssueRepository, CourierRepository,
@@ -28,6 +32,7 @@ class AdminController:
     
     # --- Методы аутентификации и управления администраторами ---
     
+    @instrumented()
     def authenticate_admin(self, phone_number, password):
         """
         Аутентификация администратора
@@ -45,6 +50,7 @@ class AdminController:
             print(f"Ошибка аутентификации: {err}")
             return None
     
+    @instrumented()
     def create_admin(self, admin_data):
         """
         Создает нового администратора
@@ -64,116 +70,134 @@ class AdminController:
     
     # --- Методы для получения данных таблиц ---
     
-    def get_table_data(self, table_name):
+    @instrumented()
+    def get_table_data(self, table_name, after=None, limit=100, sort_column=0,
+                       descending=False, filters=None):
         """
-        Получает данные для указанной таблицы
+        Получает страницу данных указанной таблицы
+        
+        Сортировка, фильтрация и разбиение на страницы выполняются в БД.
+        Метод можно вызывать из рабочего потока: каждый вызов открывает
+        собственную сессию чтения (реплика, если настроена).
         
         Args:
             table_name (str): Название таблицы
+            after (str, optional): Курсор следующей страницы из предыдущего результата
+            limit (int): Количество строк на странице
+            sort_column (int): Индекс столбца сортировки (0 - ID), один из get_sortable_columns
+            descending (bool): Сортировка по убыванию
+            filters (dict, optional): {индекс столбца: текст фильтра}, столбцы -
+                из get_filter_columns
             
         Returns:
-            tuple: (headers, data)
+            tuple: (headers, page) - page содержит отформатированные строки, next_cursor и total
         """
+        spec = TABLES.get(table_name)
+        if spec is None:
+            return [], Page([])
+        
         try:
-            if table_name == "Пользователи":
-                users = self.user_repo.get_all().all()
-                headers = ["ID", "Имя", "Фамилия", "Телефон", "Email",
-                           "Адрес", "Дата регистрации", "Активен"]
-                data = [
-                    (u.id, u.first_name, u.last_name, u.phone_number, 
-                     u.email, u.address, u.registration_date, u.is_active)
-                    for u in users
-                ]
-                return headers, data
-                
-            elif table_name == "Администраторы":
-                admins = self.admin_repo.get_all().all()
-                headers = ["ID", "Имя", "Фамилия", "Телефон", "Email",
-                           "Зарплата", "Активен"]
-                data = [
-                    (a.id, a.first_name, a.last_name, a.phone_number, 
-                     a.email, a.salary, a.is_active)
-                    for a in admins
-                ]
-                return headers, data
-                
-            elif table_name == "Издательства":
-                publishers = self.publisher_repo.get_all().all()
-                headers = ["ID", "Название", "Владелец",
-                           "Дата начала продаж", "Активен"]
-                data = [
-                    (p.id, p.name, p.owner, p.sales_start, p.is_active)
-                    for p in publishers
-                ]
-                return headers, data
-                
-            elif table_name == "Публикации":
-                publications = self.publication_repo.get_all().all()
-                headers = ["ID", "Название", "Тип", "Издательство", "В продаже"]
-                data = [
-                    (p.id, p.name, p.publication_type, 
-                     p.publisher.name if p.publisher else "Нет", p.on_sale)
-                    for p in publications
-                ]
-                return headers, data
-                
-            elif table_name == "Выпуски":
-                issues = self.issue_repo.get_all().all()
-                headers = ["ID", "Название", "Номер", "Тип", "Издание",
-                           "Цена", "В продаже"]
-                data = [
-                    (s.id, s.name, s.issue_number, s.issue_type, 
-                     s.publication_id if s.publication_id else "Нет", 
-                     s.cost, s.on_sale)
-                    for s in issues
-                ]
-                return headers, data
-                
-            elif table_name == "Доставщики":
-                couriers = self.courier_repo.get_all().all()
-                headers = ["ID", "Имя", "Фамилия", "Телефон",
-                           "Зарплата", "Рейтинг", "Активен"]
-                data = [
-                    (c.id, c.first_name, c.last_name, c.phone_number, 
-                     c.salary, c.rating, c.is_active)
-                    for c in couriers
-                ]
-                return headers, data
-                
-            elif table_name == "Жалобы":
-                complaints = self.complaint_repo.get_all().all()
-                headers = ["ID", "Доставщик", "Описание", "Дата"]
-                data = [
-                    (c.id, f"{c.courier.first_name} {c.courier.last_name}" if c.courier else "Нет", 
-                     c.description, c.created_at)
-                    for c in complaints
-                ]
-                return headers, data
-                
-            elif table_name == "Доставки":
-                deliveries = self.delivery_repo.get_all().all()
-                headers = ["ID", "Тип издания", "Курьер", "Получатель",
-                           "Телефон", "Адрес", "Стоимость", "Доставлено"]
-                data = []
-                for d in deliveries:
-                    courier_name = f"{d.courier.first_name} {d.courier.last_name}" \
-                        if hasattr(d, 'courier') and d.courier else "Не назначен"
-                    delivery_row = (
-                        d.id, d.item_type, courier_name, d.recipient_name, 
-                        d.recipient_phone, d.recipient_address, d.item_cost, d.is_delivered
-                    )
-                    data.append(delivery_row)
-                return headers, data
-
-
-            return [], []
+            spec.check_query(sort_column, filters)
+            # Проекция таблицы построена заранее в реестре: здесь к ней добавляются
+            # только фильтры, сортировка и LIMIT
+            with get_session(readonly=True) as session:
+                page = spec.repository(session).get_rows_page(
+                    spec.statement, after=after, limit=limit, sort_index=sort_column,
+                    descending=descending, filters=filters, with_total=after is None
+                )
+            page.rows = [spec.format_row(row) for row in page]
+            return spec.headers, page
         
         except Exception as err:
             print(f"Ошибка получения данных таблицы: {err}")
-            return [], []
+            return [], Page([])
+    
+    def get_table_headers(self, table_name):
+        """
+        Получает заголовки столбцов таблицы
+        
+        Args:
+            table_name (str): Название таблицы
+            
+        Returns:
+            list: Заголовки столбцов, пустой список для неизвестной таблицы
+        """
+        spec = TABLES.get(table_name)
+        return list(spec.headers) if spec is not None else []
+    
+    def get_filter_columns(self, table_name):
+        """
+        Получает столбцы таблицы, по которым можно фильтровать
+        
+        Args:
+            table_name (str): Название таблицы
+            
+        Returns:
+            list: Пары (индекс столбца, заголовок), пустой список для неизвестной таблицы
+        """
+        spec = TABLES.get(table_name)
+        if spec is None:
+            return []
+        return [(index, header) for index, header in enumerate(spec.headers)
+                if index in spec.filterable]
+    
+    def get_sortable_columns(self, table_name):
+        """
+        Получает индексы столбцов таблицы, по которым можно сортировать
+        
+        Args:
+            table_name (str): Название таблицы
+            
+        Returns:
+            set: Индексы столбцов, пустое множество для неизвестной таблицы
+        """
+        spec = TABLES.get(table_name)
+        return set(spec.sortable) if spec is not None else set()
+    
+    def get_table_names(self):
+        """
+        Получает названия таблиц, доступных в панели администратора
+        
+        Returns:
+            list: Названия таблиц в порядке реестра
+        """
+        return list(TABLES)
+    
+    @instrumented()
+    def export_table(self, table_name, path, export_format='csv', sort_column=0,
+                     descending=False, filters=None, progress=None, cancel_event=None):
+        """
+        Выгружает таблицу в файл CSV или Parquet с текущими фильтрами и сортировкой
+        
+        Выгрузка потоковая и может занимать минуты, поэтому метод вызывается
+        из рабочего потока.
+        
+        Args:
+            table_name (str): Название таблицы
+            path (str): Путь к файлу
+            export_format (str): 'csv' или 'parquet'
+            sort_column (int): Индекс столбца сортировки (0 - ID)
+            descending (bool): Сортировка по убыванию
+            filters (dict, optional): {индекс столбца: текст фильтра}
+            progress (Callable, optional): progress(rows) - ход выгрузки, вызывается из рабочего потока
+            cancel_event (threading.Event, optional): Событие отмены выгрузки
+            
+        Returns:
+            tuple: (success, количество строк или сообщение об ошибке)
+        """
+        try:
+            rows = export_table(table_name, path, export_format, sort_column, descending,
+                                filters, progress, cancel_event)
+            return True, rows
+        except ExportCancelled:
+            return False, "Выгрузка отменена"
+        except Exception as err:
+            print(f"Ошибка выгрузки таблицы: {err}")
+            return False, str(err)
     
     # --- Методы для получения списков сущностей ---
     
+    @instrumented()
     def get_publishers(self):
         """
         Получает список всех активных издателей
@@ -187,6 +211,7 @@ class AdminController:
             print(f"Ошибка получения издателей: {err}")
             return []
     
+    @instrumented()
     def get_publications(self):
         """
         Получает список всех активных публикаций
@@ -200,6 +225,7 @@ class AdminController:
             print(f"Ошибка получения публикаций: {err}")
             return []
     
+    @instrumented()
     def get_publication_type(self, publication_id):
         """
         Получает тип публикации по ID
@@ -217,6 +243,7 @@ class AdminController:
             print(f"Ошибка получения типа публикации: {err}")
             return None
     
+    @instrumented()
     def get_issue_type(self, issue_id):
         """
         Получает тип выпуска по ID
@@ -235,6 +262,7 @@ class AdminController:
             return None
     
     
+    @instrumented()
     def get_couriers(self):
         """
         Получает список всех активных курьеров
@@ -248,6 +276,7 @@ class AdminController:
             print(f"Ошибка получения курьеров: {err}")
             return []
     
+    @instrumented()
     def get_issues(self):
         """
         Получает список всех активных выпусков
@@ -263,6 +292,7 @@ class AdminController:
     
     # --- Методы для создания новых записей ---
     
+    @instrumented()
     def create_user(self, user_data):
         """
         Создает нового пользователя
@@ -284,6 +314,7 @@ class AdminController:
             print(f"Ошибка создания пользователя: {err}")
             return False, str(err)
     
+    @instrumented()
     def create_publisher(self, publisher_data):
         """
         Создает новое издательство
@@ -305,6 +336,7 @@ class AdminController:
             print(f"Ошибка создания издательства: {err}")
             return False, str(err)
     
+    @instrumented()
     def create_publication(self, publication_data):
         """
         Создает новую публикацию
@@ -326,6 +358,7 @@ class AdminController:
             print(f"Ошибка создания публикации: {err}")
             return False, str(err)
     
+    @instrumented()
     def create_issue(self, issue_data):
         """
         Создает новый выпуск
@@ -343,6 +376,7 @@ class AdminController:
             print(f"Ошибка создания выпуска: {err}")
             return False, str(err)
     
+    @instrumented()
     def create_courier(self, courier_data):
         """
         Создает нового курьера
@@ -360,6 +394,7 @@ class AdminController:
             print(f"Ошибка создания курьера: {err}")
             return False, str(err)
     
+    @instrumented()
     def create_complaint(self, complaint_data):
         """
         Создает новую жалобу
@@ -381,6 +416,7 @@ class AdminController:
             print(f"Ошибка создания жалобы: {err}")
             return False, str(err)
     
+    @instrumented()
     def create_delivery(self, delivery_data):
         """
         Создает новую доставку
@@ -422,6 +458,7 @@ class AdminController:
             print(f"Ошибка создания доставки: {err}")
             return False, str(err)
     
+    @instrumented()
     def get_issue_by_id(self, issue_id):
         """
         Получает выпуск по ID
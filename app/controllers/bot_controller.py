@@ -1,6 +1,7 @@
 from app.bot.generate_auth_code import generate_auth_code
-from app.database.repositories import (UserRepository,)
-from app.database.session import get_session
+from app.database.repositories import AsyncUserRepository
+from app.database.session import get_async_session
+from app.database.instrumentation import instrumented
 
 
 class BotController:
@@ -36,6 +37,7 @@ class BotController:
         except KeyError:
             return False
     
+    @instrumented()
     async def verify_auth_code(self, checking_code: int, tg_chat_id: int) -> bool:
         '''
         Проверяет авторизационный код при подключении бота
@@ -50,19 +52,23 @@ class BotController:
         try:
             if isinstance(checking_code, str):
                 checking_code = int(checking_code)
-                
-            with get_session() as session:
-                print(f'{checking_code=}')
-                print(f'{self.active_auth_codes[checking_code]=}')
-                user = UserRepository(session).find_by_id(self.active_auth_codes[checking_code])
-                if checking_code in BotController.active_auth_codes:
-                    try:
-                        UserRepository(session).update(user.id, **{'tg_chat_id': tg_chat_id})
+            
+            print(f'{checking_code=}')
+            if checking_code not in BotController.active_auth_codes:
+                return False
+            
+            # Асинхронная сессия не блокирует общий с GUI цикл событий
+            async with get_async_session() as session:
+                user_id = BotController.active_auth_codes[checking_code]
+                try:
+                    if await AsyncUserRepository(session).bind_tg_chat_id(user_id, tg_chat_id):
                         print(f'Added new tg chat id')
                         return True
-                    
-                    except Exception as err:
-                        print(f'Ошибка при добавлении chat id в БД - {err}')
+                    return False
+                
+                except Exception as err:
+                    print(f'Ошибка при добавлении chat id в БД - {err}')
+                    return False
          
         except ValueError:
             print(f'Ошибка: Код "{checking_code}" не является числом')
@@ -1,5 +1,7 @@
 from app.database.session import get_session
+from app.database.instrumentation import instrumented
 from app.database.repositories import UserRepository, IssueRepository, PublicationRepository
+from app.database.repositories.pagination import Page
 
 
 class Controller:
@@ -8,6 +10,9 @@ class Controller:
         self.user_repo = None
         self.publication_repo = None
         self.show_item_repo = None
+        self.read_session = None
+        self.read_user_repo = None
+        self.read_publication_repo = None
         self._init_repositories()
     
     def _init_repositories(self):
@@ -17,7 +22,14 @@ class Controller:
             self.user_repo = UserRepository(session)
             self.publication_repo = PublicationRepository(session)
             self.show_item_repo = IssueRepository(session)
+        
+        # Каталог и поиск по телефону при входе читаются с реплики
+        with get_session(readonly=True) as read_session:
+            self.read_session = read_session
+            self.read_user_repo = UserRepository(read_session)
+            self.read_publication_repo = PublicationRepository(read_session)
     
+    @instrumented()
     def create_user(self, user_data: dict):
         """
         Создает нового пользователя
@@ -43,6 +55,7 @@ class Controller:
             print(f'Error in user window controller - {err}')
             return False, "Неизвестная ошибка при регистрации"
     
+    @instrumented()
     def get_user_by_id(self, user_id: int):
         """
         Получает пользователя по ID
@@ -59,6 +72,7 @@ class Controller:
             print(f'Ошибка получения пользователя: {err}')
             return None
     
+    @instrumented()
     def get_user_by_phone(self, phone_number: str):
         """
         Получает пользователя по номеру телефона
@@ -70,11 +84,12 @@ class Controller:
             User: Объект пользователя или None
         """
         try:
-            return self.user_repo.find_by_phone(phone_number)
+            return self.read_user_repo.find_by_phone(phone_number)
         except Exception as err:
             print(f'Ошибка получения пользователя по телефону: {err}')
             return None
     
+    @instrumented()
     def update_user_profile(self, user_id: int, phone: str, email: str, address: str):
         """
         Обновляет профиль пользователя
@@ -94,6 +109,7 @@ class Controller:
             print(f'Ошибка обновления профиля: {err}')
             return False
     
+    @instrumented()
     def get_user_subscriptions(self, user_id: int):
         """
         Получает список подписок пользователя
@@ -102,17 +118,15 @@ class Controller:
             user_id (int): ID пользователя
             
         Returns:
-            list: Список подписок
+            list: Список подписок (изданий с загруженным последним выпуском)
         """
         try:
-            user = self.user_repo.find_by_id(user_id)
-            if not user:
-                return []
-            return user.subscribed_publications
+            return self.publication_repo.get_subscribed(user_id)
         except Exception as err:
             print(f'Ошибка получения подписок: {err}')
             return []
     
+    @instrumented()
     def get_all_publications(self):
         """
         Получает список всех доступных изданий
@@ -121,11 +135,36 @@ class Controller:
             list: Список изданий
         """
         try:
-            return self.publication_repo.get_all().filter_by(on_sale=True).all()
+            return self.read_publication_repo.get_all().filter_by(on_sale=True).all()
         except Exception as err:
             print(f'Ошибка получения изданий: {err}')
             return []
     
+    @instrumented()
+    def get_publications_page(self, query: str = "", after=None, limit: int = 50):
+        """
+        Получает страницу каталога изданий в продаже
+        
+        Args:
+            query (str): Строка поиска по названию и описанию; пустая строка -
+                весь каталог по алфавиту
+            after (str, optional): Курсор следующей страницы из предыдущего результата
+            limit (int): Количество изданий на странице
+            
+        Returns:
+            Page: Издания (по убыванию релевантности при поиске) и курсор следующей страницы
+        """
+        try:
+            if not query.strip():
+                return self.read_publication_repo.get_page(
+                    after=after, limit=limit, order_by='name', on_sale=True
+                )
+            return self.read_publication_repo.search(query, after=after, limit=limit, on_sale=True)
+        except Exception as err:
+            print(f'Ошибка получения изданий: {err}')
+            return Page([])
+    
+    @instrumented()
     def get_publications_by_type(self, pub_type: str):
         """
         Получает издания определенного типа
@@ -142,6 +181,7 @@ class Controller:
             print(f'Ошибка получения изданий по типу: {err}')
             return []
     
+    @instrumented()
     def subscribe_user_to_publication(self, user_id: int, publication_id: int):
         """
         Подписывает пользователя на издание
@@ -151,26 +191,21 @@ class Controller:
             publication_id (int): ID издания
             
         Returns:
-            bool: True если подписка оформлена успешно, иначе False
+            tuple: (success, сообщение об ошибке или None)
         """
         try:
-            user = self.user_repo.find_by_id(user_id)
-            publication = self.publication_repo.find_by_id(publication_id)
-            
-            if not user or not publication:
-                return False
-            
-            # Проверяем, есть ли уже такая подписка
-            if user.has_subscription(publication_id=publication_id):
-                return False
-            
-            # Добавляем публикацию в подписки пользователя
-            user.subscribed_publications.append(publication)
-            return self.user_repo.commit()
+            # Подписка вставляется с ON CONFLICT DO NOTHING; существующая подписка
+            # проверяется запросом EXISTS только если вставка ничего не добавила
+            if self.user_repo.subscribe(user_id, publication_id):
+                return True, None
+            if self.user_repo.has_subscription(user_id, publication_id):
+                return False, "Вы уже подписаны на это издание"
+            return False, "Не удалось оформить подписку. Пожалуйста, попробуйте позже."
         except Exception as err:
             print(f'Ошибка оформления подписки: {err}')
-            return False
+            return False, "Не удалось оформить подписку. Пожалуйста, попробуйте позже."
     
+    @instrumented()
     def unsubscribe_user_from_publication(self, user_id: int, publication_id: int):
         """
         Отменяет подписку пользователя на издание
@@ -183,15 +218,7 @@ class Controller:
             bool: True если отмена прошла успешно, иначе False
         """
         try:
-            user = self.user_repo.find_by_id(user_id)
-            publication = self.publication_repo.find_by_id(publication_id)
-            
-            if not user or not publication:
-                return False
-                
-            # Удаляем публикацию из подписок пользователя
-            user.subscribed_publications.remove(publication)
-            return self.user_repo.commit()
+            return self.user_repo.unsubscribe(user_id, publication_id)
         except Exception as err:
             print(f'Ошибка отмены подписки: {err}')
             return False
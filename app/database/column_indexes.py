@@ -0,0 +1,85 @@
+from sqlalchemy import Index, func
+
+
+# Индексы под фильтры таблиц панели администратора (app/database/table_specs.py):
+#   - текст фильтруется по началу строки без учета регистра: lower(столбец) LIKE 'текст%'.
+#     Такое условие обслуживает B-tree индекс по lower(столбец) с классом операторов
+#     text_pattern_ops (обычный B-tree при локали, отличной от C, для LIKE не подходит).
+#     Эти индексы создаются только в PostgreSQL;
+#   - сортировка по столбцу - keyset-пагинация по (столбец, id): B-tree индекс
+#     (столбец, id) отдает страницу без сортировки всей таблицы в обе стороны.
+# На существующей БД индексы строит миграция.
+
+LIKE_ESCAPE = '/'
+
+
+def prefix_pattern(value: str) -> str:
+    '''
+    Возвращает шаблон LIKE для поиска строк, начинающихся с value
+
+    Arguments:
+        value (str): Начало строки
+
+    Returns:
+        str: Шаблон с экранированными %, _ и символом экранирования
+    '''
+    for char in (LIKE_ESCAPE, '%', '_'):
+        value = value.replace(char, LIKE_ESCAPE + char)
+    return value + '%'
+
+
+def prefix_match(expression, value: str):
+    '''
+    Условие "начинается с value без учета регистра" (то же выражение, что в индексе)
+
+    Шаблон - константа (lower от нее PostgreSQL вычисляет при планировании),
+    поэтому из него выделяется префикс и поиск идет по индексу
+    declare_prefix_indexes. lower с обеих сторон дает одинаковое сравнение
+    и в SQLite, где lower меняет регистр только латиницы.
+
+    Arguments:
+        expression: Текстовый столбец или выражение
+        value (str): Начало строки
+
+    Returns:
+        ColumnElement: lower(expression) LIKE lower('value%')
+    '''
+    return func.lower(expression).like(func.lower(prefix_pattern(value)), escape=LIKE_ESCAPE)
+
+
+def declare_prefix_indexes(*columns) -> list[Index]:
+    '''
+    Объявляет индексы для фильтра по началу строки (prefix_match)
+
+    Arguments:
+        *columns: Текстовые столбцы одной модели
+
+    Returns:
+        list[Index]: Индексы с именами ix_<таблица>_<столбец>_prefix
+    '''
+    indexes = []
+    for column in columns:
+        column = column.expression
+        label = f'{column.key}_lower'
+        indexes.append(Index(
+            f'ix_{column.table.name}_{column.key}_prefix', func.lower(column).label(label),
+            postgresql_ops={label: 'text_pattern_ops'}
+        ).ddl_if(dialect='postgresql'))
+    return indexes
+
+
+def declare_sort_indexes(*columns) -> list[Index]:
+    '''
+    Объявляет индексы (столбец, id) для сортировки таблицы по столбцу
+
+    Arguments:
+        *columns: Столбцы одной модели без NULL (см. keyset_ordering)
+
+    Returns:
+        list[Index]: Индексы с именами ix_<таблица>_<столбец>_sort
+    '''
+    indexes = []
+    for column in columns:
+        column = column.expression
+        indexes.append(Index(f'ix_{column.table.name}_{column.key}_sort', column, column.table.c.id))
+    return indexes
@@ -0,0 +1,231 @@
+from sqlalchemy import select, update, func, text, not_
+from app.database.models import Publication, Courier, Delivery, Complaint
+from app.database.models.user_subscription_model import user_subscriptions
+
+
+# Счетчики меняются триггерами в той же транзакции, что и исходная запись,
+# поэтому они точны при любом способе записи (ORM, Core, ON CONFLICT, SQL вручную).
+
+_POSTGRESQL_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION user_subscriptions_count() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE publications SET subscribers_count = subscribers_count - 1
+            WHERE id = OLD.publication_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE publications SET subscribers_count = subscribers_count + 1
+            WHERE id = NEW.publication_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS user_subscriptions_count ON user_subscriptions",
+    """
+    CREATE TRIGGER user_subscriptions_count
+    AFTER INSERT OR DELETE OR UPDATE OF publication_id ON user_subscriptions
+    FOR EACH ROW EXECUTE FUNCTION user_subscriptions_count()
+    """,
+    # После m0006 смена is_delivered переносит строку между секциями: PostgreSQL
+    # выполняет такой UPDATE как DELETE из старой секции и INSERT в новую, и
+    # срабатывают только строчные триггеры AFTER DELETE и AFTER INSERT
+    # (AFTER UPDATE - нет). Ветка DELETE вычитает недоставленную OLD, ветка
+    # INSERT прибавляет только недоставленную NEW, так что счетчик меняется
+    # ровно один раз (tests/test_counters.py)
+    """
+    CREATE OR REPLACE FUNCTION deliveries_open_count() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            IF NOT OLD.is_delivered THEN
+                UPDATE couriers SET open_deliveries_count = open_deliveries_count - 1
+                WHERE id = OLD.courier_id;
+            END IF;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            IF NOT NEW.is_delivered THEN
+                UPDATE couriers SET open_deliveries_count = open_deliveries_count + 1
+                WHERE id = NEW.courier_id;
+            END IF;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS deliveries_open_count ON deliveries",
+    """
+    CREATE TRIGGER deliveries_open_count
+    AFTER INSERT OR DELETE OR UPDATE OF courier_id, is_delivered ON deliveries
+    FOR EACH ROW EXECUTE FUNCTION deliveries_open_count()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION complaints_count() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE couriers SET complaints_count = complaints_count - 1
+            WHERE id = OLD.courier_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE couriers SET complaints_count = complaints_count + 1
+            WHERE id = NEW.courier_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS complaints_count ON complaints",
+    """
+    CREATE TRIGGER complaints_count
+    AFTER INSERT OR DELETE OR UPDATE OF courier_id ON complaints
+    FOR EACH ROW EXECUTE FUNCTION complaints_count()
+    """,
+]
+
+_SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS user_subscriptions_count_insert
+    AFTER INSERT ON user_subscriptions
+    BEGIN
+        UPDATE publications SET subscribers_count = subscribers_count + 1 WHERE id = NEW.publication_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS user_subscriptions_count_delete
+    AFTER DELETE ON user_subscriptions
+    BEGIN
+        UPDATE publications SET subscribers_count = subscribers_count - 1 WHERE id = OLD.publication_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS user_subscriptions_count_update
+    AFTER UPDATE OF publication_id ON user_subscriptions
+    BEGIN
+        UPDATE publications SET subscribers_count = subscribers_count - 1 WHERE id = OLD.publication_id;
+        UPDATE publications SET subscribers_count = subscribers_count + 1 WHERE id = NEW.publication_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS deliveries_open_count_insert
+    AFTER INSERT ON deliveries WHEN NOT NEW.is_delivered
+    BEGIN
+        UPDATE couriers SET open_deliveries_count = open_deliveries_count + 1 WHERE id = NEW.courier_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS deliveries_open_count_delete
+    AFTER DELETE ON deliveries WHEN NOT OLD.is_delivered
+    BEGIN
+        UPDATE couriers SET open_deliveries_count = open_deliveries_count - 1 WHERE id = OLD.courier_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS deliveries_open_count_update
+    AFTER UPDATE OF courier_id, is_delivered ON deliveries
+    BEGIN
+        UPDATE couriers SET open_deliveries_count = open_deliveries_count - 1
+        WHERE id = OLD.courier_id AND NOT OLD.is_delivered;
+        UPDATE couriers SET open_deliveries_count = open_deliveries_count + 1
+        WHERE id = NEW.courier_id AND NOT NEW.is_delivered;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS complaints_count_insert
+    AFTER INSERT ON complaints
+    BEGIN
+        UPDATE couriers SET complaints_count = complaints_count + 1 WHERE id = NEW.courier_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS complaints_count_delete
+    AFTER DELETE ON complaints
+    BEGIN
+        UPDATE couriers SET complaints_count = complaints_count - 1 WHERE id = OLD.courier_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS complaints_count_update
+    AFTER UPDATE OF courier_id ON complaints
+    BEGIN
+        UPDATE couriers SET complaints_count = complaints_count - 1 WHERE id = OLD.courier_id;
+        UPDATE couriers SET complaints_count = complaints_count + 1 WHERE id = NEW.courier_id;
+    END
+    """,
+]
+
+COUNTER_TRIGGERS = {
+    'postgresql': _POSTGRESQL_TRIGGERS,
+    'sqlite': _SQLITE_TRIGGERS,
+}
+
+
+def create_counter_triggers(connection) -> None:
+    '''
+    Создает (или пересоздает) триггеры, поддерживающие счетчики
+
+    Arguments:
+        connection (Connection): Соединение с БД в открытой транзакции
+
+    Raises:
+        ValueError: Если для диалекта БД нет триггеров
+    '''
+    statements = COUNTER_TRIGGERS.get(connection.dialect.name)
+    if statements is None:
+        raise ValueError(f"Триггеры счетчиков не определены для диалекта {connection.dialect.name}")
+
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def _rebuild(connection, table, column, count) -> int:
+    # Обновляются только расходящиеся строки, поэтому повторный запуск почти ничего не пишет
+    return connection.execute(
+        update(table).where(column != count).values({column.key: count})
+    ).rowcount
+
+
+def rebuild_counters(connection) -> dict[str, int]:
+    '''
+    Пересчитывает все счетчики по исходным таблицам
+
+    Каждый счетчик пересчитывается одним UPDATE с коррелированным COUNT
+    по индексированному внешнему ключу.
+
+    Arguments:
+        connection (Connection): Соединение с БД в открытой транзакции
+
+    Returns:
+        dict[str, int]: {счетчик: количество исправленных строк}
+    '''
+    publications = Publication.__table__
+    couriers = Courier.__table__
+    deliveries = Delivery.__table__
+    complaints = Complaint.__table__
+
+    subscribers = (
+        select(func.count()).select_from(user_subscriptions)
+        .where(user_subscriptions.c.publication_id == publications.c.id)
+        .scalar_subquery()
+    )
+    open_deliveries = (
+        select(func.count()).select_from(deliveries)
+        .where(deliveries.c.courier_id == couriers.c.id, not_(deliveries.c.is_delivered))
+        .scalar_subquery()
+    )
+    courier_complaints = (
+        select(func.count()).select_from(complaints)
+        .where(complaints.c.courier_id == couriers.c.id)
+        .scalar_subquery()
+    )
+
+    return {
+        'publications.subscribers_count': _rebuild(
+            connection, publications, publications.c.subscribers_count, subscribers
+        ),
+        'couriers.open_deliveries_count': _rebuild(
+            connection, couriers, couriers.c.open_deliveries_count, open_deliveries
+        ),
+        'couriers.complaints_count': _rebuild(
+            connection, couriers, couriers.c.complaints_count, courier_complaints
+        ),
+    }
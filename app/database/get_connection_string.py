@@ -10,6 +10,30 @@ HOST = os.environ["HOST"]
 PORT = os.environ["PORT"]
 DATABASE = os.environ["DATABASE"]
 
+# Реплика только для чтения (опционально)
+REPLICA_DATABASE_URL = os.environ.get("REPLICA_DATABASE_URL")
+REPLICA_HOST = os.environ.get("REPLICA_HOST")
+REPLICA_PORT = os.environ.get("REPLICA_PORT", PORT)
+
 def get_connection_string() -> str:
     '''Возвращает строку для подключения PostgreSQL'''
-    return f'postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DATABASE}'
\ No newline at end of file
+    return f'postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DATABASE}'
+
+def get_async_connection_string() -> str:
+    '''Возвращает строку для асинхронного подключения PostgreSQL (asyncpg)'''
+    return f'postgresql+asyncpg://{USER}:{PASSWORD}@{HOST}:{PORT}/{DATABASE}'
+
+def get_replica_connection_string() -> str | None:
+    '''
+    Возвращает строку для подключения к реплике только для чтения.
+    REPLICA_DATABASE_URL задает полную строку (например, sqlite:///replica.db),
+    REPLICA_HOST/REPLICA_PORT - реплику с теми же учетными данными, что и основная БД.
+    
+    Returns:
+        str | None: Строка подключения или None, если реплика не настроена
+    '''
+    if REPLICA_DATABASE_URL:
+        return REPLICA_DATABASE_URL
+    if REPLICA_HOST:
+        return f'postgresql+psycopg2://{USER}:{PASSWORD}@{REPLICA_HOST}:{REPLICA_PORT}/{DATABASE}'
+    return None
\ No newline at end of file
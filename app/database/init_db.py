@@ -1,9 +1,17 @@
 from app.database.models.base_model import Base
 from app.database.session import engine
 from app.database.models import User, Publication, Publisher, Issue, Admin, Complaint, Courier, Delivery
+from app.database.migrations import MIGRATIONS, run_migrations
 
 def init_db():
-    """Создает все таблицы в базе данных"""
+    """
+    Создает все таблицы в базе данных и применяет миграции.
+    Индексы на существующие таблицы добавляются миграциями без блокировки записи.
+    """
     print("Создание таблиц базы данных...")
     Base.metadata.create_all(bind=engine)
     print("Таблицы успешно созданы!")
+    
+    applied = run_migrations(engine, MIGRATIONS)
+    if applied:
+        print(f"Применены миграции: {applied}")
@@ -0,0 +1,205 @@
+import os
+import re
+import time
+import logging
+import functools
+import inspect
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+
+
+logger = logging.getLogger(__name__)
+
+# Порог медленного запроса, мс
+SLOW_QUERY_MS = float(os.environ.get('DB_SLOW_QUERY_MS', 200))
+# Сколько раз один и тот же запрос может повториться за операцию до предупреждения о N+1
+REPEAT_THRESHOLD = int(os.environ.get('DB_REPEAT_THRESHOLD', 10))
+# Сколько самых медленных запросов хранить для операции
+SLOWEST_LIMIT = 5
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|\$\d+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+_current_operation: ContextVar['OperationStats | None'] = ContextVar('db_operation', default=None)
+
+
+def statement_shape(statement: str) -> str:
+    '''
+    Приводит SQL к общей форме: плейсхолдеры параметров и списки IN (...)
+    заменяются одним "?", чтобы одинаковые запросы с разными значениями совпадали
+
+    Arguments:
+        statement (str): SQL-запрос
+
+    Returns:
+        str: Нормализованный запрос
+    '''
+    shape = _PLACEHOLDER.sub('?', statement)
+    shape = _PLACEHOLDER_LIST.sub('?', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+class OperationStats:
+    '''
+    Статистика запросов одной логической операции (метод контроллера, обработчик бота)
+
+    Attributes:
+        name (str): Имя операции
+        statements (int): Количество выполненных запросов
+        db_time_ms (float): Суммарное время выполнения запросов, мс
+        slowest (list[tuple[float, str]]): Самые медленные запросы (время, SQL), по убыванию
+        shapes (Counter): Количество выполнений по нормализованной форме запроса
+    '''
+    def __init__(self, name: str):
+        self.name = name
+        self.statements = 0
+        self.db_time_ms = 0.0
+        self.slowest = []
+        self.shapes = Counter()
+        self.started_at = time.perf_counter()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.statements += 1
+        self.db_time_ms += elapsed_ms
+        self.shapes[statement_shape(statement)] += 1
+
+        if len(self.slowest) < SLOWEST_LIMIT or elapsed_ms > self.slowest[-1][0]:
+            self.slowest.append((elapsed_ms, statement))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[SLOWEST_LIMIT:]
+
+    def repeated(self, threshold: int = None) -> list[tuple[str, int]]:
+        '''
+        Возвращает запросы, повторившиеся больше threshold раз (признак N+1)
+
+        Arguments:
+            threshold (int, optional): Порог повторов, по умолчанию REPEAT_THRESHOLD
+
+        Returns:
+            list[tuple[str, int]]: (нормализованный запрос, количество повторов)
+        '''
+        threshold = REPEAT_THRESHOLD if threshold is None else threshold
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def summary(self) -> dict:
+        '''
+        Итоги операции для вывода в лог или отладочную панель
+
+        Returns:
+            dict: Итоги операции (name, statements, db_time_ms, wall_time_ms, slowest, repeated)
+        '''
+        return {
+            'name': self.name,
+            'statements': self.statements,
+            'db_time_ms': round(self.db_time_ms, 3),
+            'wall_time_ms': round((time.perf_counter() - self.started_at) * 1000, 3),
+            'slowest': [(round(ms, 3), sql) for ms, sql in self.slowest],
+            'repeated': self.repeated(),
+        }
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info['query_start_time'].pop()) * 1000
+
+    stats = _current_operation.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+
+    if elapsed_ms >= SLOW_QUERY_MS:
+        operation = stats.name if stats is not None else '-'
+        logger.warning(f"Медленный запрос ({elapsed_ms:.1f} мс, операция {operation}): {statement}")
+
+
+def instrument_engine(engine) -> None:
+    '''
+    Подключает замер запросов к движку
+
+    Arguments:
+        engine (Engine): Синхронный движок (для AsyncEngine - engine.sync_engine)
+    '''
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def current_operation() -> OperationStats | None:
+    '''
+    Returns:
+        OperationStats или None: Статистика текущей операции, если она открыта
+    '''
+    return _current_operation.get()
+
+
+@contextmanager
+def operation(name: str):
+    '''
+    Контекстный менеджер логической операции: собирает статистику запросов,
+    выполненных внутри блока, и пишет итог в лог при выходе.
+    Вложенные операции учитываются во внешней.
+
+    Arguments:
+        name (str): Имя операции
+
+    Returns:
+        OperationStats: Статистика операции
+    '''
+    current = _current_operation.get()
+    if current is not None:
+        yield current
+        return
+
+    stats = OperationStats(name)
+    token = _current_operation.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_operation.reset(token)
+        _log_operation(stats)
+
+
+def _log_operation(stats: OperationStats) -> None:
+    if not stats.statements:
+        return
+
+    logger.info(
+        f"{stats.name}: {stats.statements} запросов, {stats.db_time_ms:.1f} мс в БД"
+    )
+    for shape, count in stats.repeated():
+        logger.warning(
+            f"{stats.name}: запрос выполнен {count} раз за операцию (возможно N+1): {shape}"
+        )
+
+
+def instrumented(name: str = None):
+    '''
+    Декоратор, выполняющий функцию (или корутину) как логическую операцию
+
+    Arguments:
+        name (str, optional): Имя операции, по умолчанию - полное имя функции
+
+    Returns:
+        Callable: Декоратор
+    '''
+    def decorator(func):
+        operation_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with operation(operation_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with operation(operation_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,29 @@
+from . import (
+    m0001_hot_path_indexes, m0002_latest_issue_index, m0003_counters,
+    m0004_rating_columns, m0005_rating_indexes, m0006_partition_deliveries,
+    m0007_search_indexes, m0008_filter_indexes, m0009_sort_indexes,
+    m0010_rating_runs
+)
+from .runner import run_migrations, applied_versions
+
+
+# Миграции в порядке версий; новая миграция - новый модуль mNNNN_*.py в этом списке
+MIGRATIONS = [
+    m0001_hot_path_indexes,
+    m0002_latest_issue_index,
+    m0003_counters,
+    m0004_rating_columns,
+    m0005_rating_indexes,
+    m0006_partition_deliveries,
+    m0007_search_indexes,
+    m0008_filter_indexes,
+    m0009_sort_indexes,
+    m0010_rating_runs,
+]
+
+
+__all__ = [
+    'MIGRATIONS',
+    'run_migrations',
+    'applied_versions'
+]
@@ -0,0 +1,24 @@
+'''Индексы для фильтров горячих путей: вход по телефону, поставки, претензии, каталог'''
+from .operations import get_index, create_index_online
+
+
+VERSION = 1
+NAME = 'hot_path_indexes'
+TRANSACTIONAL = False
+
+INDEXES = [
+    ('users', 'ix_users_phone_number'),
+    ('users', 'ix_users_email'),
+    ('admins', 'ix_admins_phone_number'),
+    ('deliveries', 'ix_deliveries_courier_id'),
+    ('deliveries', 'ix_deliveries_pending'),
+    ('complaints', 'ix_complaints_courier_id'),
+    ('publications', 'ix_publications_publisher_id'),
+    ('issues', 'ix_issues_publication_id'),
+    ('user_subscriptions', 'ix_user_subscriptions_publication_id'),
+]
+
+
+def upgrade(connection) -> None:
+    for table_name, index_name in INDEXES:
+        create_index_online(connection, get_index(table_name, index_name))
@@ -0,0 +1,11 @@
+'''Индекс для выбора последнего выпуска каждого издания'''
+from .operations import get_index, create_index_online
+
+
+VERSION = 2
+NAME = 'latest_issue_index'
+TRANSACTIONAL = False
+
+
+def upgrade(connection) -> None:
+    create_index_online(connection, get_index('issues', 'ix_issues_publication_latest'))
@@ -0,0 +1,32 @@
+'''Счетчики подписчиков, открытых поставок и претензий с триггерами'''
+from sqlalchemy import inspect, Integer, Column
+from sqlalchemy.schema import CreateColumn
+from app.database.counters import create_counter_triggers, rebuild_counters
+
+
+VERSION = 3
+NAME = 'counters'
+TRANSACTIONAL = True
+
+COLUMNS = [
+    ('publications', 'subscribers_count'),
+    ('couriers', 'open_deliveries_count'),
+    ('couriers', 'complaints_count'),
+]
+
+
+def upgrade(connection) -> None:
+    inspector = inspect(connection)
+    for table_name, column_name in COLUMNS:
+        existing = {column['name'] for column in inspector.get_columns(table_name)}
+        if column_name in existing:
+            continue
+
+        # Добавление столбца с константным DEFAULT не переписывает таблицу
+        column = CreateColumn(Column(column_name, Integer, nullable=False, server_default='0'))
+        connection.exec_driver_sql(
+            f"ALTER TABLE {table_name} ADD COLUMN {column.compile(dialect=connection.dialect)}"
+        )
+
+    create_counter_triggers(connection)
+    rebuild_counters(connection)
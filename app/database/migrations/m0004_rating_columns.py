@@ -0,0 +1,29 @@
+'''Время создания поставки и отметка пересчета рейтинга доставщика'''
+from sqlalchemy import Column, DateTime
+from .operations import add_column, backfill_in_batches, add_not_null_check, set_not_null
+
+
+VERSION = 4
+NAME = 'rating_columns'
+# Заполнение created_at идет порциями с фиксацией каждой, без блокировки всей
+# таблицы; все шаги идемпотентны и при сбое повторяются
+TRANSACTIONAL = False
+
+# Для существующих поставок время создания неизвестно: берется дата доставки,
+# а для недоставленных - время миграции
+CREATED_AT_BACKFILL = "created_at = COALESCE(delivery_date, CURRENT_TIMESTAMP)"
+
+
+def upgrade(connection) -> None:
+    add_column(connection, 'couriers', Column('rating_updated_at', DateTime))
+
+    # Столбец добавляется без DEFAULT (SQLite не допускает неконстантный DEFAULT
+    # в ADD COLUMN) и сразу заполняется приложением для новых поставок
+    add_column(connection, 'deliveries', Column('created_at', DateTime))
+    backfill_in_batches(connection, 'deliveries', CREATED_AT_BACKFILL, "created_at IS NULL")
+
+    # NOT NULL (PostgreSQL): сначала новые NULL запрещаются, затем дозаполняются
+    # строки, вставленные во время первого прохода, и только потом проверяется таблица
+    add_not_null_check(connection, 'deliveries', 'created_at')
+    backfill_in_batches(connection, 'deliveries', CREATED_AT_BACKFILL, "created_at IS NULL")
+    set_not_null(connection, 'deliveries', 'created_at')
@@ -0,0 +1,19 @@
+'''Индексы по времени событий для инкрементального пересчета рейтинга'''
+from .operations import get_index, create_index_online
+
+
+VERSION = 5
+NAME = 'rating_indexes'
+TRANSACTIONAL = False
+
+INDEXES = [
+    ('deliveries', 'ix_deliveries_created_at'),
+    ('deliveries', 'ix_deliveries_delivery_date'),
+    ('complaints', 'ix_complaints_created_at'),
+    ('couriers', 'ix_couriers_rating_updated_at'),
+]
+
+
+def upgrade(connection) -> None:
+    for table_name, index_name in INDEXES:
+        create_index_online(connection, get_index(table_name, index_name))
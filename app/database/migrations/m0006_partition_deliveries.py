@@ -0,0 +1,80 @@
+'''Секционирование поставок: горячая секция недоставленных и помесячные секции доставленных'''
+from datetime import date
+from sqlalchemy import text
+from app.database.counters import create_counter_triggers
+from app.database.partitions import (
+    PENDING_PARTITION, DELIVERED_PARTITION, DEFAULT_PARTITION,
+    is_partitioned, create_month_partition, month_start
+)
+
+
+VERSION = 6
+NAME = 'partition_deliveries'
+TRANSACTIONAL = True
+
+# Сколько будущих месяцев создается заранее; дальше секции создает
+# app/services/partitions.py
+MONTHS_AHEAD = 2
+
+# Внешние ключи и индексы поставок на момент этой миграции. Список зафиксирован,
+# а не берется из модели: индексы, объявленные позже (m0008, m0009 и следующие),
+# строят их собственные миграции
+FOREIGN_KEYS = [
+    "ALTER TABLE deliveries ADD FOREIGN KEY (item_id) REFERENCES issues (id)",
+    "ALTER TABLE deliveries ADD FOREIGN KEY (recipient_tg_chat_id) REFERENCES users (tg_chat_id)",
+    "ALTER TABLE deliveries ADD FOREIGN KEY (courier_id) REFERENCES couriers (id)",
+]
+INDEXES = [
+    "CREATE INDEX ix_deliveries_pending ON deliveries (id) WHERE NOT is_delivered",
+    "CREATE INDEX ix_deliveries_created_at ON deliveries (created_at)",
+    "CREATE INDEX ix_deliveries_delivery_date ON deliveries (delivery_date)",
+    "CREATE INDEX ix_deliveries_courier_id ON deliveries (courier_id)",
+]
+
+
+def upgrade(connection) -> None:
+    # SQLite секционирование не поддерживает - таблица остается обычной
+    if connection.dialect.name != 'postgresql' or is_partitioned(connection, 'deliveries'):
+        return
+
+    # Данные переносятся в новую таблицу в этой же транзакции: с первого
+    # ALTER TABLE до COMMIT на поставках держится ACCESS EXCLUSIVE блокировка,
+    # и чтение и запись поставок ждут все время копирования (оно пропорционально
+    # размеру таблицы). Пакетами перенос не делается: на время переноса поставки
+    # пришлось бы читать из двух таблиц. Миграцию запускают в окно обслуживания.
+    connection.execute(text("ALTER TABLE deliveries RENAME TO deliveries_legacy"))
+    connection.execute(text("ALTER SEQUENCE deliveries_id_seq OWNED BY NONE"))
+    connection.execute(text(
+        "CREATE TABLE deliveries (LIKE deliveries_legacy INCLUDING DEFAULTS) "
+        "PARTITION BY LIST (is_delivered)"
+    ))
+    connection.execute(text(
+        f"CREATE TABLE {PENDING_PARTITION} PARTITION OF deliveries FOR VALUES IN (false)"
+    ))
+    connection.execute(text(
+        f"CREATE TABLE {DELIVERED_PARTITION} PARTITION OF deliveries FOR VALUES IN (true) "
+        "PARTITION BY RANGE (created_at)"
+    ))
+    connection.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {DELIVERED_PARTITION} DEFAULT"))
+
+    oldest = connection.scalar(text("SELECT min(created_at) FROM deliveries_legacy WHERE is_delivered"))
+    month = month_start(oldest.date() if oldest else date.today())
+    last = month_start(date.today(), MONTHS_AHEAD)
+    while month <= last:
+        create_month_partition(connection, month)
+        month = month_start(month, 1)
+
+    connection.execute(text("INSERT INTO deliveries SELECT * FROM deliveries_legacy"))
+    connection.execute(text("DROP TABLE deliveries_legacy"))
+    connection.execute(text("ALTER SEQUENCE deliveries_id_seq OWNED BY deliveries.id"))
+
+    # Первичный ключ секционированной таблицы обязан включать ключи секционирования,
+    # поэтому БД больше не гарантирует уникальность id. Ее обеспечивает только
+    # последовательность: id не задается вручную и не меняется, а перенос строки
+    # между секциями (UPDATE is_delivered) сохраняет id
+    connection.execute(text("ALTER TABLE deliveries ADD PRIMARY KEY (id, is_delivered, created_at)"))
+    for statement in FOREIGN_KEYS + INDEXES:
+        connection.execute(text(statement))
+
+    # Триггеры счетчиков удалены вместе со старой таблицей
+    create_counter_triggers(connection)
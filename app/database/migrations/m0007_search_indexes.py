@@ -0,0 +1,25 @@
+'''GIN-индексы полнотекстового и триграммного поиска по изданиям и выпускам'''
+from sqlalchemy import text
+from .operations import get_index, create_index_online
+
+
+VERSION = 7
+NAME = 'search_indexes'
+TRANSACTIONAL = False
+
+INDEXES = [
+    ('publications', 'ix_publications_search_fts'),
+    ('publications', 'ix_publications_name_trgm'),
+    ('issues', 'ix_issues_search_fts'),
+    ('issues', 'ix_issues_name_trgm'),
+]
+
+
+def upgrade(connection) -> None:
+    # Индексы используют функции PostgreSQL; в SQLite поиск идет по подстроке
+    if connection.dialect.name != 'postgresql':
+        return
+
+    connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for table_name, index_name in INDEXES:
+        create_index_online(connection, get_index(table_name, index_name))
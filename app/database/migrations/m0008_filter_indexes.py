@@ -0,0 +1,33 @@
+'''Индексы фильтров таблиц панели администратора по началу строки'''
+from .operations import get_index, create_index_online
+
+
+VERSION = 8
+NAME = 'filter_indexes'
+TRANSACTIONAL = False
+
+INDEXES = [
+    ('users', 'ix_users_last_name_prefix'),
+    ('users', 'ix_users_phone_number_prefix'),
+    ('users', 'ix_users_email_prefix'),
+    ('admins', 'ix_admins_last_name_prefix'),
+    ('admins', 'ix_admins_phone_number_prefix'),
+    ('admins', 'ix_admins_email_prefix'),
+    ('publishers', 'ix_publishers_name_prefix'),
+    ('publishers', 'ix_publishers_owner_prefix'),
+    ('publications', 'ix_publications_name_prefix'),
+    ('issues', 'ix_issues_name_prefix'),
+    ('couriers', 'ix_couriers_last_name_prefix'),
+    ('couriers', 'ix_couriers_phone_number_prefix'),
+    ('deliveries', 'ix_deliveries_recipient_name_prefix'),
+    ('deliveries', 'ix_deliveries_recipient_phone_prefix'),
+]
+
+
+def upgrade(connection) -> None:
+    # Индексы с text_pattern_ops есть только в PostgreSQL; SQLite фильтрует перебором
+    if connection.dialect.name != 'postgresql':
+        return
+
+    for table_name, index_name in INDEXES:
+        create_index_online(connection, get_index(table_name, index_name))
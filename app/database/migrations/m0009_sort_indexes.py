@@ -0,0 +1,26 @@
+'''Индексы (столбец, id) для сортировки таблиц панели администратора'''
+from .operations import get_index, create_index_online
+
+
+VERSION = 9
+NAME = 'sort_indexes'
+TRANSACTIONAL = False
+
+INDEXES = [
+    ('users', 'ix_users_last_name_sort'),
+    ('users', 'ix_users_registration_date_sort'),
+    ('admins', 'ix_admins_last_name_sort'),
+    ('publishers', 'ix_publishers_name_sort'),
+    ('publishers', 'ix_publishers_sales_start_sort'),
+    ('publications', 'ix_publications_name_sort'),
+    ('issues', 'ix_issues_name_sort'),
+    ('couriers', 'ix_couriers_last_name_sort'),
+    ('couriers', 'ix_couriers_rating_sort'),
+    ('complaints', 'ix_complaints_created_at_sort'),
+    ('deliveries', 'ix_deliveries_recipient_name_sort'),
+]
+
+
+def upgrade(connection) -> None:
+    for table_name, index_name in INDEXES:
+        create_index_online(connection, get_index(table_name, index_name))
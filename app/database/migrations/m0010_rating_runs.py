@@ -0,0 +1,12 @@
+'''Журнал завершенных пересчетов рейтинга - граница инкрементального пересчета'''
+from app.database.models.rating_run_model import rating_runs
+
+
+VERSION = 10
+NAME = 'rating_runs'
+TRANSACTIONAL = True
+
+
+def upgrade(connection) -> None:
+    # Новая пустая таблица: первый пересчет после миграции будет полным
+    rating_runs.create(connection, checkfirst=True)
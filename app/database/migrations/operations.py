@@ -0,0 +1,292 @@
+from sqlalchemy import Column, Index, inspect, text
+from sqlalchemy.schema import CreateColumn, CreateIndex
+from app.database.models.base_model import Base
+from app.database.partitions import is_partitioned
+from app.database import models  # noqa: F401 - регистрирует таблицы в Base.metadata
+
+
+def get_index(table_name: str, index_name: str) -> Index:
+    '''
+    Возвращает индекс, объявленный в моделях
+
+    Arguments:
+        table_name (str): Имя таблицы
+        index_name (str): Имя индекса
+
+    Returns:
+        Index: Объявление индекса
+
+    Raises:
+        LookupError: Если индекс не объявлен в моделях
+    '''
+    for index in Base.metadata.tables[table_name].indexes:
+        if index.name == index_name:
+            return index
+    raise LookupError(f"Индекс {index_name} не объявлен для таблицы {table_name}")
+
+
+def add_column(connection, table_name: str, column: Column) -> bool:
+    '''
+    Добавляет столбец в существующую таблицу, если его еще нет
+
+    Arguments:
+        connection (Connection): Соединение с БД
+        table_name (str): Имя таблицы
+        column (Column): Описание нового столбца (не привязанное к таблице)
+
+    Returns:
+        bool: True, если столбец был добавлен
+    '''
+    existing = {c['name'] for c in inspect(connection).get_columns(table_name)}
+    if column.name in existing:
+        return False
+
+    connection.exec_driver_sql(
+        f"ALTER TABLE {table_name} ADD COLUMN {CreateColumn(column).compile(dialect=connection.dialect)}"
+    )
+    return True
+
+
+def index_is_invalid(connection, index_name: str) -> bool:
+    '''
+    Проверяет, остался ли в PostgreSQL невалидный индекс после прерванной
+    сборки CREATE INDEX CONCURRENTLY
+
+    Arguments:
+        connection (Connection): Соединение с БД
+        index_name (str): Имя индекса
+
+    Returns:
+        bool: True, если индекс существует и помечен невалидным
+    '''
+    return bool(connection.scalar(
+        text(
+            "SELECT NOT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND pg_table_is_visible(i.indrelid)"
+        ),
+        {'name': index_name}
+    ))
+
+
+def create_index_online(connection, index: Index) -> None:
+    '''
+    Создает индекс без блокировки записи в таблицу
+
+    На PostgreSQL выполняется CREATE INDEX CONCURRENTLY IF NOT EXISTS
+    (соединение должно быть в режиме AUTOCOMMIT); невалидный индекс,
+    оставшийся от прерванной сборки, сначала удаляется. На секционированной
+    таблице индекс строится по секциям (см. _create_partitioned_index).
+    На остальных БД выполняется обычный CREATE INDEX IF NOT EXISTS.
+
+    Arguments:
+        connection (Connection): Соединение с БД
+        index (Index): Индекс, объявленный в моделях (см. get_index)
+    '''
+    if connection.dialect.name != 'postgresql':
+        connection.execute(CreateIndex(index, if_not_exists=True))
+        return
+
+    table_name = index.table.name
+    if is_partitioned(connection, table_name):
+        # Определение индекса без имени и таблицы: (столбцы) [USING ...] [WHERE ...]
+        ddl = str(CreateIndex(index).compile(dialect=connection.dialect))
+        definition = ddl.split(f" ON {table_name} ", 1)[1]
+        _create_partitioned_index(connection, table_name, index.name, definition)
+        return
+
+    if index_is_invalid(connection, index.name):
+        connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"'))
+
+    # CONCURRENTLY включается только на время миграции: create_all выполняется
+    # в транзакции, где такая сборка запрещена
+    index.dialect_kwargs['postgresql_concurrently'] = True
+    try:
+        connection.execute(CreateIndex(index, if_not_exists=True))
+    finally:
+        index.dialect_kwargs['postgresql_concurrently'] = False
+
+
+def _partitions(connection, table_name: str) -> list:
+    return connection.execute(
+        text(
+            "SELECT c.relname, c.relkind = 'p' FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent AND pg_table_is_visible(p.oid) ORDER BY c.relname"
+        ),
+        {'parent': table_name}
+    ).all()
+
+
+def _attached_index(connection, parent_index: str, partition: str) -> str | None:
+    # Индекс секции, уже присоединенный к parent_index (например, созданный
+    # каскадом обычным CREATE INDEX по секционированной таблице)
+    return connection.scalar(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_index x ON x.indexrelid = c.oid "
+            "JOIN pg_class t ON t.oid = x.indrelid "
+            "WHERE i.inhparent = CAST(:index AS regclass) AND t.relname = :partition"
+        ),
+        {'index': parent_index, 'partition': partition}
+    )
+
+
+def _equivalent_index(connection, parent_index: str, partition: str) -> str | None:
+    # Валидный неприсоединенный индекс секции с тем же определением, что у
+    # parent_index: от прерванного запуска или построенный вручную
+    return connection.scalar(
+        text(
+            "SELECT c.relname FROM pg_index x "
+            "JOIN pg_class c ON c.oid = x.indexrelid "
+            "JOIN pg_class t ON t.oid = x.indrelid "
+            "JOIN pg_index p ON p.indexrelid = CAST(:index AS regclass) "
+            "WHERE t.relname = :partition AND x.indisvalid AND x.indisunique = p.indisunique "
+            "AND NOT EXISTS (SELECT 1 FROM pg_inherits i WHERE i.inhrelid = x.indexrelid) "
+            "AND substring(pg_get_indexdef(x.indexrelid) from ' USING .*') "
+            "= substring(pg_get_indexdef(p.indexrelid) from ' USING .*') "
+            "ORDER BY c.relname LIMIT 1"
+        ),
+        {'index': parent_index, 'partition': partition}
+    )
+
+
+def _create_partitioned_index(connection, table_name: str, index_name: str, definition: str,
+                              suffix: str | None = None) -> None:
+    # Индекс секционированной таблицы нельзя строить CONCURRENTLY. Поэтому он
+    # создается только на самой таблице (ON ONLY, пока невалидный), индексы
+    # секций строятся по одному без блокировки записи и присоединяются к нему.
+    # После присоединения последней секции индекс становится валидным, а новые
+    # секции получают его автоматически.
+    #
+    # У секции может уже быть подходящий индекс: присоединенный (индекс на
+    # таблице был создан обычным CREATE INDEX) или такой же неприсоединенный
+    # (прерванный запуск). Он используется вместо нового: второй индекс с тем же
+    # определением к секции не присоединить. Повторный запуск поэтому только
+    # достраивает недостающее
+    connection.execute(text(f'CREATE INDEX IF NOT EXISTS "{index_name}" ON ONLY {table_name} {definition}'))
+
+    # Индексы секций называются ix_<секция>_<суффикс индекса таблицы>
+    suffix = suffix or index_name.removeprefix(f'ix_{table_name}_')
+    for partition, partitioned in _partitions(connection, table_name):
+        partition_index = (_attached_index(connection, index_name, partition)
+                           or _equivalent_index(connection, index_name, partition))
+        if partitioned:
+            # Индекс вложенной секционированной секции достраивается по ее секциям
+            partition_index = partition_index or f'ix_{partition}_{suffix}'[:63]
+            _create_partitioned_index(connection, partition, partition_index, definition, suffix)
+        elif partition_index is None:
+            partition_index = f'ix_{partition}_{suffix}'[:63]
+            if index_is_invalid(connection, partition_index):
+                connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{partition_index}"'))
+            connection.execute(text(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{partition_index}" ON {partition} {definition}'
+            ))
+        # Уже присоединенный индекс ATTACH не меняет
+        connection.execute(text(f'ALTER INDEX "{index_name}" ATTACH PARTITION "{partition_index}"'))
+
+
+# Сколько строк обновляется одним оператором при заполнении нового столбца
+BACKFILL_BATCH_SIZE = 5000
+
+
+def backfill_in_batches(connection, table_name: str, assignments: str, condition: str,
+                        batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    '''
+    Заполняет столбец существующих строк порциями
+
+    Таблица проходится по первичному ключу диапазонами id по batch_size:
+    каждый UPDATE читает только свой диапазон по индексу id, поэтому проход
+    линеен по размеру таблицы и не просматривает заново уже заполненные строки.
+    В режиме AUTOCOMMIT каждая порция сразу фиксируется, строки блокируются
+    ненадолго, а прерванное заполнение продолжается при повторном запуске
+    (condition отбирает только еще не заполненные строки). Строки, вставленные
+    после начала прохода (id больше max(id) на старте), не обрабатываются.
+
+    Arguments:
+        connection (Connection): Соединение с БД (для PostgreSQL - AUTOCOMMIT)
+        table_name (str): Имя таблицы со столбцом id
+        assignments (str): SQL-выражение SET, например "created_at = delivery_date"
+        condition (str): SQL-условие незаполненных строк, например "created_at IS NULL"
+        batch_size (int): Ширина диапазона id в одном UPDATE
+
+    Returns:
+        int: Количество обновленных строк
+    '''
+    bounds = connection.execute(text(f"SELECT min(id), max(id) FROM {table_name}")).one()
+    if bounds[0] is None:
+        return 0
+
+    statement = text(
+        f"UPDATE {table_name} SET {assignments} "
+        f"WHERE id > :last AND id <= :upper AND ({condition})"
+    )
+    last, max_id = bounds[0] - 1, bounds[1]
+    updated = 0
+    while last < max_id:
+        upper = min(last + batch_size, max_id)
+        updated += connection.execute(statement, {'last': last, 'upper': upper}).rowcount
+        last = upper
+    return updated
+
+
+def _not_null_constraint(table_name: str, column_name: str) -> str:
+    return f"{table_name}_{column_name}_not_null"
+
+
+def _is_nullable(connection, table_name: str, column_name: str) -> bool:
+    columns = {c['name']: c for c in inspect(connection).get_columns(table_name)}
+    return columns[column_name]['nullable']
+
+
+def add_not_null_check(connection, table_name: str, column_name: str) -> None:
+    '''
+    Запрещает новые NULL в столбце, не проверяя существующие строки (только PostgreSQL)
+
+    Добавляет CHECK (column IS NOT NULL) NOT VALID: ограничение создается без
+    просмотра таблицы и действует для новых и изменяемых строк. После
+    заполнения старых строк столбец переводится в NOT NULL через set_not_null.
+
+    Arguments:
+        connection (Connection): Соединение с БД
+        table_name (str): Имя таблицы
+        column_name (str): Имя столбца
+    '''
+    if connection.dialect.name != 'postgresql' or not _is_nullable(connection, table_name, column_name):
+        return
+
+    constraint = _not_null_constraint(table_name, column_name)
+    exists = connection.scalar(
+        text("SELECT 1 FROM pg_constraint WHERE conname = :name"), {'name': constraint}
+    )
+    if not exists:
+        connection.execute(text(
+            f"ALTER TABLE {table_name} ADD CONSTRAINT {constraint} "
+            f"CHECK ({column_name} IS NOT NULL) NOT VALID"
+        ))
+
+
+def set_not_null(connection, table_name: str, column_name: str) -> None:
+    '''
+    Переводит столбец в NOT NULL без долгой блокировки таблицы (только PostgreSQL)
+
+    Проверка существующих строк выполняется VALIDATE CONSTRAINT ограничения из
+    add_not_null_check, которое не блокирует запись. SET NOT NULL затем
+    использует проверенное ограничение и не просматривает таблицу (PostgreSQL 12+),
+    после чего ограничение удаляется.
+
+    Arguments:
+        connection (Connection): Соединение с БД
+        table_name (str): Имя таблицы
+        column_name (str): Имя столбца
+    '''
+    if connection.dialect.name != 'postgresql' or not _is_nullable(connection, table_name, column_name):
+        return
+
+    constraint = _not_null_constraint(table_name, column_name)
+    add_not_null_check(connection, table_name, column_name)
+    connection.execute(text(f"ALTER TABLE {table_name} VALIDATE CONSTRAINT {constraint}"))
+    connection.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN {column_name} SET NOT NULL"))
+    connection.execute(text(f"ALTER TABLE {table_name} DROP CONSTRAINT IF EXISTS {constraint}"))
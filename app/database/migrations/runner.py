@@ -0,0 +1,95 @@
+import logging
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, Integer, Text, DateTime, select, insert, func
+
+
+logger = logging.getLogger(__name__)
+
+# Ключ advisory-блокировки PostgreSQL, чтобы миграции не запускались параллельно
+# с нескольких терминалов
+MIGRATION_LOCK_KEY = 4815162342
+
+schema_version = Table(
+    'schema_version',
+    MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('name', Text, nullable=False),
+    Column('applied_at', DateTime, nullable=False, default=datetime.now)
+)
+
+
+def applied_versions(engine) -> set[int]:
+    '''
+    Возвращает номера примененных миграций
+
+    Arguments:
+        engine (Engine): Движок основной БД
+
+    Returns:
+        set[int]: Номера версий из таблицы schema_version
+    '''
+    schema_version.create(engine, checkfirst=True)
+    with engine.connect() as connection:
+        return set(connection.scalars(select(schema_version.c.version)))
+
+
+def apply_migration(engine, migration) -> None:
+    '''
+    Применяет одну миграцию и записывает ее версию в schema_version
+
+    Транзакционные миграции (TRANSACTIONAL = True) выполняются в одной транзакции
+    вместе с записью версии. Остальные (например, CREATE INDEX CONCURRENTLY)
+    выполняются в режиме AUTOCOMMIT и поэтому должны быть идемпотентными:
+    при сбое миграция повторяется целиком при следующем запуске.
+
+    Arguments:
+        engine (Engine): Движок основной БД
+        migration (module): Модуль миграции с VERSION, NAME, TRANSACTIONAL и upgrade(connection)
+    '''
+    record = insert(schema_version).values(version=migration.VERSION, name=migration.NAME)
+
+    if migration.TRANSACTIONAL:
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(record)
+        return
+
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        migration.upgrade(connection)
+        connection.execute(record)
+
+
+def run_migrations(engine, migrations: list) -> list[int]:
+    '''
+    Применяет все еще не примененные миграции по возрастанию версии
+
+    Arguments:
+        engine (Engine): Движок основной БД
+        migrations (list): Модули миграций
+
+    Returns:
+        list[int]: Номера версий, примененных при этом запуске
+    '''
+    applied = []
+
+    with engine.connect() as lock_connection:
+        is_postgresql = engine.dialect.name == 'postgresql'
+        if is_postgresql:
+            lock_connection.execute(select(func.pg_advisory_lock(MIGRATION_LOCK_KEY)))
+            lock_connection.commit()
+
+        try:
+            done = applied_versions(engine)
+            for migration in sorted(migrations, key=lambda module: module.VERSION):
+                if migration.VERSION in done:
+                    continue
+
+                logger.info(f"Применение миграции {migration.VERSION}: {migration.NAME}")
+                apply_migration(engine, migration)
+                applied.append(migration.VERSION)
+        finally:
+            if is_postgresql:
+                lock_connection.execute(select(func.pg_advisory_unlock(MIGRATION_LOCK_KEY)))
+                lock_connection.commit()
+
+    return applied
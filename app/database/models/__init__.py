@@ -7,6 +7,7 @@ from .admin_model import Admin
 from .complaint_model import Complaint
 from .courier_model import Courier
 from .delivery_model import Delivery
+from .rating_run_model import rating_runs
 
 
 __all__ = [
@@ -3,6 +3,7 @@ from typing import Optional
 from sqlalchemy import Boolean, DateTime, Text, Integer, Float
 from sqlalchemy.orm import Mapped, mapped_column
 from . import Base
+from app.database.column_indexes import declare_prefix_indexes, declare_sort_indexes
 from passlib.context import CryptContext
 
 # Контекст для хеширования паролей
@@ -35,7 +36,7 @@ class Admin(Base):
     last_name: Mapped[str] = mapped_column(Text, nullable=False)
     middle_name: Mapped[Optional[str]] = mapped_column(Text)
 
-    phone_number: Mapped[str] = mapped_column(Text, nullable=False)
+    phone_number: Mapped[str] = mapped_column(Text, nullable=False, index=True)
     email: Mapped[Optional[str]] = mapped_column(Text)
     address: Mapped[str] = mapped_column(Text, nullable=False)
     salary: Mapped[float] = mapped_column(Float, nullable=False)
@@ -92,3 +93,11 @@ class Admin(Base):
             bool: True, если пароль верный, иначе False
         '''
         return pwd_context.verify(password, self.hashed_password)
+
+
+# Фильтры таблицы панели администратора по началу строки (только PostgreSQL)
+declare_prefix_indexes(Admin.last_name, Admin.phone_number, Admin.email)
+
+
+# Сортировка таблицы панели администратора по столбцу (keyset по столбцу и id)
+declare_sort_indexes(Admin.last_name)
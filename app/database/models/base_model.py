@@ -1,6 +1,15 @@
+from sqlalchemy import DDL, event
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
     '''Базовый класс для всех моделей SQLAlchemy.'''
     pass
+
+
+# Триграммные индексы поиска (app/database/search.py) требуют расширения pg_trgm
+# до создания таблиц в create_all
+event.listen(
+    Base.metadata, 'before_create',
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect='postgresql')
+)
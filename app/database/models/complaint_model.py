@@ -2,6 +2,7 @@ from datetime import datetime
 from sqlalchemy import Text, ForeignKey, DateTime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from . import Base
+from app.database.column_indexes import declare_sort_indexes
 
 class Complaint(Base):
     '''
@@ -18,10 +19,10 @@ class Complaint(Base):
     
     id: Mapped[int] = mapped_column(primary_key=True)
     
-    courier_id: Mapped[int] = mapped_column(ForeignKey("couriers.id"), nullable=False)
+    courier_id: Mapped[int] = mapped_column(ForeignKey("couriers.id"), nullable=False, index=True)
     courier: Mapped["Courier"] = relationship("Courier", back_populates="complaints")
     
-    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now, index=True)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     
     def __repr__(self) -> str:
@@ -43,3 +44,7 @@ class Complaint(Base):
         current_date = datetime.now()
         delta = current_date - self.created_at
         return delta.days
+
+
+# Сортировка таблицы панели администратора по столбцу (keyset по столбцу и id)
+declare_sort_indexes(Complaint.created_at)
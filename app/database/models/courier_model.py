@@ -3,6 +3,7 @@ from typing import List, Optional
 from sqlalchemy import Boolean, DateTime, Text, Integer, Float, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from . import Base
+from app.database.column_indexes import declare_prefix_indexes, declare_sort_indexes
 
 class Courier(Base):
     '''
@@ -18,6 +19,9 @@ class Courier(Base):
         salary (float): Зарплата доставщика
         rating (float): Рейтинг доставщика
         hire_date (datetime): Дата устройства на работу
+        open_deliveries_count (int): Количество недоставленных поставок (поддерживается триггером БД)
+        complaints_count (int): Количество претензий (поддерживается триггером БД)
+        rating_updated_at (Optional[datetime]): Время последнего пересчета рейтинга
         deliveries (List["Delivery"]): Список доставок доставщика
         complaints (List["Complaint"]): Список претензий на доставщика
     '''
@@ -34,6 +38,11 @@ class Courier(Base):
     salary: Mapped[float] = mapped_column(Float, nullable=False)
     rating: Mapped[float] = mapped_column(Float, nullable=False, default=5.0)
     hire_date: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+    # Счетчики ведут триггеры на deliveries и complaints (app/database/counters.py)
+    open_deliveries_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    complaints_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    # Заполняет пакетный пересчет (app/services/rating_engine.py)
+    rating_updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, index=True)
     
     deliveries: Mapped[List['Delivery']] = relationship('Delivery', back_populates="courier")
     complaints: Mapped[List["Complaint"]] = relationship("Complaint", back_populates="courier")
@@ -66,3 +75,11 @@ class Courier(Base):
             new_rating (float): Новое значение рейтинга
         '''
         self.rating = new_rating
+
+
+# Фильтры таблицы панели администратора по началу строки (только PostgreSQL)
+declare_prefix_indexes(Courier.last_name, Courier.phone_number)
+
+
+# Сортировка таблицы панели администратора по столбцу (keyset по столбцу и id)
+declare_sort_indexes(Courier.last_name, Courier.rating)
@@ -1,8 +1,9 @@
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import Boolean, DateTime, Text, Integer, Float, ForeignKey
+from sqlalchemy import Boolean, DateTime, Text, Integer, Float, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from . import Base
+from app.database.column_indexes import declare_prefix_indexes, declare_sort_indexes
 
 
 class Delivery(Base):
@@ -19,11 +20,25 @@ class Delivery(Base):
         recipient_phone (str): Телефон получателя
         item_cost (float): Стоимость товара
         is_delivered (bool): Флаг статуса доставки
+        created_at (datetime): Время создания поставки
         delivery_date (Optional[datetime]): Дата и время доставки
         courier_id (int): Идентефикатор курьера
         courier (Courier): Связь с курьером
     '''
     __tablename__ = 'deliveries'
+    # В PostgreSQL таблица секционирована миграцией m0006 (app/database/partitions.py):
+    # первичный ключ там (id, is_delivered, created_at), для ORM ключом остается id.
+    # Уникальность id в PostgreSQL держится только на последовательности:
+    # id не задается вручную и не обновляется
+    __table_args__ = (
+        # Частичный индекс только по недоставленным поставкам: остается маленьким,
+        # сколько бы доставленных записей ни накопилось
+        Index(
+            'ix_deliveries_pending', 'id',
+            postgresql_where=text('NOT is_delivered'),
+            sqlite_where=text('is_delivered = 0')
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -37,8 +52,9 @@ class Delivery(Base):
 
     item_cost: Mapped[float] = mapped_column(Float, nullable=False)
     is_delivered: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
-    delivery_date: Mapped[Optional[datetime]] = mapped_column(DateTime)
-    courier_id: Mapped[int] = mapped_column(ForeignKey('couriers.id'), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now, index=True)
+    delivery_date: Mapped[Optional[datetime]] = mapped_column(DateTime, index=True)
+    courier_id: Mapped[int] = mapped_column(ForeignKey('couriers.id'), nullable=False, index=True)
     courier: Mapped['Courier'] = relationship('Courier', back_populates='deliveries')
 
     def __repr__(self) -> str:
@@ -71,3 +87,11 @@ class Delivery(Base):
         delta = current_date - self.delivery_date
 
         return delta.days
+
+
+# Фильтры таблицы панели администратора по началу строки (только PostgreSQL)
+declare_prefix_indexes(Delivery.recipient_name, Delivery.recipient_phone)
+
+
+# Сортировка таблицы панели администратора по столбцу (keyset по столбцу и id)
+declare_sort_indexes(Delivery.recipient_name)
@@ -1,8 +1,12 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Boolean, DateTime, Text, Integer, Float, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Boolean, DateTime, Text, Integer, Float, ForeignKey, Index, select, func, and_, case
+from sqlalchemy.orm import Mapped, mapped_column, relationship, aliased
+from sqlalchemy.ext.hybrid import hybrid_property
 from . import Base
+from app.database.column_indexes import declare_prefix_indexes, declare_sort_indexes
+from app.database.search import declare_search_indexes
+from .publication_model import Publication
 
 
 class Issue(Base):
@@ -29,6 +33,7 @@ class Issue(Base):
         cost (float): Стоимость данного выпуска
         is_discount (bool): Флаг наличия скидки на выпуск
         discount (int): Размер скидки при наличии
+        effective_price (float): Цена с учетом скидки, доступна и в SQL-запросах
     '''
     __tablename__ = 'issues'
     
@@ -38,7 +43,7 @@ class Issue(Base):
     issue_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     is_special_edition: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     issue_type: Mapped[str] = mapped_column(Text, nullable=False)
-    publication_id: Mapped[int] = mapped_column(ForeignKey("publications.id"), nullable=False)
+    publication_id: Mapped[int] = mapped_column(ForeignKey("publications.id"), nullable=False, index=True)
     publication: Mapped["Publication"] = relationship("Publication", back_populates="issues")
     on_sale: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     name: Mapped[str] = mapped_column(Text, nullable=False)
@@ -57,21 +62,42 @@ class Issue(Base):
         '''
         return f"<ShowItem(id={self.id}, name='{self.name}', issue={self.issue_number})>"
     
-    def get_price(self) -> float:
+    @hybrid_property
+    def effective_price(self) -> float:
         '''
-        Рассчитывает итоговую цену выпуска с учетом скидки
+        Итоговая цена выпуска с учетом скидки
+
+        В запросах вычисляется на стороне БД (Issue.effective_price можно
+        использовать в order_by, where и агрегатах), формула совпадает с Python-версией.
 
         Returns:
-            float: Итоговая цена после применения скидки (если есть)
+            float: Цена после применения скидки (если есть), 0.0 если цена не задана
         '''
         if not self.cost:
             return 0.0
 
-        if self.discount:
-            return self.cost * (self.discount / 100.0)
+        if self.is_discount and self.discount:
+            return self.cost * ((100 - self.discount) / 100.0)
 
         return self.cost
 
+    @effective_price.inplace.expression
+    @classmethod
+    def _effective_price_expression(cls):
+        return func.coalesce(cls.cost, 0.0) * case(
+            (and_(cls.is_discount, cls.discount.is_not(None)), (100 - cls.discount) / 100.0),
+            else_=1.0
+        )
+
+    def get_price(self) -> float:
+        '''
+        Рассчитывает итоговую цену выпуска с учетом скидки
+
+        Returns:
+            float: Итоговая цена после применения скидки (если есть)
+        '''
+        return self.effective_price
+
     def days_since_publication(self) -> int:
         '''
         Возвращает количество дней с момента выпуска
@@ -82,3 +108,46 @@ class Issue(Base):
         current_date = datetime.now()
         delta = current_date - self.issue_date
         return delta.days
+
+
+# Индекс для выбора последнего выпуска каждого издания (DISTINCT ON / row_number)
+Index(
+    'ix_issues_publication_latest',
+    Issue.publication_id, Issue.issue_date.desc(), Issue.id.desc()
+)
+
+
+# Последний выпуск издания: выпуски пронумерованы внутри издания по убыванию даты,
+# связь берет выпуск с номером 1. Загружается selectinload одним запросом
+# для любого числа изданий, условие publication_id IN (...) попадает внутрь
+# подзапроса и использует ix_issues_publication_latest.
+_issues_by_recency = select(
+    Issue,
+    func.row_number().over(
+        partition_by=Issue.publication_id,
+        order_by=(Issue.issue_date.desc(), Issue.id.desc())
+    ).label('recency')
+).subquery()
+_latest_issue = aliased(Issue, _issues_by_recency)
+
+Publication.latest_issue = relationship(
+    _latest_issue,
+    primaryjoin=and_(
+        _latest_issue.publication_id == Publication.id,
+        _issues_by_recency.c.recency == 1
+    ),
+    uselist=False,
+    viewonly=True
+)
+
+
+# Полнотекстовый и триграммный поиск по name и description (только PostgreSQL)
+declare_search_indexes(Issue)
+
+
+# Фильтры таблицы панели администратора по началу строки (только PostgreSQL)
+declare_prefix_indexes(Issue.name)
+
+
+# Сортировка таблицы панели администратора по столбцу (keyset по столбцу и id)
+declare_sort_indexes(Issue.name)
@@ -1,9 +1,11 @@
 from datetime import datetime
 from typing import List
-from sqlalchemy import Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import Boolean, DateTime, Text, Integer, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .user_subscription_model import user_subscriptions
 from . import Base
+from app.database.column_indexes import declare_prefix_indexes, declare_sort_indexes
+from app.database.search import declare_search_indexes
 
 
 class Publication(Base):
@@ -21,20 +23,24 @@ class Publication(Base):
         description (str): Описание издания
         
         show_items (List["Issue"]): Связанные выпуски данного издания
+        latest_issue (Optional[Issue]): Последний выпуск издания (только чтение, объявлена в issue_model)
         subscribers (List[User]): Пользователи, подписанные на издание
+        subscribers_count (int): Количество подписчиков (поддерживается триггером БД)
     '''
     __tablename__ = 'publications'
 
     id: Mapped[int] = mapped_column(primary_key=True)
     
     publication_type: Mapped[str] = mapped_column(Text, nullable=False)
-    publisher_id: Mapped[int] = mapped_column(ForeignKey("publishers.id"), nullable=False)
+    publisher_id: Mapped[int] = mapped_column(ForeignKey("publishers.id"), nullable=False, index=True)
     publisher: Mapped["Publisher"] = relationship("Publisher", back_populates="publications")
     on_sale: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     sales_start: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
 
     name: Mapped[str] = mapped_column(Text, nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
+    # Счетчик ведет триггер на user_subscriptions (app/database/counters.py)
+    subscribers_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
     # pg: Mapped[Optional[int]] = mapped_column(Integer)
     
     issues: Mapped[List["Issue"]] = relationship("Issue", back_populates="publication")
@@ -73,6 +79,16 @@ class Publication(Base):
         Returns:
             Issue: Последний выпуск или None, если выпусков нет
         '''
-        if not self.issues:
-            return None
-        return max(self.issues, key=lambda issue: issue.issue_date)
+        return self.latest_issue
+
+
+# Полнотекстовый и триграммный поиск по name и description (только PostgreSQL)
+declare_search_indexes(Publication)
+
+
+# Фильтры таблицы панели администратора по началу строки (только PostgreSQL)
+declare_prefix_indexes(Publication.name)
+
+
+# Сортировка таблицы панели администратора по столбцу (keyset по столбцу и id)
+declare_sort_indexes(Publication.name)
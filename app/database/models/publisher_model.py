@@ -3,6 +3,7 @@ from typing import List
 from sqlalchemy import Boolean, DateTime, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from . import Base
+from app.database.column_indexes import declare_prefix_indexes, declare_sort_indexes
 
 
 class Publisher(Base):
@@ -45,3 +46,10 @@ class Publisher(Base):
         '''
         return [pub for pub in self.publications if pub.on_sale]
 
+
+# Фильтры таблицы панели администратора по началу строки (только PostgreSQL)
+declare_prefix_indexes(Publisher.name, Publisher.owner)
+
+
+# Сортировка таблицы панели администратора по столбцу (keyset по столбцу и id)
+declare_sort_indexes(Publisher.name, Publisher.sales_start)
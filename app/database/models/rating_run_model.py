@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import Table, Column, Integer, Boolean, DateTime
+from . import Base
+
+
+# Завершенные пересчеты рейтинга (app/services/rating_engine.py). Запись
+# добавляется только после обновления всех доставщиков пересчета, поэтому
+# время начала последней записи - надежная граница для следующего
+# инкрементального пересчета: прерванный пересчет ее не сдвигает
+rating_runs = Table(
+    "rating_runs",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("started_at", DateTime, nullable=False, index=True),
+    Column("finished_at", DateTime, nullable=False, default=datetime.now),
+    Column("full", Boolean, nullable=False, default=False),
+    Column("couriers", Integer, nullable=False)
+)
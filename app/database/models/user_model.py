@@ -4,6 +4,7 @@ from sqlalchemy import Boolean, DateTime, Text, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .user_subscription_model import user_subscriptions
 from . import Base
+from app.database.column_indexes import declare_prefix_indexes, declare_sort_indexes
 
 
 class User(Base):
@@ -32,8 +33,8 @@ class User(Base):
     last_name: Mapped[str] = mapped_column(Text, nullable=False)
     middle_name: Mapped[Optional[str]] = mapped_column(Text)
 
-    phone_number: Mapped[str] = mapped_column(Text, nullable=False)
-    email: Mapped[Optional[str]] = mapped_column(Text)
+    phone_number: Mapped[str] = mapped_column(Text, nullable=False, unique=True, index=True)
+    email: Mapped[Optional[str]] = mapped_column(Text, unique=True, index=True)
     address: Mapped[str] = mapped_column(Text, nullable=False)
     tg_chat_id: Mapped[Optional[int]] = mapped_column(Integer, unique=True)
 
@@ -56,28 +57,6 @@ class User(Base):
         '''
         return f"<User(id={self.id}, name='{self.last_name} {self.first_name}')>"
 
-    def has_subscription(self, publication_id: int = None, publication_name: str = None) -> bool:
-        '''
-        Проверяет, подписан ли пользователь на указанное издание
-
-        Args:
-            publication_id (int, optional): ID издания для проверки
-            publication_name (str, optional): Название издания для проверки
-
-        Returns:
-            bool: True, если пользователь подписан на издание, иначе False
-            
-        Примечание:
-            Необходимо указать хотя бы один из параметров: publication_id или publication_name
-        '''
-        if publication_id is not None:
-            return any(pub.id == publication_id for pub in self.subscribed_publications)
-            
-        if publication_name is not None:
-            return any(pub.name == publication_name for pub in self.subscribed_publications)
-            
-        return False
-    
     def get_full_name(self) -> str:
         '''
         Возвращает полное имя пользователя
@@ -88,3 +67,11 @@ class User(Base):
         if self.middle_name:
             return f"{self.last_name} {self.first_name} {self.middle_name}"
         return f"{self.last_name} {self.first_name}"
+
+
+# Фильтры таблицы панели администратора по началу строки (только PostgreSQL)
+declare_prefix_indexes(User.last_name, User.phone_number, User.email)
+
+
+# Сортировка таблицы панели администратора по столбцу (keyset по столбцу и id)
+declare_sort_indexes(User.last_name, User.registration_date)
@@ -6,5 +6,5 @@ user_subscriptions = Table(
     "user_subscriptions",
     Base.metadata,
     Column("user_id", ForeignKey("users.id"), primary_key=True),
-    Column("publication_id", ForeignKey("publications.id"), primary_key=True)
+    Column("publication_id", ForeignKey("publications.id"), primary_key=True, index=True)
 )
@@ -0,0 +1,126 @@
+from datetime import date
+from sqlalchemy import text
+
+
+# Секционирование поставок (только PostgreSQL):
+#
+#   deliveries                       PARTITION BY LIST (is_delivered)
+#     deliveries_pending             FOR VALUES IN (false) - горячая секция
+#     deliveries_delivered           FOR VALUES IN (true) PARTITION BY RANGE (created_at)
+#       deliveries_delivered_YYYY_MM - месяц создания поставки
+#       deliveries_delivered_default - строки вне созданных месяцев
+#
+# Недоставленные поставки всегда лежат в маленькой горячей секции, а условие
+# по is_delivered и created_at отсекает ненужные секции при планировании запроса.
+
+PENDING_PARTITION = 'deliveries_pending'
+DELIVERED_PARTITION = 'deliveries_delivered'
+DEFAULT_PARTITION = 'deliveries_delivered_default'
+MONTH_PARTITION_PREFIX = 'deliveries_delivered_'
+
+
+def month_start(day: date, shift: int = 0) -> date:
+    '''
+    Возвращает первое число месяца, сдвинутого на shift месяцев
+
+    Arguments:
+        day (date): Любая дата месяца
+        shift (int): Сдвиг в месяцах (может быть отрицательным)
+
+    Returns:
+        date: Первое число месяца
+    '''
+    index = day.year * 12 + day.month - 1 + shift
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_partition_name(month: date) -> str:
+    '''
+    Возвращает имя месячной секции доставленных поставок
+
+    Arguments:
+        month (date): Первое число месяца
+
+    Returns:
+        str: Имя вида deliveries_delivered_2025_05
+    '''
+    return f"{MONTH_PARTITION_PREFIX}{month.year:04d}_{month.month:02d}"
+
+
+def is_partitioned(connection, table_name: str) -> bool:
+    '''
+    Проверяет, является ли таблица секционированной
+
+    Arguments:
+        connection (Connection): Соединение с БД PostgreSQL
+        table_name (str): Имя таблицы
+
+    Returns:
+        bool: True, если таблица секционирована
+    '''
+    return bool(connection.scalar(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = :name AND pg_table_is_visible(c.oid))"
+        ),
+        {'name': table_name}
+    ))
+
+
+def create_month_partition(connection, month: date) -> str:
+    '''
+    Создает месячную секцию доставленных поставок, если ее еще нет
+
+    Arguments:
+        connection (Connection): Соединение с БД PostgreSQL
+        month (date): Первое число месяца
+
+    Returns:
+        str: Имя секции
+    '''
+    name = month_partition_name(month)
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {DELIVERED_PARTITION} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{month_start(month, 1).isoformat()}')"
+    ))
+    return name
+
+
+def get_month_partitions(connection) -> dict[date, str]:
+    '''
+    Возвращает присоединенные месячные секции доставленных поставок
+
+    Arguments:
+        connection (Connection): Соединение с БД PostgreSQL
+
+    Returns:
+        dict[date, str]: {первое число месяца: имя секции} по возрастанию месяца
+    '''
+    names = connection.scalars(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent AND c.relname LIKE :prefix"
+        ),
+        {'parent': DELIVERED_PARTITION, 'prefix': f"{MONTH_PARTITION_PREFIX}____\\___"}
+    )
+
+    partitions = {}
+    for name in names:
+        year, month = name[len(MONTH_PARTITION_PREFIX):].split('_')
+        partitions[date(int(year), int(month), 1)] = name
+    return dict(sorted(partitions.items()))
+
+
+def detach_month_partition(connection, name: str) -> None:
+    '''
+    Отсоединяет месячную секцию: таблица остается в БД как обычная и больше
+    не участвует в запросах к deliveries (ее можно выгрузить и удалить)
+
+    Arguments:
+        connection (Connection): Соединение с БД PostgreSQL
+        name (str): Имя секции
+    '''
+    connection.execute(text(f"ALTER TABLE {DELIVERED_PARTITION} DETACH PARTITION {name}"))
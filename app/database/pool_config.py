@@ -0,0 +1,86 @@
+import os
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+# Параметры пула соединений для каждого профиля развертывания
+POOL_PROFILES = {
+    # Терминал самообслуживания: несколько окон, короткие запросы
+    'kiosk': {
+        'pool_size': 5,
+        'max_overflow': 5,
+        'pool_timeout': 10,
+        'pool_recycle': 1800,
+    },
+    # Панель администратора: один оператор, тяжелые табличные запросы
+    'admin': {
+        'pool_size': 3,
+        'max_overflow': 2,
+        'pool_timeout': 30,
+        'pool_recycle': 1800,
+    },
+    # Telegram-бот: много коротких параллельных обработчиков
+    'bot': {
+        'pool_size': 10,
+        'max_overflow': 10,
+        'pool_timeout': 5,
+        'pool_recycle': 1800,
+    },
+    # Пакетные задачи (загрузка CSV, пересчеты): мало долгих соединений
+    'batch': {
+        'pool_size': 2,
+        'max_overflow': 0,
+        'pool_timeout': 60,
+        'pool_recycle': 3600,
+    },
+}
+
+DEFAULT_PROFILE = 'kiosk'
+
+# Переменные окружения, переопределяющие отдельные параметры профиля
+_ENV_OVERRIDES = {
+    'pool_size': ('DB_POOL_SIZE', int),
+    'max_overflow': ('DB_MAX_OVERFLOW', int),
+    'pool_timeout': ('DB_POOL_TIMEOUT', float),
+    'pool_recycle': ('DB_POOL_RECYCLE', int),
+}
+
+
+def get_profile_name(profile: str | None = None) -> str:
+    '''
+    Определяет имя профиля развертывания
+
+    Arguments:
+        profile (str, optional): Явно заданный профиль, иначе берется DB_PROFILE
+
+    Returns:
+        str: Имя профиля
+
+    Raises:
+        ValueError: Если профиль не описан в POOL_PROFILES
+    '''
+    name = profile or os.environ.get('DB_PROFILE', DEFAULT_PROFILE)
+    if name not in POOL_PROFILES:
+        raise ValueError(f"Неизвестный профиль БД: {name}")
+    return name
+
+
+def get_pool_settings(profile: str | None = None) -> dict:
+    '''
+    Возвращает параметры пула соединений для профиля с учетом переменных окружения
+
+    Arguments:
+        profile (str, optional): Имя профиля (kiosk, admin, bot, batch)
+
+    Returns:
+        dict: pool_size, max_overflow, pool_timeout, pool_recycle
+    '''
+    settings = dict(POOL_PROFILES[get_profile_name(profile)])
+
+    for key, (env_name, cast) in _ENV_OVERRIDES.items():
+        value = os.environ.get(env_name)
+        if value:
+            settings[key] = cast(value)
+
+    return settings
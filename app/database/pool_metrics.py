@@ -0,0 +1,161 @@
+import time
+import threading
+from bisect import bisect_left
+from sqlalchemy import event, exc
+from sqlalchemy.pool import Pool
+
+
+# Границы корзин гистограммы ожидания соединения, мс
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolMetrics:
+    '''
+    Сборщик статистики пула соединений, работающий на событиях пула
+
+    Attributes:
+        profile (str): Профиль развертывания, для которого создан пул
+        started_at (float): Время начала сбора статистики (time.time())
+        checkouts (int): Количество выдач соединений из пула
+        timeouts (int): Количество ожиданий, завершившихся таймаутом
+        connections_opened (int): Количество открытых DBAPI-соединений
+        connections_closed (int): Количество закрытых DBAPI-соединений
+        invalidations (int): Количество инвалидированных соединений
+    '''
+    def __init__(self, profile: str):
+        self.profile = profile
+        self._lock = threading.Lock()
+        self._pool = None
+        self.reset()
+
+    def reset(self) -> None:
+        '''Обнуляет накопленную статистику'''
+        with self._lock:
+            self.started_at = time.time()
+            self.checkouts = 0
+            self.timeouts = 0
+            self.connections_opened = 0
+            self.connections_closed = 0
+            self.invalidations = 0
+            self._wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+            self._wait_total_ms = 0.0
+            self._wait_max_ms = 0.0
+
+    def pool_class(self, base: type[Pool]) -> type[Pool]:
+        '''
+        Создает подкласс пула, замеряющий время ожидания соединения
+
+        Подкласс передается в create_engine(poolclass=...). Он сохраняется
+        при engine.dispose(), так как пул пересоздается через self.__class__.
+
+        Arguments:
+            base (type[Pool]): Базовый класс пула (QueuePool, AsyncAdaptedQueuePool)
+
+        Returns:
+            type[Pool]: Инструментированный класс пула
+        '''
+        metrics = self
+
+        def connect(pool):
+            start = time.perf_counter()
+            try:
+                connection = base.connect(pool)
+            except exc.TimeoutError:
+                metrics._record_timeout()
+                raise
+            metrics._record_wait((time.perf_counter() - start) * 1000)
+            return connection
+
+        return type(f'Instrumented{base.__name__}', (base,), {'connect': connect})
+
+    def attach(self, engine) -> None:
+        '''
+        Подписывает сборщик на события пула движка
+
+        Arguments:
+            engine (Engine): Синхронный движок (для AsyncEngine - engine.sync_engine)
+        '''
+        self._pool = engine.pool
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'close', self._on_close)
+        event.listen(engine, 'close_detached', self._on_close)
+        event.listen(engine, 'invalidate', self._on_invalidate)
+        event.listen(engine, 'soft_invalidate', self._on_invalidate)
+        event.listen(engine, 'engine_disposed', self._on_dispose)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connections_opened += 1
+
+    def _on_close(self, dbapi_connection, *args):
+        with self._lock:
+            self.connections_closed += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def _on_dispose(self, engine):
+        self._pool = engine.pool
+
+    def _record_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self._wait_buckets[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+            self._wait_total_ms += wait_ms
+            self._wait_max_ms = max(self._wait_max_ms, wait_ms)
+
+    def _record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        '''
+        Возвращает текущую статистику пула
+
+        Returns:
+            dict: Словарь со статистикой:
+                profile (str): Профиль развертывания
+                pool_size (int): Размер пула
+                checked_out (int): Соединений выдано в данный момент
+                checked_in (int): Свободных соединений в пуле
+                overflow_in_use (int): Соединений сверх pool_size в данный момент
+                checkouts (int): Всего выдач соединений
+                timeouts (int): Ожиданий, завершившихся таймаутом
+                wait_ms (dict): Гистограмма ожидания {'<=N': count, '>N': count}, avg, max
+                connections_opened (int): Открыто DBAPI-соединений
+                connections_closed (int): Закрыто DBAPI-соединений
+                invalidations (int): Инвалидировано соединений
+                uptime_seconds (float): Время сбора статистики
+        '''
+        pool = self._pool
+        with self._lock:
+            histogram = {
+                f'<={bound}': count
+                for bound, count in zip(WAIT_BUCKETS_MS, self._wait_buckets)
+            }
+            histogram[f'>{WAIT_BUCKETS_MS[-1]}'] = self._wait_buckets[-1]
+
+            stats = {
+                'profile': self.profile,
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_ms': {
+                    'histogram': histogram,
+                    'avg': self._wait_total_ms / self.checkouts if self.checkouts else 0.0,
+                    'max': self._wait_max_ms,
+                },
+                'connections_opened': self.connections_opened,
+                'connections_closed': self.connections_closed,
+                'invalidations': self.invalidations,
+                'uptime_seconds': time.time() - self.started_at,
+            }
+
+        # Мгновенные значения берутся у самого пула (есть только у QueuePool)
+        if pool is not None and hasattr(pool, 'checkedout'):
+            stats['pool_size'] = pool.size()
+            stats['checked_out'] = pool.checkedout()
+            stats['checked_in'] = pool.checkedin()
+            stats['overflow_in_use'] = max(pool.overflow(), 0)
+
+        return stats
@@ -7,9 +7,12 @@ from .delivery_repository import DeliveryRepository
 from .publication_repository import PublicationRepository
 from .publisher_repository import PublisherRepository
 from .issue_repository import IssueRepository
+from .async_base_repository import AsyncBaseRepository
+from .async_user_repository import AsyncUserRepository
 
 
 __all__ = [
+    'BaseRepository',
     'UserRepository',
     'AdminRepository',
     'ComplaintRepository',
@@ -17,5 +20,7 @@ __all__ = [
     'DeliveryRepository',
     'PublicationRepository',
     'PublisherRepository',
-    'IssueRepository'
+    'IssueRepository',
+    'AsyncBaseRepository',
+    'AsyncUserRepository'
 ]
\ No newline at end of file
@@ -47,10 +47,7 @@ class AdminRepository(BaseRepository):
             new_admin.set_password(data['password'])
             
             # Добавление администратора в БД
-            self.add(new_admin)
-            
-            # Коммит изменений
-            if not self.commit():
+            if not self.add(new_admin):
                 return None
             
             return new_admin
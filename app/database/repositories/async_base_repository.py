@@ -0,0 +1,178 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any
+
+class AsyncBaseRepository:
+    '''
+    Асинхронный базовый репозиторий, описывающий CRUD-операции моделей.
+
+    Повторяет интерфейс BaseRepository, но все обращения к БД выполняются
+    через AsyncSession и не блокируют цикл событий.
+    '''
+    def __init__(self, model_class, session: AsyncSession):
+        '''
+        Инициализация репозитория
+
+        Arguments:
+            model_class: Класс модели SQLAlchemy
+            session (AsyncSession): Асинхронная сессия SQLAlchemy для взаимодействия с БД
+        '''
+        self.model_class = model_class
+        self.session = session
+
+    async def commit(self) -> bool:
+        '''
+        Коммитит изменения в базу данных
+
+        Returns:
+            bool: True, если операция успешна, иначе False
+        '''
+        try:
+            await self.session.commit()
+            return True
+        except Exception as e:
+            await self.session.rollback()
+            print(f"Ошибка при коммите: {e}")
+            return False
+
+    async def get_all(self) -> list:
+        '''
+        Получение всех записей из таблицы
+
+        Returns:
+            list: Список всех записей
+        '''
+        result = await self.session.scalars(select(self.model_class))
+        return list(result)
+
+    async def get_by_id(self, id: int):
+        '''
+        Получение записи по ID с ошибкой, если не найдена
+
+        Arguments:
+            id (int): Идентификатор записи
+
+        Returns:
+            Model: Объект модели, если найден
+
+        Raises:
+            NoResultFound: Если запись с указанным ID не найдена
+        '''
+        return await self.session.get_one(self.model_class, id)
+
+    async def find_by_id(self, id: int):
+        '''
+        Поиск записи по ID
+
+        Arguments:
+            id (int): id нужной записи
+
+        Returns:
+            Model или None: Результат поиска записи
+                - Model: если запись найдена в базе данных
+                - None: если запись с указанным ID отсутствует
+        '''
+        return await self.session.get(self.model_class, id)
+
+    async def get_actives(self) -> list:
+        '''
+        Получение только активных записей
+
+        Returns:
+            list: Список активных записей
+        '''
+        result = await self.session.scalars(
+            select(self.model_class).where(self.model_class.is_active == True)
+        )
+        return list(result)
+
+    async def add(self, entity) -> bool:
+        '''
+        Добавление новой записи и коммит изменений
+
+        Arguments:
+            entity (Model): Экземпляр модели для добавления
+
+        Returns:
+            bool: Результат операции добавления и коммита
+        '''
+        try:
+            self.session.add(entity)
+            return await self.commit()
+        except Exception as e:
+            await self.session.rollback()
+            print(f"Ошибка при добавлении: {e}")
+            return False
+
+    async def update(self, id: int, **kwargs: Any) -> bool:
+        '''
+        Обновление существующей записи по ID и коммит изменений
+
+        Arguments:
+            id (int): ID записи для обновления
+            **kwargs (dict[str: any]): Атрибуты и их значения для обновления
+
+        Returns:
+            bool: Результат операции обновления и коммита
+        '''
+        try:
+            entity = await self.find_by_id(id)
+            if not entity:
+                return False
+
+            for key, value in kwargs.items():
+                if hasattr(entity, key):
+                    setattr(entity, key, value)
+
+            return await self.commit()
+        except Exception as e:
+            await self.session.rollback()
+            print(f"Ошибка при обновлении: {e}")
+            return False
+
+    async def soft_delete(self, id: int) -> bool:
+        '''
+        Мягкое удаление (установка флага is_active в False) и коммит изменений
+
+        Arguments:
+            id (int): ID записи для мягкого удаления
+
+        Returns:
+            bool: Результат операции мягкого удаления и коммита
+        '''
+        try:
+            entity = await self.find_by_id(id)
+            if not entity:
+                return False
+
+            if hasattr(entity, 'is_active'):
+                entity.is_active = False
+                return await self.commit()
+
+            return False
+        except Exception as e:
+            await self.session.rollback()
+            print(f"Ошибка при мягком удалении: {e}")
+            return False
+
+    async def permanent_delete(self, id: int) -> bool:
+        '''
+        Физическое удаление из базы данных и коммит изменений
+
+        Arguments:
+            id (int): ID записи для удаления
+
+        Returns:
+            bool: Результат операции удаления и коммита
+        '''
+        try:
+            entity = await self.find_by_id(id)
+            if not entity:
+                return False
+
+            await self.session.delete(entity)
+            return await self.commit()
+        except Exception as e:
+            await self.session.rollback()
+            print(f"Ошибка при удалении: {e}")
+            return False
@@ -0,0 +1,65 @@
+from sqlalchemy import select, update
+from . import AsyncBaseRepository
+from app.database.models import User
+
+
+class AsyncUserRepository(AsyncBaseRepository):
+    def __init__(self, session):
+        super().__init__(User, session)
+
+    async def find_by_phone(self, phone_number: str) -> User | None:
+        '''
+        Поиск пользователя по номеру телефона
+
+        Arguments:
+            phone_number (str): Номер телефона
+
+        Returns:
+            User или None: Найденный пользователь
+        '''
+        result = await self.session.execute(
+            select(self.model_class).where(self.model_class.phone_number == phone_number)
+        )
+        return result.scalars().first()
+
+    async def find_by_tg_chat_id(self, tg_chat_id: int) -> User | None:
+        '''
+        Поиск пользователя по Telegram chat id
+
+        Arguments:
+            tg_chat_id (int): Telegram chat id
+
+        Returns:
+            User или None: Найденный пользователь
+        '''
+        result = await self.session.execute(
+            select(self.model_class).where(self.model_class.tg_chat_id == tg_chat_id)
+        )
+        return result.scalars().first()
+
+    async def bind_tg_chat_id(self, user_id: int, tg_chat_id: int) -> bool:
+        '''
+        Привязывает Telegram chat id к пользователю одним UPDATE без предварительной загрузки
+
+        Arguments:
+            user_id (int): ID пользователя
+            tg_chat_id (int): Telegram chat id
+
+        Returns:
+            bool: True, если пользователь найден и изменения зафиксированы, иначе False
+        '''
+        try:
+            updated = await self.session.scalar(
+                update(self.model_class)
+                .where(self.model_class.id == user_id)
+                .values(tg_chat_id=tg_chat_id)
+                .returning(self.model_class.id)
+            )
+            if updated is None:
+                return False
+
+            return await self.commit()
+        except Exception as e:
+            await self.session.rollback()
+            print(f"Ошибка при привязке Telegram chat id: {e}")
+            return False
@@ -1,8 +1,64 @@
+from sqlalchemy import insert, update, func, select, inspect, text
 from sqlalchemy.orm import Session
-from typing import Any
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Any, Iterator
+from app.database.repositories.pagination import (
+    Page, encode_cursor, decode_cursor, keyset_condition, keyset_ordering
+)
+from app.database.unit_of_work import in_unit_of_work
+from app.database.search import search_clauses
+from app.database.repositories.filters import projection_filters
+
+# Таблицы, которые по оценке планировщика больше этого порога, не считаются
+# точным COUNT(*) в страницах без фильтров (см. get_rows_page)
+ESTIMATE_THRESHOLD = 100_000
+
+def upsert_statement(target, dialect_name: str, conflict_cols: list[str] | None = None,
+                     update_cols: list[str] | None = None):
+    '''
+    Строит INSERT ... ON CONFLICT для PostgreSQL или SQLite
+    
+    Arguments:
+        target: Класс модели или таблица (Table)
+        dialect_name (str): Имя диалекта БД ('postgresql' или 'sqlite')
+        conflict_cols (list[str], optional): Столбцы уникального ограничения, по которому
+            определяется конфликт; для DO NOTHING можно не указывать (любой конфликт)
+        update_cols (list[str], optional): Столбцы, обновляемые значениями из вставляемой
+            строки при конфликте; если не заданы - ON CONFLICT DO NOTHING
+    
+    Returns:
+        Insert: Оператор вставки, значения передаются при выполнении
+    
+    Raises:
+        ValueError: Если диалект не поддерживает ON CONFLICT или для
+            DO UPDATE не указаны conflict_cols
+    '''
+    if dialect_name == 'postgresql':
+        statement = postgresql.insert(target)
+    elif dialect_name == 'sqlite':
+        statement = sqlite.insert(target)
+    else:
+        raise ValueError(f"Upsert не поддерживается для диалекта {dialect_name}")
+    
+    if not update_cols:
+        return statement.on_conflict_do_nothing(index_elements=conflict_cols)
+    if not conflict_cols:
+        raise ValueError("Для обновления при конфликте нужно указать conflict_cols")
+    
+    return statement.on_conflict_do_update(
+        index_elements=conflict_cols,
+        set_={column: statement.excluded[column] for column in update_cols}
+    )
+
 
 class BaseRepository:
     '''Базовый репозиторий, описывающий CRUD-операции моделей.'''
+    # Стратегия загрузки связей для списков записей (get_all, get_page, iter_all и др.):
+    # репозиторий модели перечисляет здесь связи, которые читаются для каждой строки
+    # (joinedload для многие-к-одному, selectinload для коллекций), чтобы список
+    # загружался не более чем двумя запросами вместо N+1 ленивых загрузок
+    loader_options: tuple = ()
+    
     def __init__(self, model_class, session: Session):
         '''
         Инициализация репозитория
@@ -18,11 +74,17 @@ class BaseRepository:
         '''
         Коммитит изменения в базу данных
         
+        Внутри единицы работы (uow) изменения только отправляются в БД,
+        коммит выполняется один раз при выходе из блока uow.
+        
         Returns:
             bool: True, если операция успешна, иначе False
         '''
         try:
-            self.session.commit()
+            if in_unit_of_work(self.session):
+                self.session.flush()
+            else:
+                self.session.commit()
             return True
         except Exception as e:
             self.session.rollback()
@@ -36,12 +98,14 @@ class BaseRepository:
         Returns:
             Query: SQLAlchemy Query объект со всеми записями
         '''
-        return self.session.query(self.model_class)
+        return self.session.query(self.model_class).options(*self.loader_options)
     
     def get_by_id(self, id: int):
         '''
         Получение записи по ID с ошибкой, если не найдена
         
+        Если объект уже загружен в сессию, он берется из карты идентичности без запроса к БД.
+        
         Arguments:
             id (int): Идентификатор записи
         
@@ -51,12 +115,14 @@ class BaseRepository:
         Raises:
             NoResultFound: Если запись с указанным ID не найдена
         '''
-        return self.session.query(self.model_class).filter(self.model_class.id == id).one()
+        return self.session.get_one(self.model_class, id)
     
     def find_by_id(self, id: int):
         '''
         Поиск записи по ID
         
+        Если объект уже загружен в сессию, он берется из карты идентичности без запроса к БД.
+        
         Arguments:
             id (int): id нужной записи
         
@@ -65,7 +131,42 @@ class BaseRepository:
                 - Model: если запись найдена в базе данных
                 - None: если запись с указанным ID отсутствует
         '''
-        return self.session.query(self.model_class).filter(self.model_class.id == id).first()
+        return self.session.get(self.model_class, id)
+    
+    def get_many(self, ids: list[int]) -> tuple[list, list[int]]:
+        '''
+        Получение нескольких записей по списку ID
+        
+        Объекты, уже загруженные в сессию, берутся из карты идентичности,
+        остальные загружаются одним запросом WHERE id IN (...).
+        
+        Arguments:
+            ids (list[int]): Идентификаторы записей
+        
+        Returns:
+            tuple: (found, missing)
+                found (list): Найденные записи в порядке входных ID (повторы сохраняются)
+                missing (list[int]): ID, для которых записи не найдены, в порядке входных ID
+        '''
+        found = {}
+        to_load = []
+        for id in dict.fromkeys(ids):
+            entity = self.session.identity_map.get(self.session.identity_key(self.model_class, id))
+            if entity is not None and not inspect(entity).expired_attributes and entity not in self.session.deleted:
+                found[id] = entity
+            else:
+                to_load.append(id)
+        
+        if to_load:
+            for entity in self.session.scalars(
+                select(self.model_class).where(self.model_class.id.in_(to_load))
+            ):
+                found[entity.id] = entity
+        
+        return (
+            [found[id] for id in ids if id in found],
+            [id for id in ids if id not in found]
+        )
     
     def get_actives(self):
         '''
@@ -74,8 +175,257 @@ class BaseRepository:
         Returns:
             Query: SQLAlchemy Query объект с активными записями
         '''
-        return self.session.query(self.model_class).filter(self.model_class.is_active == True)
+        return self.session.query(self.model_class).options(*self.loader_options).filter(
+            self.model_class.is_active == True
+        )
+    
+    def get_page(self, after: str | None = None, limit: int = 50, order_by: str = 'id',
+                 descending: bool = False, with_total: bool = False, **filters: Any) -> Page:
+        '''
+        Получение страницы записей keyset-пагинацией
+        
+        Вместо OFFSET следующая страница выбирается условием
+        (order_by, id) > (значения последней записи), которое обслуживается
+        индексом по столбцу сортировки, поэтому время выборки страницы
+        не растет с размером таблицы и номером страницы.
+        
+        Arguments:
+            after (str, optional): Курсор из Page.next_cursor предыдущей страницы,
+                None для первой страницы
+            limit (int): Количество записей на странице
+            order_by (str): Атрибут модели для сортировки, id добавляется
+                вторым ключом для однозначного порядка
+            descending (bool): Сортировка по убыванию
+            with_total (bool): Посчитать общее количество записей с учетом фильтров
+            **filters (dict[str: any]): Условия равенства атрибутов (как в filter_by)
+        
+        Returns:
+            Page: Записи страницы, курсор следующей страницы и total (если запрошен)
+        
+        Raises:
+            AttributeError: Если у модели нет атрибута order_by
+            ValueError: Если курсор поврежден
+        '''
+        id_column = self.model_class.id
+        single_key = order_by == 'id'
+        sort_column = None if single_key else getattr(self.model_class, order_by)
+        nullable = getattr(getattr(sort_column, 'expression', None), 'nullable', True)
+        
+        query = self.session.query(self.model_class).filter_by(**filters)
+        total = None
+        if with_total:
+            total = self.session.scalar(
+                select(func.count()).select_from(query.order_by(None).subquery())
+            )
+        
+        query = query.options(*self.loader_options)
+        if after is not None:
+            last_value, last_id = decode_cursor(after)
+            query = query.filter(keyset_condition(
+                sort_column, id_column, last_value, last_id, descending, nullable
+            ))
+        
+        rows = query.order_by(
+            *keyset_ordering(sort_column, id_column, descending, nullable)
+        ).limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor([
+                None if single_key else getattr(last, order_by), last.id
+            ])
+        
+        return Page(rows, next_cursor, total)
+    
+    def _search_page(self, query: str, after: str | None = None, limit: int = 20,
+                     **filters: Any) -> Page:
+        '''
+        Поиск по name и description с ранжированием (см. app/database/search.py)
+        
+        Страницы выбираются по рангу, курсор хранит смещение: поисковую выдачу
+        обычно смотрят на первых страницах, а ранг не годится для keyset-пагинации.
+        
+        Arguments:
+            query (str): Строка поиска
+            after (str, optional): Курсор из Page.next_cursor предыдущей страницы
+            limit (int): Количество записей на странице
+            **filters (dict[str: any]): Условия равенства атрибутов (как в filter_by)
+        
+        Returns:
+            Page: Найденные записи по убыванию ранга и курсор следующей страницы
+        '''
+        if not query or not query.strip():
+            return Page([])
+        
+        offset = decode_cursor(after)[0] if after else 0
+        condition, rank = search_clauses(
+            self.model_class, query.strip(), self.session.get_bind().dialect.name
+        )
+        statement = (
+            select(self.model_class).options(*self.loader_options)
+            .where(condition).filter_by(**filters)
+            .order_by(rank.desc(), self.model_class.id)
+            .offset(offset).limit(limit + 1)
+        )
+        
+        rows = self.session.scalars(statement).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([offset + limit])
+        
+        return Page(rows, next_cursor)
     
+    def iter_all(self, batch_size: int = 1000, columns: list[str] | None = None,
+                 **filters: Any) -> Iterator:
+        '''
+        Потоковый обход записей таблицы через серверный курсор
+        
+        Записи читаются из курсора пачками по batch_size (yield_per), поэтому
+        в памяти одновременно находится не больше одной пачки. Экземпляры
+        модели после обработки пачки отсоединяются от сессии (expunge), чтобы
+        карта идентичности не росла при обходе миллионов строк. Изменения
+        отсоединенных объектов не сохраняются - для записи используйте bulk_update.
+        
+        Arguments:
+            batch_size (int): Количество строк, получаемых из курсора за раз
+            columns (list[str], optional): Атрибуты модели для выборки; если заданы,
+                возвращаются кортежи значений вместо экземпляров модели
+            **filters (dict[str: any]): Условия равенства атрибутов (как в filter_by)
+        
+        Returns:
+            Iterator: Экземпляры модели или кортежи значений columns в порядке id
+        '''
+        if columns:
+            statement = select(*(getattr(self.model_class, column) for column in columns))
+        else:
+            statement = select(self.model_class).options(*self.loader_options)
+        statement = statement.filter_by(**filters).order_by(self.model_class.id)
+        
+        result = self.session.execute(statement, execution_options={'yield_per': batch_size})
+        try:
+            if columns:
+                for partition in result.partitions():
+                    for row in partition:
+                        yield tuple(row)
+            else:
+                for partition in result.scalars().partitions():
+                    yield from partition
+                    for entity in partition:
+                        if entity in self.session:
+                            self.session.expunge(entity)
+        finally:
+            result.close()
+
+    def estimate_count(self) -> int | None:
+        '''
+        Оценивает количество записей таблицы по статистике PostgreSQL без COUNT(*)
+
+        Для секционированной таблицы суммируются оценки всех секций.
+
+        Returns:
+            int | None: Оценка или None, если БД не PostgreSQL или статистики еще нет
+        '''
+        if self.session.get_bind().dialect.name != 'postgresql':
+            return None
+
+        estimate = self.session.scalar(
+            text(
+                "SELECT sum(c.reltuples)::bigint FROM pg_partition_tree(CAST(:table AS regclass)) p "
+                "JOIN pg_class c ON c.oid = p.relid WHERE p.isleaf AND c.reltuples >= 0"
+            ),
+            {'table': self.model_class.__tablename__}
+        )
+        return int(estimate) if estimate is not None else None
+
+    def get_rows_page(self, statement, after: str | None = None, limit: int = 100,
+                      sort_index: int = 0, descending: bool = False,
+                      filters: dict[int, str] | None = None, with_total: bool = False) -> Page:
+        '''
+        Страница проекции с сортировкой, фильтрами и keyset-пагинацией
+
+        Экземпляры модели не создаются, из БД читаются только столбцы проекции.
+        Сортировка, фильтры и выбор страницы выполняются в БД: следующая страница
+        выбирается условием (столбец сортировки, id) > (значения последней строки).
+        Без фильтров для больших таблиц PostgreSQL total берется из статистики
+        (Page.estimated = True), иначе считается COUNT(*).
+
+        Arguments:
+            statement (Select): Готовая проекция (см. app/database/table_specs.py),
+                первый столбец - id модели репозитория
+            after (str, optional): Курсор из Page.next_cursor предыдущей страницы
+            limit (int): Количество строк на странице
+            sort_index (int): Индекс столбца сортировки в проекции (0 - по id); для
+                сортировки по индексу нужен индекс (столбец, id), см. TableSpec.sortable
+            descending (bool): Сортировка по убыванию
+            filters (dict[int, str], optional): {индекс столбца: текст фильтра},
+                см. filters.column_filter
+            with_total (bool): Посчитать (или оценить) общее количество строк
+
+        Returns:
+            Page: Строки (Row) страницы, курсор следующей страницы и total
+
+        Raises:
+            ValueError: Если курсор поврежден
+        '''
+        id_column = self.model_class.id
+        columns = statement.selected_columns
+        sort_column = columns[sort_index] if sort_index else None
+        nullable = getattr(getattr(sort_column, 'expression', None), 'nullable', True)
+
+        conditions = projection_filters(columns, filters)
+        statement = statement.where(*conditions)
+
+        total, estimated = None, False
+        if with_total:
+            if not conditions:
+                total = self.estimate_count()
+                estimated = total is not None and total >= ESTIMATE_THRESHOLD
+            if not estimated:
+                total = self.session.scalar(select(func.count()).select_from(statement.subquery()))
+
+        if after is not None:
+            last_value, last_id = decode_cursor(after)
+            statement = statement.where(keyset_condition(
+                sort_column, id_column, last_value, last_id, descending, nullable
+            ))
+
+        rows = self.session.execute(
+            statement.order_by(
+                *keyset_ordering(sort_column, id_column, descending, nullable)
+            ).limit(limit + 1)
+        ).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1][sort_index] if sort_index else None, rows[-1][0]])
+
+        return Page(rows, next_cursor, total, estimated)
+
+    def get_rows_statement(self, statement, sort_index: int = 0, descending: bool = False,
+                           filters: dict[int, str] | None = None):
+        '''
+        Проекция с фильтрами и сортировкой get_rows_page, но без разбиения на страницы
+
+        Используется для потоковой выгрузки всей отфильтрованной таблицы.
+
+        Arguments:
+            statement (Select): Готовая проекция, первый столбец - id модели репозитория
+            sort_index (int): Индекс столбца сортировки в проекции (0 - по id)
+            descending (bool): Сортировка по убыванию
+            filters (dict[int, str], optional): {индекс столбца: текст фильтра}
+
+        Returns:
+            Select: Запрос всех строк выборки в порядке отображения
+        '''
+        columns = statement.selected_columns
+        sort_column = columns[sort_index] if sort_index else None
+        nullable = getattr(getattr(sort_column, 'expression', None), 'nullable', True)
+        return statement.where(*projection_filters(columns, filters)).order_by(
+            *keyset_ordering(sort_column, self.model_class.id, descending, nullable)
+        )
+
     def add(self, entity) -> bool:
         '''
         Добавление новой записи и коммит изменений
@@ -174,3 +524,143 @@ class BaseRepository:
             self.session.rollback()
             print(f"Ошибка при удалении: {e}")
             return False
+    
+    def bulk_add(self, entities: list) -> list[int]:
+        '''
+        Пакетное добавление записей в одной транзакции
+        
+        Словари вставляются одним INSERT ... RETURNING с пакетной передачей
+        параметров драйверу, экземпляры модели - одним flush.
+        
+        Arguments:
+            entities (list): Экземпляры модели и/или словари {столбец: значение}
+        
+        Returns:
+            list[int]: ID созданных записей в порядке входных данных
+                - пустой список, если данных нет или произошла ошибка
+        '''
+        if not entities:
+            return []
+        
+        try:
+            rows = [entity for entity in entities if isinstance(entity, dict)]
+            instances = [entity for entity in entities if not isinstance(entity, dict)]
+            
+            if instances:
+                self.session.add_all(instances)
+                self.session.flush()
+            
+            inserted_ids = []
+            if rows:
+                inserted_ids = self.session.scalars(
+                    insert(self.model_class).returning(
+                        self.model_class.id, sort_by_parameter_order=True
+                    ),
+                    rows
+                ).all()
+            
+            inserted_ids = iter(inserted_ids)
+            ids = [
+                next(inserted_ids) if isinstance(entity, dict) else entity.id
+                for entity in entities
+            ]
+            
+            if not self.commit():
+                return []
+            return ids
+        except Exception as e:
+            self.session.rollback()
+            print(f"Ошибка при пакетном добавлении: {e}")
+            return []
+    
+    def upsert(self, rows: list[dict], conflict_cols: list[str] | None = None,
+               update_cols: list[str] | None = None) -> list[int]:
+        '''
+        Вставка записей с обработкой конфликтов одним INSERT ... ON CONFLICT
+        
+        Проверка существования и запись выполняются одним оператором, поэтому
+        повторный импорт не создает дубликатов и не зависит от гонок между клиентами.
+        
+        Arguments:
+            rows (list[dict]): Словари {столбец: значение}
+            conflict_cols (list[str], optional): Столбцы уникального ограничения
+                (для DO NOTHING можно не указывать - тогда учитывается любой конфликт)
+            update_cols (list[str], optional): Столбцы, обновляемые при конфликте;
+                если не заданы, конфликтующие строки пропускаются (DO NOTHING)
+        
+        Returns:
+            list[int]: ID вставленных и обновленных записей (пропущенные не возвращаются)
+                - пустой список, если данных нет или произошла ошибка
+        '''
+        if not rows:
+            return []
+        
+        try:
+            statement = upsert_statement(
+                self.model_class, self.session.get_bind().dialect.name,
+                conflict_cols, update_cols
+            )
+            ids = self.session.scalars(statement.returning(self.model_class.id), rows).all()
+            
+            if not self.commit():
+                return []
+            return list(ids)
+        except Exception as e:
+            self.session.rollback()
+            print(f"Ошибка при вставке с обработкой конфликтов: {e}")
+            return []
+    
+    def bulk_update(self, rows: list[dict]) -> bool:
+        '''
+        Пакетное обновление записей по ID в одной транзакции
+        
+        Arguments:
+            rows (list[dict]): Словари с ключом 'id' и обновляемыми атрибутами,
+                например [{'id': 1, 'rating': 4.5}, {'id': 2, 'rating': 3.9}]
+        
+        Returns:
+            bool: Результат операции обновления и коммита
+        '''
+        if not rows:
+            return True
+        
+        try:
+            self.session.execute(update(self.model_class), rows)
+            return self.commit()
+        except Exception as e:
+            self.session.rollback()
+            print(f"Ошибка при пакетном обновлении: {e}")
+            return False
+    
+    def bulk_soft_delete(self, ids: list[int], batch_size: int = 1000) -> list[int]:
+        '''
+        Пакетное мягкое удаление (is_active = False) в одной транзакции
+        
+        Arguments:
+            ids (list[int]): ID записей для мягкого удаления
+            batch_size (int): Количество ID в одном UPDATE ... WHERE id IN (...)
+        
+        Returns:
+            list[int]: ID записей, помеченных неактивными
+                - пустой список, если модель не имеет is_active или произошла ошибка
+        '''
+        if not ids or not hasattr(self.model_class, 'is_active'):
+            return []
+        
+        try:
+            deactivated = []
+            for start in range(0, len(ids), batch_size):
+                deactivated.extend(self.session.scalars(
+                    update(self.model_class)
+                    .where(self.model_class.id.in_(ids[start:start + batch_size]))
+                    .values(is_active=False)
+                    .returning(self.model_class.id)
+                ).all())
+            
+            if not self.commit():
+                return []
+            return deactivated
+        except Exception as e:
+            self.session.rollback()
+            print(f"Ошибка при пакетном мягком удалении: {e}")
+            return []
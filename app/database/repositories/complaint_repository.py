@@ -1,7 +1,10 @@
+from sqlalchemy.orm import joinedload
 from . import BaseRepository
 from app.database.models import Complaint
 
 class ComplaintRepository(BaseRepository):
+    loader_options = (joinedload(Complaint.courier),)
+    
     def __init__(self, session):
         super().__init__(Complaint, session)
     
@@ -23,9 +26,7 @@ class ComplaintRepository(BaseRepository):
                 description=data['description']
             )
             
-            self.add(new_complaint)
-            
-            if not self.commit():
+            if not self.add(new_complaint):
                 return None
             
             return new_complaint
@@ -44,4 +45,4 @@ class ComplaintRepository(BaseRepository):
         Returns:
             List[Complaint]: Список претензий
         '''
-        return self.session.query(self.model_class).filter_by(courier_id=courier_id).all()
+        return self.get_all().filter_by(courier_id=courier_id).all()
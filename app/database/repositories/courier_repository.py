@@ -29,9 +29,7 @@ class CourierRepository(BaseRepository):
                 phone_number=data['phone_number']
             )
             
-            self.add(new_courier)
-            
-            if not self.commit():
+            if not self.add(new_courier):
                 return None
             
             return new_courier
@@ -1,8 +1,12 @@
+from sqlalchemy import update
+from sqlalchemy.orm import joinedload
 from . import BaseRepository
 from app.database.models import Delivery
 from datetime import datetime
 
 class DeliveryRepository(BaseRepository):
+    loader_options = (joinedload(Delivery.courier),)
+    
     def __init__(self, session):
         super().__init__(Delivery, session)
     
@@ -34,9 +38,7 @@ class DeliveryRepository(BaseRepository):
                 recipient_tg_chat_id=data.get('recipient_tg_chat_id')
             )
             
-            self.add(new_delivery)
-            
-            if not self.commit():
+            if not self.add(new_delivery):
                 return None
             
             return new_delivery
@@ -49,30 +51,46 @@ class DeliveryRepository(BaseRepository):
         '''
         Отмечает поставку как доставленную
         
+        Условие по is_delivered ограничивает поиск горячей секцией недоставленных
+        поставок (см. app/database/partitions.py); строка переносится в секцию
+        доставленных самой БД.
+        
         Arguments:
             delivery_id (int): ID поставки
         
         Returns:
-            bool: True при успешной операции, False при ошибке
+            bool: True при успешной операции, False если поставка не найдена,
+                уже доставлена или произошла ошибка
         '''
         try:
-            delivery = self.find_by_id(delivery_id)
-            if not delivery:
+            marked = self.session.execute(
+                update(self.model_class)
+                .where(self.model_class.id == delivery_id, self.model_class.is_delivered.is_(False))
+                .values(is_delivered=True, delivery_date=datetime.now())
+            ).rowcount
+            if not marked:
                 return False
             
-            delivery.mark_as_delivered()
-            
             return self.commit()
             
         except Exception as err:
+            self.session.rollback()
             print(f"Ошибка отметки о доставке: {err}")
             return False
     
-    def get_pending_deliveries(self):
+    def get_pending_deliveries(self, courier_id: int | None = None):
         '''
         Получает список незавершенных поставок
         
+        Запрос читает только горячую секцию недоставленных поставок.
+        
+        Arguments:
+            courier_id (int, optional): Только поставки указанного доставщика
+        
         Returns:
             List[Delivery]: Список незавершенных поставок
         '''
-        return self.session.query(self.model_class).filter_by(is_delivered=False).all()
+        query = self.get_all().filter_by(is_delivered=False)
+        if courier_id is not None:
+            query = query.filter_by(courier_id=courier_id)
+        return query.all()
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+from sqlalchemy import false
+from app.database.column_indexes import prefix_match
+
+
+TRUE_VALUES = {'да', 'true', '1', '+', 'yes'}
+FALSE_VALUES = {'нет', 'false', '0', '-', 'no'}
+DATE_FORMATS = ('%Y-%m-%d', '%d.%m.%Y')
+
+
+def _python_type(expression):
+    try:
+        return expression.type.python_type
+    except NotImplementedError:
+        return str
+
+
+def column_filter(expression, value: str):
+    '''
+    Преобразует текст фильтра столбца в условие SQL по типу столбца
+
+    Числа и флаги сравниваются на равенство, даты - диапазоном суток (оба
+    условия обслуживаются B-tree индексом столбца), текст - по началу строки
+    без учета регистра (prefix_match, индекс declare_prefix_indexes). Какие
+    столбцы можно фильтровать, задает TableSpec.filterable.
+
+    Arguments:
+        expression: Столбец или выражение проекции
+        value (str): Текст, введенный в фильтр
+
+    Returns:
+        ColumnElement: Условие WHERE; для значения, не подходящего к типу
+            столбца, - условие, не выбирающее ни одной записи
+    '''
+    value = value.strip()
+    python_type = _python_type(expression)
+
+    if python_type is bool:
+        lowered = value.lower()
+        if lowered in TRUE_VALUES:
+            return expression.is_(True)
+        if lowered in FALSE_VALUES:
+            return expression.is_(False)
+        return false()
+
+    if python_type in (int, float):
+        try:
+            return expression == python_type(value.replace(',', '.'))
+        except ValueError:
+            return false()
+
+    if python_type is datetime:
+        for date_format in DATE_FORMATS:
+            try:
+                day = datetime.strptime(value, date_format)
+            except ValueError:
+                continue
+            return (expression >= day) & (expression < day + timedelta(days=1))
+        return false()
+
+    return prefix_match(expression, value)
+
+
+def projection_filters(columns, filters: dict[int, str] | None) -> list:
+    '''
+    Строит условия WHERE для фильтров столбцов проекции
+
+    Arguments:
+        columns: Столбцы проекции (Select.selected_columns)
+        filters (dict[int, str], optional): {индекс столбца: текст фильтра}
+
+    Returns:
+        list: Условия для непустых фильтров (см. column_filter)
+    '''
+    return [
+        column_filter(columns[index], value)
+        for index, value in (filters or {}).items() if value and value.strip()
+    ]
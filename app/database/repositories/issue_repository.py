@@ -1,4 +1,7 @@
+from sqlalchemy import select, func
+from sqlalchemy.orm import aliased
 from . import BaseRepository
+from .pagination import Page
 from app.database.models import Issue
 from datetime import datetime
 
@@ -37,9 +40,7 @@ class IssueRepository(BaseRepository):
                 is_special_edition=data.get('is_special_edition', False)
             )
             
-            self.add(new_show_item)
-            
-            if not self.commit():
+            if not self.add(new_show_item):
                 return None
             
             return new_show_item
@@ -62,6 +63,82 @@ class IssueRepository(BaseRepository):
             publication_series_id=publication_series_id
         ).order_by(self.model_class.issue_number).all()
     
+    def get_by_price(self, min_price: float | None = None, max_price: float | None = None,
+                     descending: bool = False, **filters) -> list[Issue]:
+        '''
+        Получает выпуски в диапазоне итоговой цены (с учетом скидки), отсортированные по ней
+        
+        Arguments:
+            min_price (float, optional): Нижняя граница цены включительно
+            max_price (float, optional): Верхняя граница цены включительно
+            descending (bool): Сортировка по убыванию цены
+            **filters (dict[str: any]): Условия равенства атрибутов (например on_sale=True)
+        
+        Returns:
+            List[Issue]: Список выпусков
+        '''
+        price = self.model_class.effective_price
+        query = select(self.model_class).filter_by(**filters)
+        if min_price is not None:
+            query = query.where(price >= min_price)
+        if max_price is not None:
+            query = query.where(price <= max_price)
+        
+        order = price.desc() if descending else price.asc()
+        return self.session.scalars(query.order_by(order, self.model_class.id)).all()
+    
+    def sum_effective_price(self, **filters) -> float:
+        '''
+        Считает сумму итоговых цен выпусков (с учетом скидок) на стороне БД
+        
+        Arguments:
+            **filters (dict[str: any]): Условия равенства атрибутов (например publication_id=1)
+        
+        Returns:
+            float: Сумма цен
+        '''
+        return float(self.session.scalar(
+            select(func.coalesce(func.sum(self.model_class.effective_price), 0.0))
+            .select_from(self.model_class)
+            .filter_by(**filters)
+        ))
+    
+    def get_latest_for_publications(self, publication_ids: list[int] | None = None) -> dict[int, Issue]:
+        '''
+        Получает последний выпуск каждого издания одним запросом
+        
+        На PostgreSQL используется DISTINCT ON, на остальных БД - row_number(),
+        оба варианта обслуживаются индексом (publication_id, issue_date DESC).
+        
+        Arguments:
+            publication_ids (list[int], optional): ID изданий; если не заданы - все издания
+        
+        Returns:
+            dict[int, Issue]: {ID издания: последний выпуск}; издания без выпусков отсутствуют
+        '''
+        if publication_ids is not None and not publication_ids:
+            return {}
+        
+        issue = self.model_class
+        recency = (issue.issue_date.desc(), issue.id.desc())
+        
+        if self.session.get_bind().dialect.name == 'postgresql':
+            query = select(issue).distinct(issue.publication_id).order_by(issue.publication_id, *recency)
+            if publication_ids is not None:
+                query = query.where(issue.publication_id.in_(publication_ids))
+        else:
+            ranked = select(
+                issue,
+                func.row_number().over(partition_by=issue.publication_id, order_by=recency).label('recency')
+            )
+            if publication_ids is not None:
+                ranked = ranked.where(issue.publication_id.in_(publication_ids))
+            ranked = ranked.subquery()
+            latest = aliased(issue, ranked)
+            query = select(latest).where(ranked.c.recency == 1)
+        
+        return {latest_issue.publication_id: latest_issue for latest_issue in self.session.scalars(query)}
+    
     def get_latest_issues(self):
         '''
         Получает последние выпуски изданий
@@ -69,15 +146,22 @@ class IssueRepository(BaseRepository):
         Returns:
             List[ShowItem]: Список последних выпусков
         '''
-        subquery = self.session.query(
-            self.model_class.publication_series_id,
-            self.model_class.issue_date.label('max_date')
-        ).group_by(
-            self.model_class.publication_series_id
-        ).subquery()
-        
-        return self.session.query(self.model_class).join(
-            subquery,
-            (self.model_class.publication_series_id == subquery.c.publication_series_id) &
-            (self.model_class.issue_date == subquery.c.max_date)
-        ).all()
+        return list(self.get_latest_for_publications().values())
+
+    def search(self, query: str, after: str | None = None, limit: int = 20, **filters) -> Page:
+        '''
+        Ищет выпуски по названию и описанию
+        
+        В PostgreSQL - ранжированный полнотекстовый поиск с учетом опечаток
+        в названии (GIN-индексы tsvector и pg_trgm).
+        
+        Arguments:
+            query (str): Строка поиска
+            after (str, optional): Курсор следующей страницы из предыдущего результата
+            limit (int): Количество записей на странице
+            **filters: Дополнительные условия равенства, например on_sale=True
+        
+        Returns:
+            Page: Выпуски по убыванию релевантности и курсор следующей страницы
+        '''
+        return self._search_page(query, after, limit, **filters)
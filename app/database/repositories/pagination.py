@@ -0,0 +1,134 @@
+import json
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from datetime import datetime
+from sqlalchemy import tuple_, or_
+
+
+class Page:
+    '''
+    Страница результатов keyset-пагинации
+
+    Attributes:
+        rows (list): Записи текущей страницы
+        next_cursor (Optional[str]): Курсор следующей страницы, None если страница последняя
+        total (Optional[int]): Общее количество записей с учетом фильтров (если запрошено)
+        estimated (bool): total - оценка по статистике планировщика, а не точный COUNT
+    '''
+    __slots__ = ('rows', 'next_cursor', 'total', 'estimated')
+
+    def __init__(self, rows: list, next_cursor: str | None = None, total: int | None = None,
+                 estimated: bool = False):
+        self.rows = rows
+        self.next_cursor = next_cursor
+        self.total = total
+        self.estimated = estimated
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __repr__(self) -> str:
+        return f"<Page(rows={len(self.rows)}, next_cursor={self.next_cursor!r}, total={self.total})>"
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def encode_cursor(values: list) -> str:
+    '''
+    Кодирует значения ключа последней записи в непрозрачный курсор
+
+    Arguments:
+        values (list): Значения столбцов сортировки последней записи страницы
+
+    Returns:
+        str: Курсор (base64 от JSON)
+    '''
+    payload = json.dumps([_encode_value(value) for value in values], separators=(',', ':'))
+    return urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> list:
+    '''
+    Декодирует курсор, полученный от encode_cursor
+
+    Arguments:
+        cursor (str): Курсор страницы
+
+    Returns:
+        list: Значения столбцов сортировки
+
+    Raises:
+        ValueError: Если курсор поврежден
+    '''
+    try:
+        payload = json.loads(urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception as err:
+        raise ValueError(f"Некорректный курсор страницы: {cursor}") from err
+    return [_decode_value(value) for value in payload]
+
+
+def keyset_condition(sort_column, id_column, last_value, last_id, descending: bool = False,
+                     nullable: bool = True):
+    '''
+    Строит условие "после последней записи" для keyset-пагинации по (sort_column, id)
+
+    NULL в столбце сортировки не сравнивается в (a, b) > (x, y), поэтому такие
+    записи идут последними (см. keyset_ordering) и выбираются отдельным условием.
+
+    Arguments:
+        sort_column: Столбец или выражение сортировки (None - сортировка только по id)
+        id_column: Столбец id
+        last_value: Значение sort_column последней записи предыдущей страницы
+        last_id (int): id последней записи предыдущей страницы
+        descending (bool): Сортировка по убыванию
+        nullable (bool): Может ли sort_column быть NULL
+
+    Returns:
+        ColumnElement: Условие WHERE
+    '''
+    after_id = id_column < last_id if descending else id_column > last_id
+    if sort_column is None:
+        return after_id
+    if last_value is None:
+        return sort_column.is_(None) & after_id
+
+    key = tuple_(sort_column, id_column)
+    condition = key < (last_value, last_id) if descending else key > (last_value, last_id)
+    if nullable:
+        condition = or_(condition, sort_column.is_(None))
+    return condition
+
+
+def keyset_ordering(sort_column, id_column, descending: bool = False, nullable: bool = True) -> list:
+    '''
+    Возвращает ORDER BY для keyset-пагинации: (sort_column NULLS LAST, id)
+
+    Для столбца без NULL порядок NULLS не указывается: тогда в обе стороны
+    подходит индекс (sort_column, id), по убыванию он читается с конца.
+
+    Arguments:
+        sort_column: Столбец или выражение сортировки (None - сортировка только по id)
+        id_column: Столбец id
+        descending (bool): Сортировка по убыванию
+        nullable (bool): Может ли sort_column быть NULL
+
+    Returns:
+        list: Выражения ORDER BY
+    '''
+    id_order = id_column.desc() if descending else id_column.asc()
+    if sort_column is None:
+        return [id_order]
+    sort_order = sort_column.desc() if descending else sort_column.asc()
+    return [sort_order.nulls_last() if nullable else sort_order, id_order]
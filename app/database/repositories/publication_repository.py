@@ -1,7 +1,13 @@
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload, joinedload
 from . import BaseRepository
+from .pagination import Page
 from app.database.models import Publication
+from app.database.models.user_subscription_model import user_subscriptions
 
 class PublicationRepository(BaseRepository):
+    loader_options = (joinedload(Publication.publisher),)
+    
     def __init__(self, session):
         super().__init__(Publication, session)
     
@@ -29,9 +35,7 @@ class PublicationRepository(BaseRepository):
                 pg=data.get('pg')
             )
             
-            self.add(new_publication)
-            
-            if not self.commit():
+            if not self.add(new_publication):
                 return None
             
             return new_publication
@@ -63,3 +67,42 @@ class PublicationRepository(BaseRepository):
             List[Publication]: Список изданий
         '''
         return self.session.query(self.model_class).filter_by(publisher_id=publisher_id).all()
+    
+    def get_subscribed(self, user_id: int) -> list[Publication]:
+        '''
+        Получает издания, на которые подписан пользователь, вместе с последними выпусками
+        
+        Выполняет два запроса независимо от числа подписок: издания
+        и последние выпуски всех этих изданий (selectinload latest_issue).
+        
+        Arguments:
+            user_id (int): ID пользователя
+        
+        Returns:
+            List[Publication]: Список изданий с загруженным latest_issue
+        '''
+        return self.session.scalars(
+            select(self.model_class)
+            .join(user_subscriptions, user_subscriptions.c.publication_id == self.model_class.id)
+            .where(user_subscriptions.c.user_id == user_id)
+            .order_by(self.model_class.name)
+            .options(selectinload(self.model_class.latest_issue))
+        ).all()
+
+    def search(self, query: str, after: str | None = None, limit: int = 20, **filters) -> Page:
+        '''
+        Ищет издания по названию и описанию
+        
+        В PostgreSQL - ранжированный полнотекстовый поиск с учетом опечаток
+        в названии (GIN-индексы tsvector и pg_trgm).
+        
+        Arguments:
+            query (str): Строка поиска
+            after (str, optional): Курсор следующей страницы из предыдущего результата
+            limit (int): Количество записей на странице
+            **filters: Дополнительные условия равенства, например on_sale=True
+        
+        Returns:
+            Page: Издания по убыванию релевантности и курсор следующей страницы
+        '''
+        return self._search_page(query, after, limit, **filters)
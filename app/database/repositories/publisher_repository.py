@@ -23,9 +23,7 @@ class PublisherRepository(BaseRepository):
                 owner=data['owner']
             )
             
-            self.add(new_publisher)
-            
-            if not self.commit():
+            if not self.add(new_publisher):
                 return None
             
             return new_publisher
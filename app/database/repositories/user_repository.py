@@ -1,5 +1,8 @@
+from sqlalchemy import select, exists, delete
 from . import BaseRepository
-from app.database.models import User
+from .base_repository import upsert_statement
+from app.database.models import User, Publication
+from app.database.models.user_subscription_model import user_subscriptions
 
 
 class UserRepository(BaseRepository):
@@ -27,36 +30,25 @@ class UserRepository(BaseRepository):
             ValueError: Если пользователь с таким email или телефоном уже существует
         '''
         try:
-            # Проверка существования пользователя с таким email или телефоном
-            if data['email'] is not None:
-                existing_user = self.session.query(self.model_class).filter(
-                    (self.model_class.email == data['email']) | 
-                    (self.model_class.phone_number == data['phone_number'])
-                ).first()
-            
-            else:
-                existing_user = self.session.query(self.model_class).filter(
-                    (self.model_class.phone_number == data['phone_number'])
-                ).first()
+            # Вставка и проверка уникальности email и телефона одним оператором:
+            # при конфликте строка не вставляется и RETURNING ничего не возвращает
+            statement = upsert_statement(self.model_class, self.session.get_bind().dialect.name)
+            new_user = self.session.scalars(
+                statement.returning(self.model_class),
+                [{
+                    'first_name': data['first_name'],
+                    'last_name': data['last_name'],
+                    'middle_name': data.get('middle_name'),
+                    'email': data.get('email'),
+                    'phone_number': data['phone_number'],
+                    'address': data['address'],
+                    'ad_consent': data['ad_consent']
+                }]
+            ).first()
 
-            if existing_user:
+            if new_user is None:
                 raise ValueError("Пользователь с таким email или телефоном уже существует")
 
-            # Создание нового пользователя
-            new_user = User(
-                first_name=data['first_name'],
-                last_name=data['last_name'],
-                middle_name=data.get('middle_name'),
-                email=data.get('email'),
-                phone_number=data['phone_number'],
-                address=data['address'],
-                ad_consent=data['ad_consent']
-            )
-
-            # Добавление пользователя в БД через метод базового класса
-            self.add(new_user)
-            
-            # Коммит изменений
             if not self.commit():
                 return None
 
@@ -74,3 +66,110 @@ class UserRepository(BaseRepository):
                         self.model_class.is_active == True,
                         self.model_class.subscribed_publications.any()
                     ).all()
+
+    def has_subscription(self, user_id: int, publication_id: int) -> bool:
+        '''
+        Проверяет подписку одним запросом EXISTS без загрузки списка подписок
+
+        Arguments:
+            user_id (int): ID пользователя
+            publication_id (int): ID издания
+
+        Returns:
+            bool: True, если пользователь подписан на издание
+        '''
+        return self.session.scalar(
+            select(exists().where(
+                user_subscriptions.c.user_id == user_id,
+                user_subscriptions.c.publication_id == publication_id
+            ))
+        )
+
+    def subscribe(self, user_id: int, publication_id: int) -> bool:
+        '''
+        Подписывает пользователя на издание одним INSERT ... ON CONFLICT DO NOTHING
+
+        Arguments:
+            user_id (int): ID пользователя
+            publication_id (int): ID издания
+
+        Returns:
+            bool: True, если подписка оформлена; False, если она уже была или произошла ошибка
+        '''
+        return bool(self.subscribe_many(user_id, [publication_id]))
+
+    def subscribe_many(self, user_id: int, publication_ids: list[int]) -> list[int]:
+        '''
+        Подписывает пользователя на несколько изданий одним оператором
+
+        Arguments:
+            user_id (int): ID пользователя
+            publication_ids (list[int]): ID изданий
+
+        Returns:
+            list[int]: ID изданий, подписка на которые оформлена сейчас
+                (существующие подписки пропускаются)
+        '''
+        publication_ids = list(dict.fromkeys(publication_ids))
+        if not publication_ids:
+            return []
+
+        try:
+            statement = upsert_statement(user_subscriptions, self.session.get_bind().dialect.name)
+            subscribed = self.session.scalars(
+                statement
+                .values([
+                    {'user_id': user_id, 'publication_id': publication_id}
+                    for publication_id in publication_ids
+                ])
+                .returning(user_subscriptions.c.publication_id)
+            ).all()
+
+            self._expire_subscriptions(user_id, subscribed)
+            if not self.commit():
+                return []
+            return list(subscribed)
+        except Exception as e:
+            self.session.rollback()
+            print(f"Ошибка оформления подписки: {e}")
+            return []
+
+    def unsubscribe(self, user_id: int, publication_id: int) -> bool:
+        '''
+        Отменяет подписку одним DELETE по ключу
+
+        Arguments:
+            user_id (int): ID пользователя
+            publication_id (int): ID издания
+
+        Returns:
+            bool: True, если подписка была и удалена, иначе False
+        '''
+        try:
+            result = self.session.execute(
+                delete(user_subscriptions).where(
+                    user_subscriptions.c.user_id == user_id,
+                    user_subscriptions.c.publication_id == publication_id
+                )
+            )
+            if not result.rowcount:
+                return False
+
+            self._expire_subscriptions(user_id, [publication_id])
+            return self.commit()
+        except Exception as e:
+            self.session.rollback()
+            print(f"Ошибка отмены подписки: {e}")
+            return False
+
+    def _expire_subscriptions(self, user_id: int, publication_ids: list[int]) -> None:
+        # Подписки изменены в обход коллекций ORM (а счетчик - триггером): загруженные
+        # в сессию значения сбрасываются, чтобы при обращении прочитаться заново
+        user = self.session.identity_map.get(self.session.identity_key(User, user_id))
+        if user is not None:
+            self.session.expire(user, ['subscribed_publications'])
+
+        for publication_id in publication_ids:
+            publication = self.session.identity_map.get(self.session.identity_key(Publication, publication_id))
+            if publication is not None:
+                self.session.expire(publication, ['subscribers', 'subscribers_count'])
@@ -0,0 +1,108 @@
+import time
+import threading
+import logging
+from sqlalchemy import event
+from sqlalchemy.orm import Session as BaseSession
+
+
+logger = logging.getLogger(__name__)
+
+
+class SessionRouter:
+    '''
+    Маршрутизатор запросов между основной БД и репликой только для чтения
+
+    Attributes:
+        primary_engine (Engine): Движок основной БД (все записи)
+        replica_engine (Optional[Engine]): Движок реплики (чтение), None если реплика не настроена
+        check_interval (float): Как часто (с) перепроверять доступность исправной реплики
+        retry_interval (float): Сколько секунд не обращаться к реплике после сбоя
+    '''
+    def __init__(self, primary_engine, replica_engine=None,
+                 check_interval: float = 5.0, retry_interval: float = 30.0):
+        self.primary_engine = primary_engine
+        self.replica_engine = replica_engine
+        self.check_interval = check_interval
+        self.retry_interval = retry_interval
+
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._retry_at = 0.0
+
+        if replica_engine is not None:
+            event.listen(replica_engine, 'handle_error', self._on_replica_error)
+
+    def _on_replica_error(self, context) -> None:
+        # Обрыв соединения с репликой - сразу переключаем чтение на основную БД
+        if context.is_disconnect:
+            self.mark_replica_down(context.original_exception)
+
+    def mark_replica_down(self, err=None) -> None:
+        '''
+        Помечает реплику недоступной на retry_interval секунд
+
+        Arguments:
+            err (Exception, optional): Ошибка, из-за которой реплика отключена
+        '''
+        with self._lock:
+            self._retry_at = time.monotonic() + self.retry_interval
+            self._checked_at = 0.0
+        logger.warning(f"Реплика недоступна, чтение переключено на основную БД: {err}")
+
+    def replica_available(self) -> bool:
+        '''
+        Проверяет, можно ли отправить чтение на реплику
+
+        Реплика проверяется подключением не чаще раза в check_interval секунд;
+        соединение после проверки возвращается в пул и сразу переиспользуется.
+
+        Returns:
+            bool: True, если реплика настроена и отвечает
+        '''
+        if self.replica_engine is None:
+            return False
+
+        now = time.monotonic()
+        if now < self._retry_at:
+            return False
+        if now - self._checked_at < self.check_interval:
+            return True
+
+        try:
+            with self.replica_engine.connect():
+                pass
+        except Exception as err:
+            self.mark_replica_down(err)
+            return False
+
+        with self._lock:
+            self._checked_at = now
+        return True
+
+    def get_bind_for_read(self):
+        '''
+        Возвращает движок для чтения
+
+        Returns:
+            Engine: Реплика, если она доступна, иначе основная БД
+        '''
+        if self.replica_available():
+            return self.replica_engine
+        return self.primary_engine
+
+
+class RoutingSession(BaseSession):
+    '''
+    Сессия, отправляющая SELECT на реплику, если она открыта с info={'readonly': True}.
+
+    Запись (flush, INSERT/UPDATE/DELETE) всегда идет в основную БД,
+    маршрутизатор берется из info['router'].
+    '''
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        router = self.info.get('router')
+        if (router is not None
+                and self.info.get('readonly')
+                and not self._flushing
+                and getattr(clause, 'is_select', False)):
+            return router.get_bind_for_read()
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
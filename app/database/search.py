@@ -0,0 +1,99 @@
+from sqlalchemy import Index, case, func, literal, or_, text
+
+
+# Поиск по name и description (только PostgreSQL):
+#   - полнотекстовый: to_tsvector по name и description, GIN-индекс по выражению;
+#   - с опечатками: триграммы pg_trgm по name, GIN-индекс gin_trgm_ops.
+# Константы выражения записаны литералами SQL (text), а не параметрами, чтобы
+# выражение в запросе совпадало с выражением индекса при любом драйвере.
+
+SEARCH_CONFIG = 'russian'
+
+
+def search_document(model):
+    '''
+    Возвращает текст, по которому идет полнотекстовый поиск
+
+    Arguments:
+        model: Класс модели со столбцами name и description
+
+    Returns:
+        ColumnElement: name || ' ' || description (NULL заменяется пустой строкой)
+    '''
+    return (
+        func.coalesce(model.name, text("''"))
+        .op('||')(text("' '"))
+        .op('||')(func.coalesce(model.description, text("''")))
+    )
+
+
+def search_vector(model):
+    '''
+    Возвращает tsvector документа модели (то же выражение, что в индексе)
+
+    Arguments:
+        model: Класс модели со столбцами name и description
+
+    Returns:
+        ColumnElement: to_tsvector(SEARCH_CONFIG, документ)
+    '''
+    return func.to_tsvector(text(f"'{SEARCH_CONFIG}'"), search_document(model))
+
+
+def declare_search_indexes(model) -> list[Index]:
+    '''
+    Объявляет для модели GIN-индексы полнотекстового и триграммного поиска
+
+    Индексы создаются только в PostgreSQL; на существующей БД их строит миграция.
+
+    Arguments:
+        model: Класс модели со столбцами name и description
+
+    Returns:
+        list[Index]: Объявленные индексы
+    '''
+    table_name = model.__tablename__
+    return [
+        Index(
+            f'ix_{table_name}_search_fts', search_vector(model),
+            postgresql_using='gin'
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            f'ix_{table_name}_name_trgm', model.name,
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    ]
+
+
+def search_clauses(model, query: str, dialect_name: str):
+    '''
+    Строит условие отбора и ранг для поиска по строке
+
+    В PostgreSQL запись подходит, если документ совпадает с запросом
+    (websearch_to_tsquery) или запрос похож на слово в name (оператор <%
+    pg_trgm); оба условия используют GIN-индексы. Ранг складывается из
+    ts_rank_cd и word_similarity. В остальных БД выполняется поиск подстроки
+    без учета регистра, ранг - 1 для совпадения в name.
+
+    Arguments:
+        model: Класс модели со столбцами name и description
+        query (str): Строка поиска
+        dialect_name (str): Имя диалекта БД
+
+    Returns:
+        tuple: (условие WHERE, выражение ранга)
+    '''
+    if dialect_name == 'postgresql':
+        vector = search_vector(model)
+        tsquery = func.websearch_to_tsquery(text(f"'{SEARCH_CONFIG}'"), query)
+        condition = or_(
+            vector.bool_op('@@')(tsquery),
+            literal(query).bool_op('<%')(model.name)
+        )
+        rank = func.ts_rank_cd(vector, tsquery) + func.word_similarity(query, model.name)
+        return condition, rank
+
+    in_name = model.name.icontains(query, autoescape=True)
+    condition = or_(in_name, model.description.icontains(query, autoescape=True))
+    rank = case((in_name, 1), else_=0)
+    return condition, rank
@@ -1,36 +1,135 @@
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 import psycopg2
-from app.database.get_connection_string import get_connection_string
+from app.database.get_connection_string import (get_connection_string, get_async_connection_string,
+                                                get_replica_connection_string)
+from app.database.pool_config import get_profile_name, get_pool_settings
+from app.database.pool_metrics import PoolMetrics
+from app.database.routing import SessionRouter, RoutingSession
+from app.database.instrumentation import instrument_engine
 import logging
 
 
 # Настройка логгера
 logger = logging.getLogger(__name__)
 
-# Получение строки для подключения к PostgreSQL
+# Получение строк для подключения к PostgreSQL
 connection_string = get_connection_string()
+async_connection_string = get_async_connection_string()
+replica_connection_string = get_replica_connection_string()
 
-# Создание движка
-engine = create_engine(
-    connection_string,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    echo=False
+
+def create_db_engine(url: str, profile: str | None = None):
+    '''
+    Создает движок с пулом соединений, настроенным под профиль развертывания,
+    и подключает к нему сбор статистики пула и замер запросов
+
+    Arguments:
+        url (str): Строка подключения к БД
+        profile (str, optional): Профиль развертывания (kiosk, admin, bot, batch),
+            по умолчанию берется из переменной окружения DB_PROFILE
+
+    Returns:
+        tuple: (Engine, PoolMetrics)
+    '''
+    profile = get_profile_name(profile)
+    metrics = PoolMetrics(profile)
+
+    options = get_pool_settings(profile)
+    if make_url(url).get_driver_name() == 'psycopg2':
+        # Пакетная отправка executemany для UPDATE/DELETE (INSERT уже
+        # группируется в многострочные VALUES)
+        options['executemany_mode'] = 'values_plus_batch'
+
+    db_engine = create_engine(
+        url,
+        poolclass=metrics.pool_class(QueuePool),
+        pool_pre_ping=True,
+        echo=False,
+        **options
+    )
+    metrics.attach(db_engine)
+    instrument_engine(db_engine)
+
+    return db_engine, metrics
+
+
+def create_async_db_engine(url: str, profile: str | None = None):
+    '''
+    Создает асинхронный движок с пулом, настроенным под профиль развертывания,
+    и подключает к нему сбор статистики пула и замер запросов
+
+    Arguments:
+        url (str): Строка подключения к БД с асинхронным драйвером
+        profile (str, optional): Профиль развертывания (kiosk, admin, bot, batch)
+
+    Returns:
+        tuple: (AsyncEngine, PoolMetrics)
+    '''
+    profile = get_profile_name(profile)
+    metrics = PoolMetrics(profile)
+
+    db_engine = create_async_engine(
+        url,
+        poolclass=metrics.pool_class(AsyncAdaptedQueuePool),
+        pool_pre_ping=True,
+        echo=False,
+        **get_pool_settings(profile)
+    )
+    metrics.attach(db_engine.sync_engine)
+    instrument_engine(db_engine.sync_engine)
+
+    return db_engine, metrics
+
+
+# Создание движков
+engine, pool_metrics = create_db_engine(connection_string)
+# Асинхронный движок обслуживает бота и корутины, запущенные из GUI,
+# чтобы запросы к БД не блокировали общий цикл событий qtinter
+async_engine, async_pool_metrics = create_async_db_engine(async_connection_string, 'bot')
+# Реплика для чтения; без нее все запросы идут в основную БД
+replica_engine, replica_pool_metrics = (
+    create_db_engine(replica_connection_string)
+    if replica_connection_string else (None, None)
 )
 
-# Создание фабрики сессий
-Session = sessionmaker(bind=engine)
+router = SessionRouter(engine, replica_engine)
+
+# Создание фабрик сессий
+Session = sessionmaker(bind=engine, class_=RoutingSession, info={'router': router})
+AsyncSession = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+
+def get_pool_stats() -> dict:
+    '''
+    Возвращает статистику пулов соединений всех движков
+
+    Returns:
+        dict: {имя движка: статистика пула (см. PoolMetrics.snapshot)}
+    '''
+    stats = {
+        'primary': pool_metrics.snapshot(),
+        'async': async_pool_metrics.snapshot(),
+    }
+    if replica_pool_metrics is not None:
+        stats['replica'] = replica_pool_metrics.snapshot()
+    return stats
+
 
 @contextmanager
-def get_session():
+def get_session(readonly: bool = False):
     """
     Контекстный менеджер для работы с сессией базы данных.
     Автоматически коммитит изменения при успешном выполнении 
     и откатывает при возникновении исключений.
+    
+    При readonly=True чтение идет на реплику (если она настроена и доступна,
+    иначе на основную БД), запись по-прежнему выполняется в основной БД.
     """
-    session = Session()
+    session = Session(info={'readonly': readonly})
     try:
         yield session
         session.commit()
@@ -42,3 +141,24 @@ def get_session():
     
     finally:
         session.close()
+
+
+@asynccontextmanager
+async def get_async_session():
+    """
+    Асинхронный контекстный менеджер для работы с сессией базы данных.
+    Автоматически коммитит изменения при успешном выполнении
+    и откатывает при возникновении исключений.
+    """
+    session = AsyncSession()
+    try:
+        yield session
+        await session.commit()
+        
+    except Exception as err:
+        await session.rollback()
+        logger.error(f"Database error: {err}")
+        raise err
+    
+    finally:
+        await session.close()
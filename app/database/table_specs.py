@@ -0,0 +1,198 @@
+from datetime import datetime
+from sqlalchemy import select, func
+from app.database.models import (User, Admin, Publisher, Publication, Issue,
+                                 Courier, Complaint, Delivery)
+from app.database.repositories import (UserRepository, AdminRepository, PublisherRepository,
+                                       PublicationRepository, IssueRepository, CourierRepository,
+                                       ComplaintRepository, DeliveryRepository)
+
+
+def format_value(value) -> str:
+    '''
+    Форматирует значение ячейки для отображения
+
+    Arguments:
+        value: Значение из строки проекции
+
+    Returns:
+        str: Текст ячейки
+    '''
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "Да" if value else "Нет"
+    if isinstance(value, datetime):
+        return value.strftime("%d.%m.%Y %H:%M")
+    return str(value)
+
+
+def format_money(value) -> str:
+    '''Форматирует денежную сумму с двумя знаками после запятой'''
+    return "" if value is None else f"{value:.2f}"
+
+
+class TableSpec:
+    '''
+    Описание таблицы панели администратора: что показывать и как читать из БД
+
+    Проекция строится один раз при импорте модуля; при каждом запросе к ней
+    добавляются только фильтры, сортировка и LIMIT, а SQL берется из кэша
+    компиляции SQLAlchemy.
+
+    Attributes:
+        name (str): Название таблицы в интерфейсе
+        repository (type): Класс репозитория модели (стратегия загрузки связей
+            для чтения объектов - в его loader_options)
+        headers (list[str]): Заголовки столбцов
+        statement (Select): Проекция отображаемых столбцов, первый столбец - id
+        formatters (dict[int, Callable]): Форматирование ячеек по индексу столбца
+            (по умолчанию - format_value)
+        filterable (set[int]): Индексы столбцов, по которым разрешен фильтр: условие
+            фильтра по ним обслуживает индекс (id, внешний ключ, дата с индексом,
+            текст с declare_prefix_indexes). Флаги тоже разрешены: строк с каждым
+            значением много, и страница набирается по ходу чтения в порядке сортировки
+        sortable (set[int]): Индексы столбцов, по которым разрешена сортировка:
+            для каждого есть индекс (столбец, id), см. declare_sort_indexes
+    '''
+    __slots__ = ('name', 'repository', 'headers', 'statement', 'formatters', 'filterable', 'sortable')
+
+    def __init__(self, name: str, repository: type, columns: list[tuple], joins: list[tuple] | None = None,
+                 formatters: dict | None = None, filterable: set | None = None,
+                 sortable: set | None = None):
+        '''
+        Arguments:
+            name (str): Название таблицы в интерфейсе
+            repository (type): Класс репозитория модели
+            columns (list[tuple]): Пары (заголовок, столбец или SQL-выражение), первая - id
+            joins (list[tuple], optional): Пары (модель, условие) для LEFT OUTER JOIN
+            formatters (dict[int, Callable], optional): Форматирование ячеек по индексу столбца
+            filterable (set[int], optional): Столбцы, по которым разрешен фильтр (по умолчанию только id)
+            sortable (set[int], optional): Столбцы, по которым разрешена сортировка (по умолчанию только id)
+        '''
+        self.name = name
+        self.repository = repository
+        self.headers = [header for header, _ in columns]
+        self.formatters = formatters or {}
+        self.filterable = {0} | set(filterable or ())
+        self.sortable = {0} | set(sortable or ())
+
+        statement = select(*(column for _, column in columns))
+        for target, onclause in joins or []:
+            statement = statement.outerjoin(target, onclause)
+        self.statement = statement
+
+    def check_query(self, sort_column: int = 0, filters: dict[int, str] | None = None) -> None:
+        '''
+        Проверяет, что сортировка и фильтры заданы только по столбцам с индексом
+
+        Arguments:
+            sort_column (int): Индекс столбца сортировки
+            filters (dict[int, str], optional): {индекс столбца: текст фильтра}
+
+        Raises:
+            ValueError: Если сортировка не по столбцу из sortable или фильтр
+                не по столбцу из filterable
+        '''
+        if sort_column not in self.sortable:
+            header = self.headers[sort_column] if 0 <= sort_column < len(self.headers) else sort_column
+            raise ValueError(f"Сортировка по столбцу не поддерживается: {header}")
+
+        columns = {index for index, value in (filters or {}).items() if value and value.strip()}
+        unsupported = sorted(columns - self.filterable)
+        if unsupported:
+            headers = ", ".join(self.headers[index] if 0 <= index < len(self.headers) else str(index)
+                                for index in unsupported)
+            raise ValueError(f"Фильтр по столбцам не поддерживается: {headers}")
+
+    def format_row(self, row) -> tuple:
+        '''
+        Форматирует строку проекции для отображения
+
+        Arguments:
+            row (Row): Строка проекции
+
+        Returns:
+            tuple: Тексты ячеек
+        '''
+        return tuple(
+            self.formatters.get(index, format_value)(value) for index, value in enumerate(row)
+        )
+
+
+def _full_name(model, default: str):
+    return func.coalesce(model.first_name + ' ' + model.last_name, default).label('full_name')
+
+
+# Реестр таблиц в порядке кнопок панели администратора; новая таблица - новая запись
+TABLES = {spec.name: spec for spec in [
+    TableSpec("Пользователи", UserRepository, [
+        ("ID", User.id),
+        ("Имя", User.first_name),
+        ("Фамилия", User.last_name),
+        ("Телефон", User.phone_number),
+        ("Email", User.email),
+        ("Адрес", User.address),
+        ("Дата регистрации", User.registration_date),
+        ("Активен", User.is_active),
+    ], filterable={2, 3, 4, 6, 7}, sortable={2, 6}),
+    # Хеш пароля в проекцию не входит
+    TableSpec("Администраторы", AdminRepository, [
+        ("ID", Admin.id),
+        ("Имя", Admin.first_name),
+        ("Фамилия", Admin.last_name),
+        ("Телефон", Admin.phone_number),
+        ("Email", Admin.email),
+        ("Зарплата", Admin.salary),
+        ("Активен", Admin.is_active),
+    ], formatters={5: format_money}, filterable={2, 3, 4, 6}, sortable={2}),
+    TableSpec("Издательства", PublisherRepository, [
+        ("ID", Publisher.id),
+        ("Название", Publisher.name),
+        ("Владелец", Publisher.owner),
+        ("Дата начала продаж", Publisher.sales_start),
+        ("Активен", Publisher.is_active),
+    ], filterable={1, 2, 3, 4}, sortable={1, 3}),
+    TableSpec("Публикации", PublicationRepository, [
+        ("ID", Publication.id),
+        ("Название", Publication.name),
+        ("Тип", Publication.publication_type),
+        ("Издательство", func.coalesce(Publisher.name, 'Нет').label('publisher_name')),
+        ("В продаже", Publication.on_sale),
+    ], joins=[(Publisher, Publisher.id == Publication.publisher_id)], filterable={1, 4},
+        sortable={1}),
+    TableSpec("Выпуски", IssueRepository, [
+        ("ID", Issue.id),
+        ("Название", Issue.name),
+        ("Номер", Issue.issue_number),
+        ("Тип", Issue.issue_type),
+        ("Издание", Issue.publication_id),
+        ("Цена", Issue.cost),
+        ("В продаже", Issue.on_sale),
+    ], formatters={5: format_money}, filterable={1, 4, 6}, sortable={1}),
+    TableSpec("Доставщики", CourierRepository, [
+        ("ID", Courier.id),
+        ("Имя", Courier.first_name),
+        ("Фамилия", Courier.last_name),
+        ("Телефон", Courier.phone_number),
+        ("Зарплата", Courier.salary),
+        ("Рейтинг", Courier.rating),
+        ("Активен", Courier.is_active),
+    ], formatters={4: format_money}, filterable={2, 3, 6}, sortable={2, 5}),
+    TableSpec("Жалобы", ComplaintRepository, [
+        ("ID", Complaint.id),
+        ("Доставщик", _full_name(Courier, 'Нет')),
+        ("Описание", Complaint.description),
+        ("Дата", Complaint.created_at),
+    ], joins=[(Courier, Courier.id == Complaint.courier_id)], filterable={3}, sortable={3}),
+    TableSpec("Доставки", DeliveryRepository, [
+        ("ID", Delivery.id),
+        ("Тип издания", Delivery.item_type),
+        ("Курьер", _full_name(Courier, 'Не назначен')),
+        ("Получатель", Delivery.recipient_name),
+        ("Телефон", Delivery.recipient_phone),
+        ("Адрес", Delivery.recipient_address),
+        ("Стоимость", Delivery.item_cost),
+        ("Доставлено", Delivery.is_delivered),
+    ], joins=[(Courier, Courier.id == Delivery.courier_id)], formatters={6: format_money},
+        filterable={3, 4, 7}, sortable={3}),
+]}
@@ -0,0 +1,78 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class UnitOfWork:
+    '''
+    Единица работы: группа операций репозиториев, фиксируемая одним коммитом
+
+    Attributes:
+        session (Session): Сессия, в которой выполняются операции
+        failed (bool): True, если внутри единицы работы произошел откат
+            (ошибка одной из операций) - тогда при выходе изменения не коммитятся
+    '''
+    def __init__(self, session: Session):
+        self.session = session
+        self.failed = False
+
+    def _on_rollback(self, session) -> None:
+        self.failed = True
+
+
+def in_unit_of_work(session: Session) -> bool:
+    '''
+    Проверяет, выполняется ли сессия внутри единицы работы
+
+    Arguments:
+        session (Session): Сессия SQLAlchemy
+
+    Returns:
+        bool: True, если открыт блок uow(session)
+    '''
+    return session.info.get('unit_of_work') is not None
+
+
+@contextmanager
+def uow(session: Session):
+    '''
+    Контекстный менеджер единицы работы
+
+    Внутри блока BaseRepository.commit() только отправляет изменения в БД
+    (flush), а один коммит выполняется при выходе из блока. Если операция
+    репозитория завершилась ошибкой (и откатила транзакцию) или в блоке
+    возникло исключение, при выходе выполняется откат всех изменений блока.
+    Вложенные блоки входят во внешний и не коммитят самостоятельно.
+
+        with uow(session) as tx:
+            repo.update(...)
+            repo.soft_delete(...)
+        if tx.failed:
+            ...
+
+    Arguments:
+        session (Session): Сессия, общая для репозиториев единицы работы
+
+    Returns:
+        UnitOfWork: Объект единицы работы
+    '''
+    current = session.info.get('unit_of_work')
+    if current is not None:
+        yield current
+        return
+
+    tx = UnitOfWork(session)
+    session.info['unit_of_work'] = tx
+    event.listen(session, 'after_rollback', tx._on_rollback)
+    try:
+        yield tx
+        if tx.failed:
+            session.rollback()
+        else:
+            session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        event.remove(session, 'after_rollback', tx._on_rollback)
+        del session.info['unit_of_work']
@@ -1,13 +1,20 @@
+import asyncio
+import threading
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                            QLabel, QPushButton, QLineEdit, QStackedWidget, 
-                           QTableWidget, QTableWidgetItem, QFormLayout, 
-                           QMessageBox, QHeaderView, QDialog, QComboBox, 
+                           QTableView, QFormLayout, 
+                           QMessageBox, QDialog, QComboBox, 
                            QSpinBox, QCheckBox, QDoubleSpinBox, QDateTimeEdit,
-                           QScrollArea, QTextEdit)
+                           QScrollArea, QTextEdit, QFileDialog, QProgressDialog)
 from PyQt6.QtCore import Qt, QDateTime
 from PyQt6.QtGui import QFont
 
 from app.controllers.admin_window_controller import AdminController
+from app.gui.table_model import ColumnTableModel, fit_columns_to_sample
+
+
+# Количество строк, загружаемых за один запрос при прокрутке таблицы
+TABLE_PAGE_SIZE = 100
 
 
 class AdminWindow(QMainWindow):
@@ -19,6 +26,8 @@ class AdminWindow(QMainWindow):
         
         self.admin_controller = AdminController()
         self.current_admin = None
+        # Задача выгрузки хранится здесь: цикл asyncio держит на задачи только слабые ссылки
+        self.export_task = None
         
         # Создаем центральный виджет и стек для переключения между окнами
         self.central_widget = QWidget()
@@ -283,8 +292,7 @@ class AdminWindow(QMainWindow):
         tables_layout.addWidget(tables_label)
         
         # Кнопки для просмотра таблиц
-        for table_name in ["Пользователи", "Администраторы", "Издательства", 
-                          "Публикации", "Выпуски", "Доставщики", "Жалобы", "Доставки"]:
+        for table_name in self.admin_controller.get_table_names():
             button = QPushButton(table_name)
             button.setStyleSheet(
                 "background-color: white; color: black; padding: 10px; text-align: left; "
@@ -323,13 +331,70 @@ class AdminWindow(QMainWindow):
         add_record_button.clicked.connect(self.add_record_to_current_table)
         actions_layout.addWidget(add_record_button)
         
+        # Кнопка выгрузки таблицы в файл
+        export_button = QPushButton("Экспорт")
+        export_button.setStyleSheet(
+            "background-color: white; color: black; padding: 8px; "
+            "border: 1px solid black; border-radius: 5px; min-width: 100px;"
+        )
+        export_button.clicked.connect(self.export_current_table)
+        actions_layout.addWidget(export_button)
+        
         right_panel.addLayout(actions_layout)
         
-        # Таблица для отображения данных
-        self.data_table = QTableWidget()
+        # Фильтр по столбцу: условие добавляется в SQL-запрос страницы
+        filter_layout = QHBoxLayout()
+        
+        self.filter_column_combo = QComboBox()
+        self.filter_column_combo.setStyleSheet("padding: 6px; background-color: white; border: 1px solid #ddd;")
+        filter_layout.addWidget(self.filter_column_combo)
+        
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Значение фильтра (для дат - ГГГГ-ММ-ДД, для флагов - да/нет)")
+        self.filter_input.setStyleSheet("padding: 6px; background-color: white; border: 1px solid #ddd;")
+        self.filter_input.returnPressed.connect(self.apply_table_filter)
+        filter_layout.addWidget(self.filter_input, 1)
+        
+        apply_filter_button = QPushButton("Фильтровать")
+        apply_filter_button.setStyleSheet(
+            "background-color: white; color: black; padding: 6px; "
+            "border: 1px solid black; border-radius: 5px;"
+        )
+        apply_filter_button.clicked.connect(self.apply_table_filter)
+        filter_layout.addWidget(apply_filter_button)
+        
+        reset_filter_button = QPushButton("Сбросить")
+        reset_filter_button.setStyleSheet(
+            "background-color: white; color: black; padding: 6px; "
+            "border: 1px solid black; border-radius: 5px;"
+        )
+        reset_filter_button.clicked.connect(self.reset_table_filters)
+        filter_layout.addWidget(reset_filter_button)
+        
+        right_panel.addLayout(filter_layout)
+        
+        self.filters_label = QLabel("")
+        self.filters_label.setStyleSheet("color: #555;")
+        right_panel.addWidget(self.filters_label)
+        
+        # Таблица для отображения данных: строки подгружаются по мере прокрутки
+        self.table_model = ColumnTableModel(fetch_page=None, background=True, parent=self)
+        self.table_model.page_loaded.connect(self.on_table_page_loaded)
+        self.table_model.load_failed.connect(self.on_table_load_failed)
+        self.data_table = QTableView()
+        self.data_table.setModel(self.table_model)
         self.data_table.setStyleSheet("background-color: white; border: 1px solid #ddd;")
+        self.data_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        header = self.data_table.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        # Клик по заголовку сортирует таблицу запросом к БД
+        header.sectionClicked.connect(self.sort_table)
         right_panel.addWidget(self.data_table)
         
+        self.page_label = QLabel("")
+        right_panel.addWidget(self.page_label)
+        
         content_layout.addLayout(right_panel, 3)  # Правая панель занимает больше места
         
         layout.addLayout(content_layout)
@@ -416,25 +481,210 @@ class AdminWindow(QMainWindow):
         self.show_choice_screen()
     
     def show_table(self, table_name):
-        """Отображает выбранную таблицу"""
+        """Отображает выбранную таблицу без сортировки и фильтров"""
         self.content_title.setText(f"Таблица: {table_name}")
         
-        # Получаем данные таблицы через контроллер
-        headers, data = self.admin_controller.get_table_data(table_name)
+        self.table_state = {
+            'name': table_name,
+            'sort_column': 0,
+            'descending': False,
+            'filters': {},
+            'sortable': self.admin_controller.get_sortable_columns(table_name),
+        }
+        self.filter_input.clear()
+        
+        # Список столбцов для фильтра обновляется при смене таблицы; в нем только
+        # столбцы, фильтр по которым выполняется по индексу
+        self.filter_column_combo.clear()
+        for column, header in self.admin_controller.get_filter_columns(table_name):
+            self.filter_column_combo.addItem(header, column)
+        self.reload_table()
+    
+    def reload_table(self):
+        """
+        Загружает таблицу заново с первой страницы (после смены таблицы,
+        сортировки или фильтров)
+        
+        Незавершенная загрузка предыдущей таблицы отменяется, ее результат
+        в таблицу не попадает. Следующие страницы модель загружает в фоне
+        при прокрутке к концу таблицы.
+        """
+        state = self.table_state
+        state['sized'] = False
+        query = dict(sort_column=state['sort_column'], descending=state['descending'],
+                     filters=dict(state['filters']))
+        
+        self.table_model.reset(
+            self.admin_controller.get_table_headers(state['name']),
+            lambda cursor: self.admin_controller.get_table_data(
+                state['name'], after=cursor, limit=TABLE_PAGE_SIZE, **query
+            )[1]
+        )
+        self.data_table.horizontalHeader().setSortIndicator(
+            state['sort_column'],
+            Qt.SortOrder.DescendingOrder if state['descending'] else Qt.SortOrder.AscendingOrder
+        )
+        self.table_model.fetchMore()
+        self.update_table_status()
+    
+    def on_table_page_loaded(self, page):
+        """Обрабатывает загрузку очередной страницы таблицы"""
+        # Ширина столбцов подбирается один раз по первой странице
+        if not self.table_state['sized']:
+            fit_columns_to_sample(self.data_table)
+            self.table_state['sized'] = True
+        self.update_table_status()
+    
+    def on_table_load_failed(self, message):
+        """Сообщает об ошибке загрузки страницы таблицы"""
+        self.update_table_status()
+        QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные таблицы: {message}")
+    
+    def update_table_status(self):
+        """Обновляет подписи количества строк и активных фильтров"""
+        state = self.table_state
+        model = self.table_model
+        
+        if model.is_fetching() and not model.rowCount():
+            self.page_label.setText("Загрузка...")
+        elif model.rowCount():
+            total = ""
+            if model.total is not None:
+                total = f" из {'~' if model.estimated else ''}{model.total}"
+            self.page_label.setText(f"Загружено строк: {model.rowCount()}{total}")
+        else:
+            self.page_label.setText("Нет записей")
+        
+        headers = [model.headerData(column, Qt.Orientation.Horizontal)
+                   for column in range(model.columnCount())]
+        self.filters_label.setText("; ".join(
+            f"{headers[column]}: {value}" for column, value in state['filters'].items()
+        ))
+    
+    def sort_table(self, column):
+        """
+        Сортирует таблицу по столбцу; повторный клик меняет направление
+        
+        Клик по столбцу без индекса сортировки (например, имени из связанной
+        таблицы) игнорируется: сортировка по нему читала бы всю таблицу.
+        """
+        if not hasattr(self, 'table_state'):
+            return
+        
+        state = self.table_state
+        if column not in state['sortable']:
+            # Заголовок уже перевернул индикатор сортировки - возвращаем прежний
+            self.data_table.horizontalHeader().setSortIndicator(
+                state['sort_column'],
+                Qt.SortOrder.DescendingOrder if state['descending'] else Qt.SortOrder.AscendingOrder
+            )
+            return
         
-        # Настраиваем таблицу
-        self.data_table.setRowCount(len(data))
-        self.data_table.setColumnCount(len(headers))
-        self.data_table.setHorizontalHeaderLabels(headers)
+        if state['sort_column'] == column:
+            state['descending'] = not state['descending']
+        else:
+            state['sort_column'] = column
+            state['descending'] = False
+        self.reload_table()
+    
+    def apply_table_filter(self):
+        """Добавляет (или убирает при пустом значении) фильтр по выбранному столбцу"""
+        if not hasattr(self, 'table_state'):
+            return
         
-        # Заполняем таблицу данными
-        for row_idx, row_data in enumerate(data):
-            for col_idx, cell_data in enumerate(row_data):
-                item = QTableWidgetItem(str(cell_data) if cell_data is not None else "")
-                self.data_table.setItem(row_idx, col_idx, item)
+        column = self.filter_column_combo.currentData()
+        if column is None:
+            return
+        value = self.filter_input.text().strip()
+        if value:
+            self.table_state['filters'][column] = value
+        else:
+            self.table_state['filters'].pop(column, None)
+        self.reload_table()
+    
+    def reset_table_filters(self):
+        """Сбрасывает все фильтры таблицы"""
+        if not hasattr(self, 'table_state'):
+            return
         
-        # Настраиваем размеры столбцов
-        self.data_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.filter_input.clear()
+        self.table_state['filters'] = {}
+        self.reload_table()
+    
+    def export_current_table(self):
+        """Выгружает текущую таблицу с фильтрами и сортировкой в CSV или Parquet"""
+        if not hasattr(self, 'table_state'):
+            QMessageBox.warning(self, "Предупреждение", "Выберите таблицу для выгрузки")
+            return
+        if self.export_task is not None and not self.export_task.done():
+            QMessageBox.warning(self, "Предупреждение", "Дождитесь окончания текущей выгрузки")
+            return
+        
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Экспорт таблицы", f"{self.table_state['name']}.csv",
+            "CSV (*.csv);;Parquet (*.parquet)"
+        )
+        if not path:
+            return
+        
+        export_format = 'parquet' if selected_filter.startswith("Parquet") else 'csv'
+        if not path.lower().endswith(f".{export_format}"):
+            path += f".{export_format}"
+        self.export_task = asyncio.create_task(
+            self._export_table(dict(self.table_state), path, export_format)
+        )
+        self.export_task.add_done_callback(self.on_export_done)
+    
+    def on_export_done(self, task):
+        """Сообщает о непредвиденной ошибке задачи выгрузки (ошибки самой выгрузки показывает _export_table)"""
+        if task is self.export_task:
+            self.export_task = None
+        if task.cancelled() or task.exception() is None:
+            return
+        
+        err = task.exception()
+        print(f"Ошибка выгрузки таблицы: {err!r}")
+        QMessageBox.critical(self, "Ошибка", f"Выгрузка прервана из-за ошибки: {err}")
+    
+    async def _export_table(self, state, path, export_format):
+        """Выполняет выгрузку в рабочем потоке, показывая ход и позволяя отменить ее"""
+        total = self.table_model.total
+        progress_dialog = QProgressDialog("Выгрузка таблицы...", "Отмена", 0, total or 0, self)
+        progress_dialog.setWindowTitle("Экспорт")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setAutoReset(False)
+        progress_dialog.setMinimumDuration(0)
+        
+        cancel_event = threading.Event()
+        progress_dialog.canceled.connect(cancel_event.set)
+        
+        # Ход выгрузки приходит из рабочего потока и передается в поток GUI через цикл событий
+        loop = asyncio.get_running_loop()
+        def report_progress(rows):
+            loop.call_soon_threadsafe(self.show_export_progress, progress_dialog, rows)
+        
+        try:
+            success, result = await asyncio.to_thread(
+                self.admin_controller.export_table, state['name'], path, export_format,
+                sort_column=state['sort_column'], descending=state['descending'],
+                filters=dict(state['filters']), progress=report_progress, cancel_event=cancel_event
+            )
+        finally:
+            # Окно хода выгрузки закрывается и при ошибке, о которой сообщит on_export_done
+            progress_dialog.canceled.disconnect()
+            progress_dialog.close()
+        
+        if success:
+            QMessageBox.information(self, "Успех", f"Выгружено строк: {result}\n{path}")
+        elif not cancel_event.is_set():
+            QMessageBox.warning(self, "Ошибка", f"Не удалось выгрузить таблицу: {result}")
+    
+    def show_export_progress(self, progress_dialog, rows):
+        """Обновляет окно хода выгрузки"""
+        progress_dialog.setLabelText(f"Выгружено строк: {rows}")
+        # Общее количество строк может быть оценкой: полоса не должна дойти до конца раньше времени
+        if progress_dialog.maximum():
+            progress_dialog.setValue(min(rows, progress_dialog.maximum() - 1))
     
     def add_record_to_current_table(self):
         """Добавляет запись в текущую выбранную таблицу"""
@@ -0,0 +1,224 @@
+import asyncio
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+
+# Сколько строк просматривается при подборе ширины столбцов
+COLUMN_SAMPLE_ROWS = 50
+# Максимальная ширина столбца при автоподборе, пикселей
+MAX_COLUMN_WIDTH = 400
+# Запас на отступы ячейки и индикатор сортировки, пикселей
+COLUMN_PADDING = 24
+
+
+class ColumnTableModel(QAbstractTableModel):
+    """
+    Модель таблицы только для чтения с хранением данных по столбцам
+
+    Значения ячеек хранятся в списке на каждый столбец, поэтому на строку
+    не создается ни одного объекта Qt: представление запрашивает только
+    видимые ячейки. Если передана функция загрузки страниц, следующие
+    страницы подгружаются по мере прокрутки (canFetchMore/fetchMore).
+
+    Signals:
+        page_loaded (object): Загружена очередная страница (Page)
+        load_failed (str): Фоновая загрузка страницы завершилась ошибкой;
+            подгрузка останавливается до следующего reset
+    """
+    page_loaded = pyqtSignal(object)
+    load_failed = pyqtSignal(str)
+
+    def __init__(self, headers=None, fetch_page=None, background=False, to_row=None, parent=None):
+        """
+        Args:
+            headers (list, optional): Заголовки столбцов
+            fetch_page (Callable, optional): fetch_page(cursor) -> Page - загрузка
+                страницы по курсору (None - первая страница); строки Page - кортежи
+                текстов ячеек или записи для to_row
+            background (bool): Выполнять fetch_page в рабочем потоке через общий
+                цикл asyncio, а не в потоке GUI
+            to_row (Callable, optional): Преобразует запись страницы в кортеж
+                текстов ячеек; сама запись становится ключом строки (см. key)
+            parent (QObject, optional): Родительский объект
+        """
+        super().__init__(parent)
+        self._headers = []
+        self._columns = []
+        self._keys = []
+        self._row_count = 0
+        self._fetch_page = None
+        self._background = background
+        self._to_row = to_row
+        self._task = None
+        self._next_cursor = None
+        self._has_more = False
+        self.total = None
+        self.estimated = False
+        self.reset(headers or [], fetch_page)
+
+    # --- Интерфейс QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        return self._columns[index.column()][index.row()]
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section] if section < len(self._headers) else None
+        return section + 1
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return (not parent.isValid() and self._fetch_page is not None
+                and self._has_more and not self.is_fetching())
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+
+        if self._background:
+            self._task = asyncio.create_task(self._fetch_in_background(self._next_cursor))
+        else:
+            self._add_page(self._fetch_page(self._next_cursor))
+
+    # --- Загрузка данных ---
+
+    def reset(self, headers=None, fetch_page=None):
+        """
+        Очищает модель и задает новые столбцы и источник страниц
+
+        Незавершенная фоновая загрузка отменяется, ее результат в модель не попадает.
+
+        Args:
+            headers (list, optional): Заголовки столбцов, по умолчанию прежние
+            fetch_page (Callable, optional): Функция загрузки страниц (см. __init__)
+        """
+        self.cancel()
+        self.beginResetModel()
+        if headers is not None:
+            self._headers = list(headers)
+        self._columns = [[] for _ in self._headers]
+        self._keys = []
+        self._row_count = 0
+        self._fetch_page = fetch_page
+        self._next_cursor = None
+        self._has_more = fetch_page is not None
+        self.total = None
+        self.estimated = False
+        self.endResetModel()
+
+    def set_rows(self, rows, keys=None):
+        """
+        Заменяет содержимое модели готовыми строками (без подгрузки страниц)
+
+        Args:
+            rows (list): Кортежи текстов ячеек
+            keys (list, optional): Объекты, связанные со строками (см. key)
+        """
+        self.reset()
+        self.append_rows(rows, keys)
+
+    def append_rows(self, rows, keys=None):
+        """
+        Добавляет строки в конец модели
+
+        Args:
+            rows (list): Кортежи текстов ячеек
+            keys (list, optional): Объекты, связанные со строками; по умолчанию
+                значение первой ячейки строки
+        """
+        if not rows:
+            return
+
+        first = self._row_count
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for column, values in enumerate(self._columns):
+            values.extend(row[column] for row in rows)
+        self._keys.extend(keys if keys is not None else (row[0] for row in rows))
+        self._row_count += len(rows)
+        self.endInsertRows()
+
+    def cancel(self):
+        """Отменяет незавершенную фоновую загрузку страницы"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def is_fetching(self):
+        """Возвращает True, если идет фоновая загрузка страницы"""
+        return self._task is not None and not self._task.done()
+
+    def key(self, row):
+        """
+        Возвращает объект, связанный со строкой (например, ID записи)
+
+        Args:
+            row (int): Номер строки
+        """
+        return self._keys[row]
+
+    def column_sample(self, column, size=COLUMN_SAMPLE_ROWS):
+        """
+        Возвращает значения столбца из равномерной выборки строк
+
+        Args:
+            column (int): Номер столбца
+            size (int): Размер выборки
+        """
+        values = self._columns[column]
+        step = max(1, len(values) // size)
+        return values[::step][:size]
+
+    async def _fetch_in_background(self, cursor):
+        try:
+            page = await asyncio.to_thread(self._fetch_page, cursor)
+        except Exception as err:
+            # Иначе ошибка осталась бы в задаче, а прокрутка молча повторяла бы запрос
+            print(f"Ошибка загрузки страницы: {err!r}")
+            self._task = None
+            self._has_more = False
+            self.load_failed.emit(str(err))
+            return
+        # Загрузка завершена: представление может сразу запросить следующую страницу
+        self._task = None
+        self._add_page(page)
+
+    def _add_page(self, page):
+        if page.total is not None:
+            self.total = page.total
+            self.estimated = page.estimated
+        self._next_cursor = page.next_cursor
+        self._has_more = page.next_cursor is not None
+        if self._to_row is None:
+            self.append_rows(page.rows)
+        else:
+            self.append_rows([self._to_row(record) for record in page.rows], page.rows)
+        self.page_loaded.emit(page)
+
+
+def fit_columns_to_sample(view, sample_size=COLUMN_SAMPLE_ROWS, max_width=MAX_COLUMN_WIDTH):
+    """
+    Подбирает ширину столбцов по заголовкам и выборке строк модели
+
+    В отличие от ResizeToContents, измеряется не больше sample_size
+    значений на столбец независимо от числа строк.
+
+    Args:
+        view (QTableView): Таблица с моделью ColumnTableModel
+        sample_size (int): Сколько значений столбца измерять
+        max_width (int): Максимальная ширина столбца
+    """
+    model = view.model()
+    metrics = view.fontMetrics()
+    for column in range(model.columnCount()):
+        texts = [str(model.headerData(column, Qt.Orientation.Horizontal) or "")]
+        texts.extend(str(value) for value in model.column_sample(column, sample_size))
+        width = max(metrics.horizontalAdvance(text) for text in texts) + COLUMN_PADDING
+        view.setColumnWidth(column, min(width, max_width))
@@ -1,12 +1,13 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QLabel, QLineEdit, QCheckBox,
                              QPushButton, QFormLayout, QStackedWidget, QDialog,
-                             QTableWidget, QTableWidgetItem, QHeaderView,
+                             QTableView, QHeaderView,
                              QComboBox, QGroupBox, QMessageBox)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont
 from app.controllers.user_window_controller import Controller
 from app.controllers.bot_controller import BotController
+from app.gui.table_model import ColumnTableModel, fit_columns_to_sample
 from app.bot.generate_auth_code import generate_auth_code
 import asyncio
 
@@ -364,35 +365,30 @@ class Main_Window(QMainWindow):
         subscriptions_label.setStyleSheet("font-size: 16px; font-weight: bold;")
         layout.addWidget(subscriptions_label)
 
-        # Список подписок
-        if hasattr(user, 'subscribed_publications') and user.subscribed_publications:
+        # Список подписок вместе с последними выпусками загружается за один раз
+        subscriptions = self.window_controller.get_user_subscriptions(user.id)
+        if subscriptions:
             # Создаем таблицу с подписками
-            subscriptions_table = QTableWidget()
-            subscriptions_table.setColumnCount(3)
-            subscriptions_table.setHorizontalHeaderLabels(["Название", "Тип", "Статус"])
+            subscriptions_model = ColumnTableModel(["Название", "Тип", "Статус", "Выпуск"], parent=self)
+            subscriptions_model.set_rows(
+                [(pub.name, pub.publication_type, "Активна" if pub.on_sale else "Не активна", "")
+                 for pub in subscriptions],
+                subscriptions
+            )
+            subscriptions_table = QTableView()
+            subscriptions_table.setModel(subscriptions_model)
             subscriptions_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
             subscriptions_table.setStyleSheet("background-color: white; border: 1px solid #ddd;")
+            fit_columns_to_sample(subscriptions_table)
             
-            # Заполняем таблицу данными о подписках
-            subscriptions_table.setRowCount(len(user.subscribed_publications))
-            for row, pub in enumerate(user.subscribed_publications):
-                subscriptions_table.setItem(row, 0, QTableWidgetItem(pub.name))
-                subscriptions_table.setItem(row, 1, QTableWidgetItem(pub.publication_type))
-                subscriptions_table.setItem(row, 2, QTableWidgetItem("Активна" if pub.on_sale else "Не активна"))
-                
-                # Добавляем кнопку для просмотра последнего выпуска
-                if hasattr(pub, 'issues') and pub.issues:
-                    latest_issue = None
-                    try:
-                        latest_issue = pub.get_latest_issue()
-                    except Exception:
-                        pass
-                        
-                    if latest_issue:
-                        issue_button = QPushButton("Последний выпуск")
-                        issue_button.setStyleSheet("background-color: #1e1e1e; color: white; padding: 5px;")
-                        issue_button.clicked.connect(lambda checked, i=latest_issue: self.show_issue_details(i))
-                        subscriptions_table.setCellWidget(row, 3, issue_button)
+            # Добавляем кнопки для просмотра последнего выпуска
+            for row, pub in enumerate(subscriptions):
+                latest_issue = pub.latest_issue
+                if latest_issue:
+                    issue_button = QPushButton("Последний выпуск")
+                    issue_button.setStyleSheet("background-color: #1e1e1e; color: white; padding: 5px;")
+                    issue_button.clicked.connect(lambda checked, i=latest_issue: self.show_issue_details(i))
+                    subscriptions_table.setIndexWidget(subscriptions_model.index(row, 3), issue_button)
             
             self.subscriptions_list = subscriptions_table
 
@@ -484,7 +480,7 @@ class Main_Window(QMainWindow):
             original_price = QLabel(f"{issue.cost} руб.")
             original_price.setStyleSheet("text-decoration: line-through;")
             
-            discount_price = issue.cost - (issue.cost * issue.discount / 100)
+            discount_price = issue.effective_price
             discounted_price = QLabel(f"{discount_price:.2f} руб. ({issue.discount}% скидка)")
             discounted_price.setStyleSheet("color: red; font-weight: bold;")
             
@@ -630,26 +626,35 @@ class Main_Window(QMainWindow):
         filter_layout.addWidget(print_combo)
         
         layout.addLayout(filter_layout)
-        layout.addSpacing(15)
-        
-        # Список доступных изданий        
-        publications_table = QTableWidget()
-        publications_table.setColumnCount(2)
-        publications_table.setHorizontalHeaderLabels(["Название", "Тип"])
+        layout.addSpacing(10)
+        
+        # Поиск по названию и описанию
+        search_input = QLineEdit()
+        search_input.setPlaceholderText("Поиск по названию и описанию")
+        search_input.setStyleSheet("padding: 8px; background-color: white; border: 1px solid #ddd;")
+        layout.addWidget(search_input)
+        layout.addSpacing(10)
+        
+        # Список доступных изданий: следующие страницы загружаются при прокрутке
+        publications_table = QTableView()
+        publications_table.setModel(ColumnTableModel(
+            ["Название", "Тип"], to_row=lambda pub: (pub.name, pub.publication_type), parent=dialog
+        ))
         publications_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         publications_table.setStyleSheet("background-color: white; border: 1px solid #ddd;")
-        publications_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        
-        # Получаем список публикаций
-        publications = self.window_controller.get_all_publications()
-        self.publications_data = publications  # Сохраняем данные о публикациях
+        publications_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         
-        publications_table.setRowCount(len(publications))
+        # Получаем первую страницу каталога
+        self.fill_publications_table(publications_table, "")
         
-        for row, publication in enumerate(publications):
-            publications_table.setItem(row, 0, QTableWidgetItem(publication.name))
-            publications_table.setItem(row, 1, QTableWidgetItem(publication.publication_type))
-            # publications_table.setItem(row, 2, QTableWidgetItem(str(publication.cost)))
+        # Запрос отправляется после паузы в наборе, а не на каждую букву
+        search_timer = QTimer(dialog)
+        search_timer.setSingleShot(True)
+        search_timer.setInterval(300)
+        search_timer.timeout.connect(lambda: self.fill_publications_table(
+            publications_table, search_input.text()
+        ))
+        search_input.textChanged.connect(search_timer.start)
         
         layout.addWidget(publications_table)
         
@@ -678,28 +683,26 @@ class Main_Window(QMainWindow):
         
         dialog.exec()
     
+    def fill_publications_table(self, publications_table, query):
+        """Показывает в таблице каталога издания, найденные по строке поиска"""
+        model = publications_table.model()
+        model.reset(fetch_page=lambda cursor: self.window_controller.get_publications_page(query, after=cursor))
+        model.fetchMore()
+    
     def handle_subscription(self, dialog, publications_table):
         '''Обрабатывает подписку пользователя на выбранное издание'''
         # Получаем выбранные строки
-        selected_items = publications_table.selectedItems()
+        selected_rows = publications_table.selectionModel().selectedRows()
         
-        if not selected_items:
+        if not selected_rows:
             QMessageBox.warning(self, "Предупреждение", "Выберите издание для подписки")
             return
         
-        # Получаем индекс выбранной строки
-        selected_row = publications_table.row(selected_items[0])
-        
         # Получаем выбранную публикацию
-        selected_publication = self.publications_data[selected_row]
-        
-        # Проверяем, не подписан ли пользователь уже на это издание
-        if self.current_user.has_subscription(publication_id=selected_publication.id):
-            QMessageBox.warning(self, "Предупреждение", "Вы уже подписаны на это издание")
-            return
+        selected_publication = publications_table.model().key(selected_rows[0].row())
         
-        # Пытаемся оформить подписку
-        success = self.window_controller.subscribe_user_to_publication(
+        # Пытаемся оформить подписку (повторная подписка не создается)
+        success, error = self.window_controller.subscribe_user_to_publication(
             self.current_user.id, selected_publication.id
         )
         
@@ -710,7 +713,7 @@ class Main_Window(QMainWindow):
             self.current_user = self.window_controller.get_user_by_id(self.current_user.id)
             self.refresh_personal_cabinet()
         else:
-            QMessageBox.warning(self, "Ошибка", "Не удалось оформить подписку. Пожалуйста, попробуйте позже.")
+            QMessageBox.warning(self, "Предупреждение", error)
 
 
     def show_personal_cabinet(self, user):
@@ -0,0 +1,37 @@
+import logging
+from app.database.counters import rebuild_counters
+
+
+logger = logging.getLogger(__name__)
+
+
+def repair_counters(engine=None) -> dict[str, int]:
+    '''
+    Задание сверки счетчиков: пересчитывает subscribers_count, open_deliveries_count
+    и complaints_count по исходным таблицам одной транзакцией
+
+    Нужно после ручных правок данных с отключенными триггерами или восстановления
+    из резервной копии; в обычной работе счетчики ведут триггеры.
+
+    Arguments:
+        engine (Engine, optional): Движок БД, по умолчанию основная БД приложения
+
+    Returns:
+        dict[str, int]: {счетчик: количество исправленных строк}
+    '''
+    if engine is None:
+        from app.database.session import engine
+
+    with engine.begin() as connection:
+        fixed = rebuild_counters(connection)
+
+    for counter, rows in fixed.items():
+        if rows:
+            logger.warning(f"Счетчик {counter} расходился в {rows} строках и пересчитан")
+
+    return fixed
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    print(repair_counters())
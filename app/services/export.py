@@ -0,0 +1,221 @@
+import csv
+import io
+import os
+import codecs
+import logging
+from sqlalchemy import Boolean, Text, cast
+from app.database.table_specs import TABLES
+
+
+logger = logging.getLogger(__name__)
+
+# Сколько строк читается из БД и записывается в Parquet за один раз
+CHUNK_ROWS = 10_000
+# Как часто (в строках) сообщать о ходе выгрузки CSV через COPY
+PROGRESS_ROWS = 10_000
+
+EXPORT_FORMATS = ('csv', 'parquet')
+
+# Оформление выгрузки одинаково для всех форматов и БД: столбцы называются
+# заголовками таблицы (TableSpec.headers), флаги в CSV - true/false
+# (так PostgreSQL приводит boolean к тексту), в Parquet - логический тип
+CSV_BOOLEANS = {True: 'true', False: 'false'}
+
+
+class ExportCancelled(Exception):
+    '''Выгрузка отменена пользователем'''
+
+
+class _CopyWriter:
+    '''
+    Файл для COPY ... TO STDOUT: считает выгруженные строки, сообщает о ходе
+    выгрузки и прерывает COPY при отмене
+    '''
+    def __init__(self, file, progress, cancel_event):
+        self.file = file
+        self.progress = progress
+        self.cancel_event = cancel_event
+        self.rows = 0
+        self._reported = 0
+
+    def write(self, data):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ExportCancelled()
+
+        self.file.write(data)
+        # Перевод строки внутри текстового значения тоже будет посчитан:
+        # для индикатора хода выгрузки такой точности достаточно
+        self.rows += data.count(b'\n')
+        if self.progress is not None and self.rows - self._reported >= PROGRESS_ROWS:
+            self._reported = self.rows
+            self.progress(self.rows)
+
+
+def _check_cancelled(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise ExportCancelled()
+
+
+def _csv_header(headers: list[str]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerow(headers)
+    # BOM нужен, чтобы Excel открыл файл в UTF-8
+    return codecs.BOM_UTF8 + buffer.getvalue().encode('utf-8')
+
+
+def _csv_value(value):
+    return CSV_BOOLEANS[value] if isinstance(value, bool) else value
+
+
+def _compile_copy_query(statement, dialect):
+    '''Компилирует запрос для COPY: флаги приводятся к тексту, IN (...) раскрывается'''
+    # COPY пишет boolean как t/f; после приведения к тексту - true/false, как в _stream_csv
+    statement = statement.with_only_columns(
+        *(cast(column, Text).label(column.key) if isinstance(column.type, Boolean) else column
+          for column in statement.selected_columns),
+        maintain_column_froms=True
+    )
+    # Раскрывающиеся параметры (IN) иначе остаются в тексте заготовками
+    # __[POSTCOMPILE_...], которые подставляет только execute SQLAlchemy
+    return statement.compile(dialect=dialect, compile_kwargs={'render_postcompile': True})
+
+
+def _copy_csv(connection, statement, file, progress, cancel_event) -> int:
+    '''Выгружает результат запроса в CSV командой COPY (PostgreSQL)'''
+    compiled = _compile_copy_query(statement, connection.dialect)
+    dbapi_connection = connection.connection.dbapi_connection
+    with dbapi_connection.cursor() as cursor:
+        # COPY не принимает параметры запроса: значения подставляет драйвер
+        query = cursor.mogrify(str(compiled), compiled.params).decode('utf-8')
+        writer = _CopyWriter(file, progress, cancel_event)
+        cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv)", writer)
+    return writer.rows
+
+
+def _stream_csv(connection, statement, file, progress, cancel_event) -> int:
+    '''Выгружает результат запроса в CSV порциями строк (БД без COPY)'''
+    text_file = io.TextIOWrapper(file, encoding='utf-8', newline='', write_through=True)
+    writer = csv.writer(text_file, lineterminator='\n')
+    rows = 0
+    result = connection.execution_options(yield_per=CHUNK_ROWS).execute(statement)
+    for chunk in result.partitions():
+        _check_cancelled(cancel_event)
+        writer.writerows(tuple(_csv_value(value) for value in row) for row in chunk)
+        rows += len(chunk)
+        if progress is not None:
+            progress(rows)
+    text_file.detach()
+    return rows
+
+
+def _arrow_schema(columns, names: list[str]):
+    import pyarrow as pa
+    from datetime import date, datetime
+
+    arrow_types = {
+        bool: pa.bool_(), int: pa.int64(), float: pa.float64(),
+        datetime: pa.timestamp('us'), date: pa.date32(), str: pa.string(),
+    }
+    fields = []
+    for column, name in zip(columns, names):
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            python_type = str
+        fields.append(pa.field(name, arrow_types.get(python_type, pa.string())))
+    return pa.schema(fields)
+
+
+def _write_parquet(connection, statement, headers, path, progress, cancel_event) -> int:
+    '''Выгружает результат запроса в Parquet порциями по CHUNK_ROWS строк'''
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(statement.selected_columns, headers)
+    rows = 0
+    # yield_per включает серверный курсор: в памяти не больше одной порции строк
+    result = connection.execution_options(yield_per=CHUNK_ROWS).execute(statement)
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in result.partitions():
+            _check_cancelled(cancel_event)
+            frame = pd.DataFrame.from_records(chunk, columns=schema.names)
+            writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+            rows += len(chunk)
+            if progress is not None:
+                progress(rows)
+    return rows
+
+
+def export_table(table_name: str, path: str, export_format: str = 'csv', sort_column: int = 0,
+                 descending: bool = False, filters: dict[int, str] | None = None,
+                 progress=None, cancel_event=None, session=None) -> int:
+    '''
+    Потоково выгружает таблицу панели администратора в файл CSV или Parquet
+
+    Выгружаются те же столбцы, фильтры и порядок строк, что видны в таблице;
+    столбцы в CSV и Parquet называются заголовками таблицы.
+    В PostgreSQL CSV формирует сама БД (COPY ... TO STDOUT), строки не
+    превращаются в объекты Python. Parquet пишется порциями по CHUNK_ROWS
+    строк с серверного курсора. Память не зависит от размера таблицы.
+    При отмене или ошибке недописанный файл удаляется.
+
+    Arguments:
+        table_name (str): Название таблицы из реестра TABLES
+        path (str): Путь к файлу выгрузки
+        export_format (str): 'csv' или 'parquet' (нужны pandas и pyarrow)
+        sort_column (int): Индекс столбца сортировки (0 - по id)
+        descending (bool): Сортировка по убыванию
+        filters (dict[int, str], optional): {индекс столбца: текст фильтра}
+        progress (Callable, optional): progress(rows) - количество выгруженных строк;
+            вызывается из потока выгрузки
+        cancel_event (threading.Event, optional): Установленное событие прерывает выгрузку
+        session (Session, optional): Сессия БД, по умолчанию новая сессия чтения
+
+    Returns:
+        int: Количество выгруженных строк
+
+    Raises:
+        ValueError: Если таблица или формат неизвестны или сортировка или фильтр
+            заданы по столбцу без индекса (см. TableSpec.check_query)
+        ExportCancelled: Если выгрузка отменена
+    '''
+    spec = TABLES.get(table_name)
+    if spec is None:
+        raise ValueError(f"Неизвестная таблица: {table_name}")
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Неизвестный формат выгрузки: {export_format}")
+    spec.check_query(sort_column, filters)
+
+    if session is None:
+        from app.database.session import get_session
+        with get_session(readonly=True) as session:
+            return export_table(table_name, path, export_format, sort_column, descending,
+                                filters, progress, cancel_event, session)
+
+    statement = spec.repository(session).get_rows_statement(
+        spec.statement, sort_index=sort_column, descending=descending, filters=filters
+    )
+    # Соединение берется так же, как для SELECT: с реплики, если она настроена
+    connection = session.connection(bind_arguments={'clause': statement})
+
+    try:
+        if export_format == 'parquet':
+            rows = _write_parquet(connection, statement, spec.headers, path, progress, cancel_event)
+        else:
+            with open(path, 'wb') as file:
+                file.write(_csv_header(spec.headers))
+                if connection.dialect.name == 'postgresql':
+                    rows = _copy_csv(connection, statement, file, progress, cancel_event)
+                else:
+                    rows = _stream_csv(connection, statement, file, progress, cancel_event)
+    except BaseException as err:
+        if os.path.exists(path):
+            os.remove(path)
+        # Исключение из write прерывает COPY; драйвер может вернуть его как свою ошибку
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled() from err
+        raise
+
+    logger.info(f"Таблица {table_name} выгружена в {path}: {rows} строк")
+    return rows
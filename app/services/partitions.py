@@ -0,0 +1,68 @@
+import logging
+from datetime import date
+from app.database.partitions import (
+    create_month_partition, get_month_partitions, detach_month_partition, month_start
+)
+
+
+logger = logging.getLogger(__name__)
+
+MONTHS_AHEAD = 2
+
+
+def maintain_delivery_partitions(engine=None, months_ahead: int = MONTHS_AHEAD,
+                                 retention_months: int | None = None) -> dict[str, list[str]]:
+    '''
+    Обслуживание секций поставок: создает секции будущих месяцев и отсоединяет
+    секции старше срока хранения
+
+    Секции создаются заранее, чтобы новые поставки не попадали в секцию DEFAULT.
+    Отсоединенная секция остается обычной таблицей: ее можно выгрузить
+    (pg_dump -t) и удалить, в запросах к deliveries она больше не участвует.
+    Запускать достаточно раз в сутки.
+
+    Arguments:
+        engine (Engine, optional): Движок БД, по умолчанию основная БД приложения
+        months_ahead (int): Сколько будущих месяцев должно иметь секции
+        retention_months (int, optional): Сколько месяцев истории оставлять
+            присоединенными; если не задано, секции не отсоединяются
+
+    Returns:
+        dict[str, list[str]]: {'created': [...], 'detached': [...]} - имена секций
+    '''
+    if engine is None:
+        from app.database.session import engine
+
+    result = {'created': [], 'detached': []}
+    if engine.dialect.name != 'postgresql':
+        logger.info("Секционирование поставок поддерживается только в PostgreSQL")
+        return result
+
+    today = date.today()
+    with engine.begin() as connection:
+        existing = get_month_partitions(connection)
+
+        for shift in range(months_ahead + 1):
+            month = month_start(today, shift)
+            if month not in existing:
+                result['created'].append(create_month_partition(connection, month))
+
+        if retention_months is not None:
+            cutoff = month_start(today, -retention_months)
+            for month, name in existing.items():
+                if month < cutoff:
+                    detach_month_partition(connection, name)
+                    result['detached'].append(name)
+
+    for name in result['created']:
+        logger.info(f"Создана секция {name}")
+    for name in result['detached']:
+        logger.warning(f"Секция {name} отсоединена от deliveries и ожидает архивации")
+
+    return result
+
+
+if __name__ == '__main__':
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    print(maintain_delivery_partitions(retention_months=int(sys.argv[1]) if len(sys.argv) > 1 else None))
@@ -0,0 +1,192 @@
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, func, case, and_, or_, not_, union, Date
+from app.database.models import Courier, Delivery, Complaint
+from app.database.models.rating_run_model import rating_runs
+from app.database.repositories import CourierRepository
+from app.database.instrumentation import instrumented
+
+
+logger = logging.getLogger(__name__)
+
+# Поставка считается вовремя, если доставлена не позже чем через ON_TIME_HOURS
+# после создания; недоставленная поставка после этого срока считается опоздавшей
+ON_TIME_HOURS = 48
+# Вес события уменьшается вдвое каждые HALF_LIFE_DAYS дней; события старше
+# WINDOW_DAYS (вес < 1/64) не читаются
+HALF_LIFE_DAYS = 30
+WINDOW_DAYS = 180
+# Априорные "вовремя доставленные" поставки: новый доставщик начинает с максимума,
+# а единичное опоздание не обрушивает рейтинг
+PRIOR_DELIVERIES = 5.0
+# Доля претензий на поставку, при которой рейтинг падает до минимума - 1 / COMPLAINT_WEIGHT
+COMPLAINT_WEIGHT = 5.0
+MIN_RATING = 1.0
+MAX_RATING = 5.0
+# Запас на транзакции, зафиксированные после начала прошлого пересчета
+SAFETY_OVERLAP = timedelta(minutes=5)
+BATCH_SIZE = 1000
+
+
+def compute_rating(resolved: float, on_time: float, complaints: float) -> float:
+    '''
+    Вычисляет рейтинг по взвешенным (с затуханием) количествам событий
+
+    Arguments:
+        resolved (float): Завершенные поставки - доставленные и просроченные
+        on_time (float): Поставки, доставленные вовремя
+        complaints (float): Претензии
+
+    Returns:
+        float: Рейтинг от MIN_RATING до MAX_RATING
+    '''
+    on_time_rate = (on_time + PRIOR_DELIVERIES) / (resolved + PRIOR_DELIVERIES)
+    complaint_rate = complaints / (resolved + PRIOR_DELIVERIES)
+    score = on_time_rate * max(0.0, 1.0 - COMPLAINT_WEIGHT * complaint_rate)
+    return round(MIN_RATING + (MAX_RATING - MIN_RATING) * score, 2)
+
+
+def _deadline(dialect_name: str):
+    # Срок доставки считается в БД, чтобы сравнение шло построчно без выгрузки поставок
+    if dialect_name == 'postgresql':
+        return Delivery.created_at + timedelta(hours=ON_TIME_HOURS)
+    if dialect_name == 'sqlite':
+        return func.datetime(Delivery.created_at, f'+{ON_TIME_HOURS} hours')
+    raise ValueError(f"Срок доставки не определен для диалекта {dialect_name}")
+
+
+def get_changed_couriers(session, now: datetime, full: bool = False) -> list[int]:
+    '''
+    Возвращает доставщиков, у которых появились события после прошлого пересчета
+
+    Событиями считаются новые поставки, доставки, претензии и истечение срока
+    недоставленной поставки. Все условия идут по индексам времени событий,
+    поэтому объем чтения пропорционален числу новых событий, а не истории.
+    Граница - начало последнего завершенного пересчета (rating_runs), а не
+    время обновления отдельных доставщиков: после сбоя на середине пересчета
+    события еще не обработанных доставщиков не пропадают. Если завершенных
+    пересчетов нет, возвращаются все доставщики.
+
+    Arguments:
+        session (Session): Сессия БД
+        now (datetime): Время начала пересчета
+        full (bool): Вернуть всех доставщиков (полный пересчет)
+
+    Returns:
+        list[int]: ID доставщиков по возрастанию
+    '''
+    last_run = session.scalar(select(func.max(rating_runs.c.started_at)))
+    if full or last_run is None:
+        return list(session.scalars(select(Courier.id).order_by(Courier.id)))
+
+    since = last_run - SAFETY_OVERLAP
+    overdue = timedelta(hours=ON_TIME_HOURS)
+    changed = union(
+        select(Courier.id).where(Courier.rating_updated_at.is_(None)),
+        select(Delivery.courier_id).where(Delivery.created_at > since),
+        select(Delivery.courier_id).where(Delivery.delivery_date > since),
+        select(Delivery.courier_id).where(
+            not_(Delivery.is_delivered),
+            Delivery.created_at > since - overdue,
+            Delivery.created_at <= now - overdue
+        ),
+        select(Complaint.courier_id).where(Complaint.created_at > since),
+    ).subquery()
+    return sorted(session.scalars(select(changed.c[0])))
+
+
+def _collect_activity(session, courier_ids: list[int], now: datetime) -> dict[int, list[float]]:
+    # Один агрегирующий запрос на таблицу: события сворачиваются по (доставщик, день),
+    # затухание применяется к дневным суммам
+    window_start = now - timedelta(days=WINDOW_DAYS)
+    overdue_cutoff = now - timedelta(hours=ON_TIME_HOURS)
+    deadline = _deadline(session.get_bind().dialect.name)
+
+    activity = {courier_id: [0.0, 0.0, 0.0] for courier_id in courier_ids}
+
+    def decay(day) -> float:
+        return 0.5 ** ((now.date() - day).days / HALF_LIFE_DAYS)
+
+    delivery_day = func.date(Delivery.created_at, type_=Date)
+    deliveries = session.execute(
+        select(
+            Delivery.courier_id,
+            delivery_day,
+            func.count(),
+            func.sum(case((and_(Delivery.is_delivered, Delivery.delivery_date <= deadline), 1), else_=0))
+        )
+        .where(
+            Delivery.courier_id.in_(courier_ids),
+            Delivery.created_at >= window_start,
+            or_(Delivery.is_delivered, Delivery.created_at < overdue_cutoff)
+        )
+        .group_by(Delivery.courier_id, delivery_day)
+    )
+    for courier_id, day, resolved, on_time in deliveries:
+        weight = decay(day)
+        activity[courier_id][0] += weight * resolved
+        activity[courier_id][1] += weight * on_time
+
+    complaint_day = func.date(Complaint.created_at, type_=Date)
+    complaints = session.execute(
+        select(Complaint.courier_id, complaint_day, func.count())
+        .where(Complaint.courier_id.in_(courier_ids), Complaint.created_at >= window_start)
+        .group_by(Complaint.courier_id, complaint_day)
+    )
+    for courier_id, day, count in complaints:
+        activity[courier_id][2] += decay(day) * count
+
+    return activity
+
+
+@instrumented('rating_engine.recompute_ratings')
+def recompute_ratings(session=None, full: bool = False, now: datetime | None = None) -> int:
+    '''
+    Пересчитывает рейтинги доставщиков по поставкам и претензиям
+
+    Рейтинг складывается из доли поставок, доставленных вовремя, и частоты
+    претензий на поставку; события взвешиваются с затуханием по возрасту.
+    По умолчанию пересчет инкрементальный - затрагивает только доставщиков
+    с новыми событиями. Затухание без новых событий учитывается полным
+    пересчетом (full=True), который достаточно запускать раз в сутки.
+
+    Arguments:
+        session (Session, optional): Сессия БД, по умолчанию новая сессия основной БД
+        full (bool): Пересчитать всех доставщиков
+        now (datetime, optional): Время пересчета, по умолчанию текущее
+
+    Returns:
+        int: Количество доставщиков с пересчитанным рейтингом
+    '''
+    if session is None:
+        from app.database.session import get_session
+        with get_session() as session:
+            return recompute_ratings(session, full, now)
+
+    now = now or datetime.now()
+    repo = CourierRepository(session)
+    courier_ids = get_changed_couriers(session, now, full)
+
+    updated = 0
+    for start in range(0, len(courier_ids), BATCH_SIZE):
+        batch = courier_ids[start:start + BATCH_SIZE]
+        activity = _collect_activity(session, batch, now)
+        rows = [
+            {'id': courier_id, 'rating': compute_rating(*counts), 'rating_updated_at': now}
+            for courier_id, counts in activity.items()
+        ]
+        if not repo.bulk_update(rows):
+            logger.error(f"Пересчет рейтинга остановлен, обновлено {updated} из {len(courier_ids)}")
+            # Пересчет не записывается как завершенный: следующий начнется с прежней границы
+            return updated
+        updated += len(rows)
+
+    session.execute(insert(rating_runs).values(started_at=now, full=full, couriers=updated))
+    repo.commit()
+    return updated
+
+
+if __name__ == '__main__':
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    print(recompute_ratings(full='--full' in sys.argv))
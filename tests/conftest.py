@@ -0,0 +1,107 @@
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+
+# Модуль app.database.session при импорте строит строку подключения из окружения;
+# тесты работают со своей БД SQLite и к PostgreSQL не подключаются
+for name, value in {'USER': 'test', 'PASSWORD': 'test', 'HOST': 'localhost',
+                    'PORT': '5432', 'DATABASE': 'test'}.items():
+    os.environ.setdefault(name, value)
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.controllers import admin_window_controller
+from app.controllers.admin_window_controller import AdminController
+from app.database.instrumentation import instrument_engine
+from app.database.models.base_model import Base
+from app.database.models import (User, Admin, Publisher, Publication, Issue,
+                                 Courier, Complaint, Delivery)
+
+
+# Количество строк в каждой таблице тестовой БД
+ROWS = 10_000
+
+
+def seed(connection, rows: int = ROWS) -> None:
+    '''Заполняет все таблицы панели администратора rows строками'''
+    now = datetime.now()
+    numbers = range(1, rows + 1)
+
+    connection.execute(insert(Publisher), [
+        {'name': f'Издательство {i}', 'owner': f'Владелец {i}'} for i in numbers
+    ])
+    connection.execute(insert(Publication), [
+        {'publication_type': 'newspaper', 'publisher_id': i, 'name': f'Издание {i}',
+         'description': f'Описание {i}'} for i in numbers
+    ])
+    connection.execute(insert(Issue), [
+        {'issue_number': i, 'issue_date': now - timedelta(days=i), 'issue_type': 'newspaper',
+         'publication_id': i, 'name': f'Выпуск {i}', 'description': f'Описание {i}',
+         'cost': 10.0} for i in numbers
+    ])
+    connection.execute(insert(User), [
+        {'first_name': f'Имя {i}', 'last_name': f'Фамилия {i}', 'phone_number': f'+7900{i:07d}',
+         'address': f'Адрес {i}'} for i in numbers
+    ])
+    connection.execute(insert(Admin), [
+        {'first_name': f'Имя {i}', 'last_name': f'Фамилия {i}', 'phone_number': f'+7901{i:07d}',
+         'address': f'Адрес {i}', 'salary': 1000.0, 'hashed_password': 'x'} for i in numbers
+    ])
+    connection.execute(insert(Courier), [
+        {'first_name': f'Имя {i}', 'last_name': f'Фамилия {i}', 'phone_number': f'+7902{i:07d}',
+         'salary': 1000.0} for i in numbers
+    ])
+    connection.execute(insert(Complaint), [
+        {'courier_id': i, 'description': f'Претензия {i}'} for i in numbers
+    ])
+    connection.execute(insert(Delivery), [
+        {'item_id': i, 'item_type': 'newspaper', 'recipient_name': f'Получатель {i}',
+         'recipient_address': f'Адрес {i}', 'recipient_phone': f'+7903{i:07d}',
+         'item_cost': 10.0, 'courier_id': i, 'is_delivered': bool(i % 2)} for i in numbers
+    ])
+
+
+@pytest.fixture(scope='session')
+def engine():
+    '''БД SQLite в памяти, заполненная ROWS строками в каждой таблице, с замером запросов'''
+    engine = create_engine('sqlite://', poolclass=StaticPool,
+                           connect_args={'check_same_thread': False})
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        seed(connection)
+    instrument_engine(engine)
+    return engine
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def test_get_session(session_factory):
+    '''Замена app.database.session.get_session, работающая с тестовой БД'''
+    @contextmanager
+    def get_session(readonly: bool = False):
+        session = session_factory()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    return get_session
+
+
+@pytest.fixture
+def admin_controller(monkeypatch, test_get_session):
+    '''Контроллер панели администратора, работающий с тестовой БД'''
+    monkeypatch.setattr(admin_window_controller, 'get_session', test_get_session)
+    return AdminController()
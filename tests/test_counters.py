@@ -0,0 +1,107 @@
+import os
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, insert, delete, select
+from sqlalchemy.orm import Session
+
+from app.database.counters import create_counter_triggers, rebuild_counters
+from app.database.migrations import m0006_partition_deliveries
+from app.database.models.base_model import Base
+from app.database.models import Publisher, Publication, Issue, Courier, Delivery
+from app.database.repositories import DeliveryRepository
+
+
+# Проверка на PostgreSQL (секционированные поставки, m0006) выполняется, только
+# если задана пустая тестовая БД: таблицы в ней создаются и удаляются тестом
+TEST_DATABASE_URL = os.environ.get('TEST_DATABASE_URL')
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        create_counter_triggers(connection)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def postgresql_engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL не задан")
+    engine = create_engine(TEST_DATABASE_URL)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        create_counter_triggers(connection)
+        m0006_partition_deliveries.upgrade(connection)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def _open_count(session, courier_id) -> int:
+    session.expire_all()
+    return session.scalar(select(Courier.open_deliveries_count).where(Courier.id == courier_id))
+
+
+def check_open_deliveries_counter(engine) -> None:
+    '''Счетчик недоставленных поставок курьера при создании, доставке, переназначении и удалении'''
+    with engine.begin() as connection:
+        publisher_id = connection.scalar(
+            insert(Publisher).values(name='Издательство', owner='Владелец').returning(Publisher.id)
+        )
+        publication_id = connection.scalar(
+            insert(Publication).values(publication_type='newspaper', publisher_id=publisher_id,
+                                       name='Издание', description='Описание')
+            .returning(Publication.id)
+        )
+        issue_id = connection.scalar(
+            insert(Issue).values(issue_number=1, issue_date=datetime.now(), issue_type='newspaper',
+                                 publication_id=publication_id, name='Выпуск', description='Описание')
+            .returning(Issue.id)
+        )
+        first, second = connection.scalars(
+            insert(Courier).returning(Courier.id, sort_by_parameter_order=True),
+            [{'first_name': 'Имя', 'last_name': 'Фамилия', 'phone_number': f'+790000000{i}',
+              'salary': 1000.0} for i in (1, 2)]
+        ).all()
+        delivery_ids = connection.scalars(
+            insert(Delivery).returning(Delivery.id, sort_by_parameter_order=True),
+            [{'item_id': issue_id, 'item_type': 'newspaper', 'recipient_name': 'Получатель',
+              'recipient_address': 'Адрес', 'recipient_phone': '+79000000000',
+              'item_cost': 10.0, 'courier_id': first} for _ in range(3)]
+        ).all()
+
+    with Session(engine) as session:
+        repository = DeliveryRepository(session)
+        assert _open_count(session, first) == 3
+
+        # В PostgreSQL это перенос строки из горячей секции в секцию доставленных
+        assert repository.mark_as_delivered(delivery_ids[0])
+        assert _open_count(session, first) == 2
+        # Повторная отметка ничего не меняет
+        assert not repository.mark_as_delivered(delivery_ids[0])
+        assert _open_count(session, first) == 2
+
+        assert repository.bulk_update([{'id': delivery_ids[1], 'courier_id': second}])
+        assert _open_count(session, first) == 1
+        assert _open_count(session, second) == 1
+
+        session.execute(delete(Delivery).where(Delivery.id.in_(delivery_ids)))
+        session.commit()
+        assert _open_count(session, first) == 0
+        assert _open_count(session, second) == 0
+
+    # Пересчет по исходным таблицам не находит расхождений
+    with engine.begin() as connection:
+        assert rebuild_counters(connection)['couriers.open_deliveries_count'] == 0
+
+
+def test_open_deliveries_counter_sqlite(sqlite_engine):
+    check_open_deliveries_counter(sqlite_engine)
+
+
+def test_open_deliveries_counter_partitioned(postgresql_engine):
+    check_open_deliveries_counter(postgresql_engine)
@@ -0,0 +1,51 @@
+import codecs
+import csv
+
+import pytest
+from sqlalchemy.dialects.postgresql import psycopg2
+
+from app.database.table_specs import TABLES
+from app.services.export import export_table, _compile_copy_query
+
+
+TABLE = "Доставки"
+DELIVERED = TABLES[TABLE].headers.index("Доставлено")
+
+
+def test_csv_export_uses_table_headers_and_boolean_text(session_factory, tmp_path):
+    path = tmp_path / 'deliveries.csv'
+    with session_factory() as session:
+        rows = export_table(TABLE, str(path), 'csv', filters={0: '1'}, session=session)
+
+    with open(path, encoding='utf-8', newline='') as file:
+        assert file.read(1) == codecs.BOM_UTF8.decode('utf-8')
+        header, *lines = list(csv.reader(file))
+
+    assert rows == len(lines) == 1
+    assert header == TABLES[TABLE].headers
+    assert lines[0][DELIVERED] == 'true'
+
+
+def test_parquet_export_uses_table_headers(session_factory, tmp_path):
+    pytest.importorskip('pandas')
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = tmp_path / 'deliveries.parquet'
+    with session_factory() as session:
+        rows = export_table(TABLE, str(path), 'parquet', filters={0: '1'}, session=session)
+
+    table = pq.read_table(path)
+    assert rows == table.num_rows == 1
+    assert table.column_names == TABLES[TABLE].headers
+    assert table.column(DELIVERED).to_pylist() == [True]
+
+
+def test_copy_query_renders_expanding_parameters():
+    spec = TABLES[TABLE]
+    statement = spec.statement.where(spec.statement.selected_columns[0].in_([1, 2, 3]))
+    compiled = _compile_copy_query(statement, psycopg2.dialect())
+
+    assert 'POSTCOMPILE' not in str(compiled)
+    # Каждое значение IN - отдельный параметр в формате драйвера
+    assert sorted(value for value in compiled.params.values() if isinstance(value, int)) == [1, 2, 3]
+    for name in compiled.params:
+        assert f'%({name})s' in str(compiled)
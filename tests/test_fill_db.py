@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.database.models import Publisher
+from app.database.models.base_model import Base
+from app.database.repositories import PublisherRepository
+from utilities.fill_db import import_by_key
+
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _publisher(name: str, owner: str) -> dict:
+    return {'name': name, 'owner': owner, 'is_active': True}
+
+
+def test_repeated_keys_get_one_record(session):
+    repo = PublisherRepository(session)
+    rows = [_publisher('A', 'первый'), _publisher('A', 'второй'), _publisher('B', 'третий')]
+
+    ids = import_by_key(repo, rows, ['name'])
+
+    publishers = dict(session.execute(select(Publisher.name, Publisher.id)).all())
+    assert ids == [publishers['A'], publishers['A'], publishers['B']]
+    # Загружается первая строка с повторяющимся ключом
+    assert session.scalar(select(Publisher.owner).where(Publisher.name == 'A')) == 'первый'
+
+
+def test_reimport_is_idempotent(session):
+    repo = PublisherRepository(session)
+    rows = [_publisher('A', 'первый'), _publisher('B', 'второй'), _publisher('A', 'третий')]
+
+    first = import_by_key(repo, rows, ['name'])
+    second = import_by_key(repo, rows, ['name'])
+
+    assert first == second
+    assert session.scalar(select(func.count()).select_from(Publisher)) == 2
@@ -0,0 +1,122 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.schema import CreateIndex
+
+from app.database.migrations import (m0006_partition_deliveries, m0008_filter_indexes,
+                                     m0009_sort_indexes)
+from app.database.migrations.operations import get_index, backfill_in_batches
+from app.database.models.base_model import Base
+
+
+# Миграции секционированных поставок проверяются только на PostgreSQL: нужна
+# пустая тестовая БД, таблицы в ней создаются и удаляются тестом
+TEST_DATABASE_URL = os.environ.get('TEST_DATABASE_URL')
+
+DELIVERY_INDEXES = [
+    name for table_name, name in m0008_filter_indexes.INDEXES + m0009_sort_indexes.INDEXES
+    if table_name == 'deliveries'
+]
+
+
+@pytest.fixture
+def partitioned_engine():
+    '''БД PostgreSQL после m0006: поставки секционированы, индексов m0008/m0009 на них нет'''
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL не задан")
+    engine = create_engine(TEST_DATABASE_URL)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        m0006_partition_deliveries.upgrade(connection)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def _upgrade(engine, migrations) -> None:
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        for migration in migrations:
+            migration.upgrade(connection)
+
+
+def _prepare_cascaded(connection):
+    # Так индексы строила прежняя m0006: обычный CREATE INDEX по секционированной
+    # таблице, PostgreSQL сам создает и присоединяет индексы всех секций
+    for name in DELIVERY_INDEXES:
+        connection.execute(CreateIndex(get_index('deliveries', name)))
+
+
+def _prepare_unattached(connection):
+    # Индекс секции с тем же определением, не присоединенный к индексу таблицы
+    index = get_index('deliveries', DELIVERY_INDEXES[0])
+    definition = str(CreateIndex(index).compile(dialect=connection.dialect)).split(" ON deliveries ", 1)[1]
+    connection.execute(text(f"CREATE INDEX ix_manual_pending ON deliveries_pending {definition}"))
+
+
+@pytest.mark.parametrize('prepare', [None, _prepare_cascaded, _prepare_unattached])
+def test_filter_and_sort_indexes_after_partitioning(partitioned_engine, prepare):
+    if prepare is not None:
+        with partitioned_engine.begin() as connection:
+            prepare(connection)
+
+    migrations = [m0008_filter_indexes, m0009_sort_indexes]
+    _upgrade(partitioned_engine, migrations)
+    # Миграции без транзакции повторяются целиком после сбоя
+    _upgrade(partitioned_engine, migrations)
+
+    with partitioned_engine.connect() as connection:
+        leaves = connection.scalar(text(
+            "SELECT count(*) FROM pg_partition_tree('deliveries') WHERE isleaf"
+        ))
+        for name in DELIVERY_INDEXES:
+            assert connection.scalar(
+                text("SELECT indisvalid FROM pg_index WHERE indexrelid = CAST(:name AS regclass)"),
+                {'name': name}
+            ), name
+            # На каждой секции ровно один индекс, и он присоединен к индексу таблицы
+            assert connection.scalar(
+                text("SELECT count(*) FROM pg_partition_tree(CAST(:name AS regclass)) WHERE isleaf"),
+                {'name': name}
+            ) == leaves, name
+            definition = connection.scalar(
+                text("SELECT substring(pg_get_indexdef(CAST(:name AS regclass)) from ' USING .*')"),
+                {'name': name}
+            )
+            assert connection.scalar(
+                text(
+                    "SELECT count(*) FROM pg_index x JOIN pg_class t ON t.oid = x.indrelid "
+                    "WHERE t.relname = 'deliveries_pending' "
+                    "AND substring(pg_get_indexdef(x.indexrelid) from ' USING .*') = :definition"
+                ),
+                {'definition': definition}
+            ) == 1, name
+
+
+def test_backfill_walks_id_ranges():
+    engine = create_engine('sqlite://')
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, value INTEGER)"))
+        # Пропуски id и уже заполненные строки
+        connection.execute(
+            text("INSERT INTO items (id, value) VALUES (:id, :value)"),
+            [{'id': i, 'value': 1 if i % 3 == 0 else None} for i in range(5, 1000, 2)]
+        )
+        expected = connection.scalar(text("SELECT count(*) FROM items WHERE value IS NULL"))
+
+        updated = backfill_in_batches(connection, 'items', "value = id", "value IS NULL", batch_size=100)
+
+        assert updated == expected
+        assert connection.scalar(text("SELECT count(*) FROM items WHERE value IS NULL")) == 0
+        assert connection.scalar(text("SELECT count(*) FROM items WHERE value = 1")) > 0
+        # Повторный проход ничего не меняет
+        assert backfill_in_batches(connection, 'items', "value = id", "value IS NULL", batch_size=100) == 0
+    engine.dispose()
+
+
+def test_backfill_of_empty_table():
+    engine = create_engine('sqlite://')
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, value INTEGER)"))
+        assert backfill_in_batches(connection, 'items', "value = id", "value IS NULL") == 0
+    engine.dispose()
@@ -0,0 +1,47 @@
+import pytest
+
+from app.database.instrumentation import operation
+from app.database.repositories import (PublicationRepository, ComplaintRepository,
+                                       DeliveryRepository)
+from app.database.table_specs import TABLES
+
+
+# Страница таблицы администратора: COUNT(*) для общего количества и сама страница
+MAX_TABLE_STATEMENTS = 2
+
+
+@pytest.mark.parametrize('table_name, sort_column', [
+    (name, column) for name, spec in TABLES.items() for column in sorted(spec.sortable)
+])
+def test_table_page_statement_count(admin_controller, table_name, sort_column):
+    with operation(f'test {table_name}') as stats:
+        headers, page = admin_controller.get_table_data(table_name, sort_column=sort_column)
+
+    assert headers == TABLES[table_name].headers
+    assert len(page) == 100
+    assert page.total == 10_000
+    assert stats.statements <= MAX_TABLE_STATEMENTS, stats.summary()
+
+
+@pytest.mark.parametrize('table_name', list(TABLES))
+def test_table_next_page_statement_count(admin_controller, table_name):
+    _, first = admin_controller.get_table_data(table_name)
+    with operation(f'test {table_name}') as stats:
+        _, page = admin_controller.get_table_data(table_name, after=first.next_cursor)
+
+    assert len(page) == 100
+    assert stats.statements == 1, stats.summary()
+
+
+@pytest.mark.parametrize('repository, relation', [
+    (PublicationRepository, 'publisher'),
+    (ComplaintRepository, 'courier'),
+    (DeliveryRepository, 'courier'),
+])
+def test_entity_list_loads_relations_in_one_statement(session_factory, repository, relation):
+    with session_factory() as session, operation(f'test {repository.__name__}') as stats:
+        entities = repository(session).get_all().all()
+        related = [getattr(entity, relation).id for entity in entities]
+
+    assert len(related) == 10_000
+    assert stats.statements == 1, stats.summary()
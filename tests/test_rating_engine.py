@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.database.models.base_model import Base
+from app.database.models import Publisher, Publication, Issue, Courier, Delivery
+from app.database.models.rating_run_model import rating_runs
+from app.database.repositories import CourierRepository
+from app.services import rating_engine
+
+
+START = datetime(2026, 1, 1, 12, 0)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _add_couriers(session, count: int) -> tuple[int, list[int]]:
+    publisher_id = session.scalar(
+        insert(Publisher).values(name='Издательство', owner='Владелец').returning(Publisher.id)
+    )
+    publication_id = session.scalar(
+        insert(Publication).values(publication_type='newspaper', publisher_id=publisher_id,
+                                   name='Издание', description='Описание')
+        .returning(Publication.id)
+    )
+    issue_id = session.scalar(
+        insert(Issue).values(issue_number=1, issue_date=START, issue_type='newspaper',
+                             publication_id=publication_id, name='Выпуск', description='Описание')
+        .returning(Issue.id)
+    )
+    courier_ids = session.scalars(
+        insert(Courier).returning(Courier.id, sort_by_parameter_order=True),
+        [{'first_name': 'Имя', 'last_name': 'Фамилия', 'phone_number': f'+790000000{i}',
+          'salary': 1000.0} for i in range(count)]
+    ).all()
+    session.commit()
+    return issue_id, courier_ids
+
+
+def _add_deliveries(session, issue_id: int, courier_ids: list[int], created_at: datetime) -> None:
+    session.execute(insert(Delivery), [
+        {'item_id': issue_id, 'item_type': 'newspaper', 'recipient_name': 'Получатель',
+         'recipient_address': 'Адрес', 'recipient_phone': '+79000000000', 'item_cost': 10.0,
+         'courier_id': courier_id, 'created_at': created_at}
+        for courier_id in courier_ids
+    ])
+    session.commit()
+
+
+def test_interrupted_run_keeps_watermark(session, monkeypatch):
+    issue_id, courier_ids = _add_couriers(session, 3)
+    assert rating_engine.recompute_ratings(session, now=START) == 3
+
+    # Новые события у всех доставщиков, пересчет прерывается после первого пакета
+    _add_deliveries(session, issue_id, courier_ids, START + timedelta(minutes=10))
+    monkeypatch.setattr(rating_engine, 'BATCH_SIZE', 1)
+    bulk_update = CourierRepository.bulk_update
+    calls = []
+
+    def failing_bulk_update(self, rows):
+        calls.append(rows)
+        return bulk_update(self, rows) if len(calls) == 1 else False
+
+    monkeypatch.setattr(CourierRepository, 'bulk_update', failing_bulk_update)
+    assert rating_engine.recompute_ratings(session, now=START + timedelta(hours=1)) == 1
+    monkeypatch.setattr(CourierRepository, 'bulk_update', bulk_update)
+
+    # Граница - последний завершенный пересчет, события остальных доставщиков не потеряны
+    assert session.scalar(select(rating_runs.c.started_at).order_by(rating_runs.c.id.desc())) == START
+    assert rating_engine.get_changed_couriers(session, START + timedelta(hours=2)) == courier_ids
+
+
+def test_incremental_run_after_completed_run(session):
+    issue_id, courier_ids = _add_couriers(session, 3)
+    assert rating_engine.recompute_ratings(session, now=START) == 3
+    assert rating_engine.get_changed_couriers(session, START + timedelta(hours=1)) == []
+
+    _add_deliveries(session, issue_id, courier_ids[1:2], START + timedelta(minutes=10))
+    assert rating_engine.recompute_ratings(session, now=START + timedelta(hours=1)) == 1
+    assert rating_engine.get_changed_couriers(session, START + timedelta(hours=2)) == []
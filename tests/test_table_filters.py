@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import Column
+from sqlalchemy.sql.elements import Label
+from sqlalchemy.sql.functions import Function
+
+from app.database.table_specs import TABLES
+
+
+def _index_leads(table) -> set[tuple[str, str]]:
+    '''Первые выражения индексов таблицы: ('column' | 'lower', имя столбца)'''
+    leads = set()
+    for index in table.indexes:
+        first = index.expressions[0]
+        if isinstance(first, Label):
+            first = first.element
+        if isinstance(first, Function) and first.name == 'lower':
+            leads.add(('lower', next(iter(first.clauses)).key))
+        elif isinstance(first, Column):
+            leads.add(('column', first.key))
+    return leads
+
+
+@pytest.mark.parametrize('table_name', list(TABLES))
+def test_filterable_columns_are_indexed(table_name):
+    spec = TABLES[table_name]
+    columns = spec.statement.selected_columns
+    for index in sorted(spec.filterable):
+        column = columns[index]
+        assert isinstance(column, Column), f"{spec.headers[index]}: фильтр по выражению"
+        python_type = column.type.python_type
+        if column.primary_key or python_type is bool:
+            continue
+        kind = 'lower' if python_type is str else 'column'
+        assert (kind, column.key) in _index_leads(column.table), \
+            f"{table_name}.{spec.headers[index]}: нет индекса для фильтра"
+
+
+def test_text_filter_matches_prefix(admin_controller):
+    _, page = admin_controller.get_table_data("Пользователи", filters={2: "Фамилия 999"})
+
+    assert sorted(row[2] for row in page) == ["Фамилия 999"] + [f"Фамилия 999{i}" for i in range(10)]
+
+
+def test_text_filter_escapes_wildcards(admin_controller):
+    _, page = admin_controller.get_table_data("Пользователи", filters={2: "%"})
+
+    assert len(page) == 0
+
+
+def test_filter_on_unindexed_column_is_rejected():
+    spec = TABLES["Публикации"]
+    with pytest.raises(ValueError):
+        spec.check_query(filters={3: "Издательство 1"})
+
+    # Пустой фильтр не применяется и не проверяется
+    spec.check_query(filters={3: " "})
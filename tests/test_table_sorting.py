@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import Column
+
+from app.database.table_specs import TABLES
+
+
+def _keyset_index_keys(table) -> set[tuple[str, str]]:
+    '''Пары первых двух столбцов индексов таблицы'''
+    keys = set()
+    for index in table.indexes:
+        columns = index.expressions[:2]
+        if len(columns) == 2 and all(isinstance(column, Column) for column in columns):
+            keys.add((columns[0].key, columns[1].key))
+    return keys
+
+
+@pytest.mark.parametrize('table_name', list(TABLES))
+def test_sortable_columns_have_keyset_indexes(table_name):
+    spec = TABLES[table_name]
+    columns = spec.statement.selected_columns
+    for index in sorted(spec.sortable - {0}):
+        column = columns[index]
+        assert isinstance(column, Column), f"{spec.headers[index]}: сортировка по выражению"
+        assert not column.nullable, f"{spec.headers[index]}: NULL не попадает в индекс по убыванию"
+        assert (column.key, 'id') in _keyset_index_keys(column.table), \
+            f"{table_name}.{spec.headers[index]}: нет индекса (столбец, id)"
+
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_sorted_pages_follow_keyset_order(admin_controller, descending):
+    # Столбец 2 - фамилия доставщика
+    _, first = admin_controller.get_table_data("Доставщики", limit=30, sort_column=2,
+                                               descending=descending)
+    _, second = admin_controller.get_table_data("Доставщики", after=first.next_cursor, limit=30,
+                                                sort_column=2, descending=descending)
+
+    keys = [(row[2], int(row[0])) for row in list(first) + list(second)]
+    assert keys == sorted(keys, reverse=descending)
+
+
+def test_sort_on_unindexed_column_is_rejected(admin_controller):
+    # Имя издательства - столбец связанной таблицы, индекса (столбец, id) для него нет
+    headers, page = admin_controller.get_table_data("Публикации", sort_column=3)
+
+    assert headers == []
+    assert len(page) == 0
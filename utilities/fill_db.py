@@ -1,10 +1,69 @@
-import csv
 from datetime import datetime
-from app.database.models import User, Publication, Publisher, Issue
+from sqlalchemy import select, insert, tuple_
+from app.database.models import User
 from app.database.repositories import UserRepository, PublicationRepository, PublisherRepository, IssueRepository
 from app.database.session import get_session
+from app.database.unit_of_work import uow
 from .csv_operations import read_csv
-import random
+
+
+# Сколько ключей проверяется одним запросом при сопоставлении строк CSV с записями БД
+IMPORT_BATCH_SIZE = 500
+
+
+def import_by_key(repo, rows: list[dict], key_cols: list[str]) -> list[int]:
+    """
+    Загружает строки, сопоставляя их с записями БД по естественному ключу key_cols:
+    найденные записи обновляются, остальные вставляются с ID из последовательности.
+    ID из CSV не назначаются, поэтому повторная загрузка не затрагивает записи,
+    созданные приложением, и не создает дубликатов.
+    
+    Returns:
+        list[int]: ID записей БД в порядке rows (по ним разрешаются ссылки
+            на номер строки в других CSV); строкам с одинаковым ключом - один ID
+    """
+    model = repo.model_class
+    key_columns = [getattr(model, column) for column in key_cols]
+    keys = [tuple(row[column] for column in key_cols) for row in rows]
+    # Строки с повторяющимся ключом - одна запись БД; загружается первая из них
+    unique_rows = {}
+    for key, row in zip(keys, rows):
+        unique_rows.setdefault(key, row)
+    unique_keys = list(unique_rows)
+    
+    existing = {}
+    for start in range(0, len(unique_keys), IMPORT_BATCH_SIZE):
+        found = repo.session.execute(
+            select(model.id, *key_columns)
+            .where(tuple_(*key_columns).in_(unique_keys[start:start + IMPORT_BATCH_SIZE]))
+        )
+        existing.update((tuple(row[1:]), row[0]) for row in found)
+    
+    repo.bulk_update([
+        {'id': existing[key], **row} for key, row in unique_rows.items() if key in existing
+    ])
+    
+    new_keys = [key for key in unique_keys if key not in existing]
+    if new_keys:
+        # Порядок RETURNING совпадает с порядком строк, чтобы сопоставить ID ключам
+        inserted = repo.session.scalars(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            [unique_rows[key] for key in new_keys]
+        ).all()
+        existing.update(zip(new_keys, inserted))
+    
+    return [existing[key] for key in keys]
+
+
+def resolve_reference(ids: list[int], csv_id: str) -> int | None:
+    """
+    Переводит ссылку на номер строки другого CSV (начиная с 1) в ID записи БД
+    
+    Returns:
+        int | None: ID записи или None, если строки с таким номером нет или она не загружена
+    """
+    position = int(csv_id)
+    return ids[position - 1] if 1 <= position <= len(ids) else None
 
 
 def fill_db():
@@ -30,81 +89,127 @@ def fill_db():
         user_repo = UserRepository(session)
         publication_repo = PublicationRepository(session)
         publisher_repo = PublisherRepository(session)
-        show_item_repo = Issue(session)
+        show_item_repo = IssueRepository(session)
 
-        # Добавление издательств
-        for pub_data in publishers_data:
-            # Обработка первого столбца с BOM-маркером
-            name_key = next(key for key in pub_data.keys() if 'name' in key)
+        # Все таблицы загружаются одной транзакцией
+        with uow(session) as tx:
+            # Добавление издательств
+            publishers = []
+            for pub_data in publishers_data:
+                # Обработка первого столбца с BOM-маркером
+                name_key = next(key for key in pub_data.keys() if 'name' in key)
             
-            publisher = Publisher(
-                name=pub_data[name_key],
-                owner=pub_data['owner'],
-                is_active=pub_data['is_active'].lower() == 'true',
-                sales_start=datetime.strptime(pub_data['sales_start'], '%Y-%m-%d %H:%M:%S.%f')
-            )
-            publisher_repo.add(publisher)
-        publisher_repo.commit()
-        print("Издательства добавлены в БД")
-
-        # Добавление публикаций
-        for pub_data in publications_data:
-            # Обработка первого столбца с BOM-маркером
-            pub_type_key = next(key for key in pub_data.keys() if 'publication_type' in key)
+                publishers.append({
+                    'name': pub_data[name_key],
+                    'owner': pub_data['owner'],
+                    'is_active': pub_data['is_active'].lower() == 'true',
+                    'sales_start': datetime.strptime(pub_data['sales_start'], '%Y-%m-%d %H:%M:%S.%f')
+                })
+            # Издательство определяется названием
+            publisher_ids = import_by_key(publisher_repo, publishers, ['name'])
+            print("Издательства добавлены в БД")
+
+            # Добавление публикаций
+            publications = []
+            publication_rows = []
+            for row_number, pub_data in enumerate(publications_data):
+                # Обработка первого столбца с BOM-маркером
+                pub_type_key = next(key for key in pub_data.keys() if 'publication_type' in key)
+                # publisher_id в CSV - номер строки в файле издательств
+                publisher_id = resolve_reference(publisher_ids, pub_data['publisher_id'])
+                if publisher_id is None:
+                    print(f"Издание '{pub_data['name']}' пропущено: нет издательства {pub_data['publisher_id']}")
+                    continue
             
-            publication = Publication(
-                publication_type=pub_data[pub_type_key],
-                publisher_id=int(pub_data['publisher_id']),
-                on_sale=pub_data['on_sale'].lower() == 'true',
-                sales_start=datetime.strptime(pub_data['sales_start'], '%Y-%m-%d %H:%M:%S'),
-                name=random.choice([pub_data['name'], 'журнал']),
-                description=pub_data['description']
-            )
-            publication_repo.add(publication)
-        publication_repo.commit()
-        print("Публикации добавлены в БД")
-
-        # Добавление пользователей
-        for user_data in users_data:
-            # Обработка первого столбца с BOM-маркером
-            first_name_key = next(key for key in user_data.keys() if 'first_name' in key)
+                publications.append({
+                    'publication_type': pub_data[pub_type_key],
+                    'publisher_id': publisher_id,
+                    'on_sale': pub_data['on_sale'].lower() == 'true',
+                    'sales_start': datetime.strptime(pub_data['sales_start'], '%Y-%m-%d %H:%M:%S'),
+                    'name': pub_data['name'],
+                    'description': pub_data['description']
+                })
+                publication_rows.append(row_number)
+            # Издание определяется издательством и названием; ID раскладываются
+            # по номерам строк CSV (None для пропущенных строк)
+            publication_ids = [None] * len(publications_data)
+            for row_number, publication_id in zip(
+                publication_rows, import_by_key(publication_repo, publications, ['publisher_id', 'name'])
+            ):
+                publication_ids[row_number] = publication_id
+            print("Публикации добавлены в БД")
+
+            # Добавление пользователей
+            users = []
+            for user_data in users_data:
+                # Обработка первого столбца с BOM-маркером
+                first_name_key = next(key for key in user_data.keys() if 'first_name' in key)
             
-            user = User(
-                first_name=user_data[first_name_key],
-                last_name=user_data['last_name'],
-                middle_name=user_data['middle_name'] if user_data['middle_name'] else None,
-                phone_number=user_data['phone_number'],
-                email=user_data['email'] if user_data['email'] else None,
-                address=user_data['address'],
-                tg_chat_id=None,  # В CSV может быть пустое значение
-                ad_consent=user_data['ad_consent'].lower() == 'true',
-                registration_date=datetime.strptime(user_data['registration_date'], '%Y-%m-%d %H:%M:%S.%f'),
-                is_active=user_data['is_active'].lower() == 'true'
-            )
-            user_repo.add(user)
-        user_repo.commit()
-        print("Пользователи добавлены в БД")
-
-        # Добавление выпусков
-        for item_data in show_items_data:
-            # Обработка первого столбца с BOM-маркером
-            issue_number_key = next(key for key in item_data.keys() if 'issue_number' in key)
+                users.append({
+                    'first_name': user_data[first_name_key],
+                    'last_name': user_data['last_name'],
+                    'middle_name': user_data['middle_name'] if user_data['middle_name'] else None,
+                    'phone_number': user_data['phone_number'],
+                    'email': user_data['email'] if user_data['email'] else None,
+                    'address': user_data['address'],
+                    'tg_chat_id': None,  # В CSV может быть пустое значение
+                    'ad_consent': user_data['ad_consent'].lower() == 'true',
+                    'registration_date': datetime.strptime(user_data['registration_date'], '%Y-%m-%d %H:%M:%S.%f'),
+                    'is_active': user_data['is_active'].lower() == 'true'
+                })
+            # Email уникален: строка, чей email уже занят другим пользователем,
+            # пропускается, иначе ошибка уникальности отменила бы всю загрузку
+            emails = [user['email'] for user in users if user['email']]
+            email_owners = dict(session.execute(
+                select(User.email, User.phone_number).where(User.email.in_(emails))
+            ).all()) if emails else {}
+            importable = []
+            for user in users:
+                owner = email_owners.setdefault(user['email'], user['phone_number']) if user['email'] else None
+                if owner is not None and owner != user['phone_number']:
+                    print(f"Пользователь {user['phone_number']} пропущен: email {user['email']} уже занят")
+                    continue
+                importable.append(user)
             
-            show_item = Issue(
-                issue_number=int(item_data[issue_number_key]),
-                issue_date=datetime.strptime(item_data['issue_date'], '%Y-%m-%d %H:%M:%S'),
-                is_special_edition=item_data['is_special_edition'].lower() == 'true',
-                publication_type=item_data['publication_type'],
-                publication_series_id=int(item_data['publication_series_id']),
-                on_sale=item_data['on_sale'].lower() == 'true',
-                name=item_data['name'],
-                description=item_data['description'],
-                pg=int(float(item_data['pg'])) if item_data['pg'] else None,
-                cost=float(item_data['cost']) if item_data['cost'] else None,
-                discount=item_data['is_discount'].lower() == 'true' if item_data['is_discount'] else False
+            # Пользователь определяется номером телефона, повторная загрузка обновляет
+            # его данные, но не трогает привязку к Telegram и дату регистрации
+            user_repo.upsert(
+                importable, ['phone_number'],
+                ['first_name', 'last_name', 'middle_name', 'email', 'address', 'ad_consent', 'is_active']
             )
-            show_item_repo.add(show_item)
-        show_item_repo.commit()
-        print("Выпуски добавлены в БД")
+            print("Пользователи добавлены в БД")
+
+            # Добавление выпусков
+            show_items = []
+            for item_data in show_items_data:
+                # Обработка первого столбца с BOM-маркером
+                issue_number_key = next(key for key in item_data.keys() if 'issue_number' in key)
+                # publication_series_id в CSV - номер строки в файле изданий
+                publication_id = resolve_reference(publication_ids, item_data['publication_series_id'])
+                if publication_id is None:
+                    print(f"Выпуск '{item_data['name']}' пропущен: нет издания {item_data['publication_series_id']}")
+                    continue
+            
+                show_items.append({
+                    'issue_number': int(item_data[issue_number_key]),
+                    'issue_date': datetime.strptime(item_data['issue_date'], '%Y-%m-%d %H:%M:%S'),
+                    'is_special_edition': item_data['is_special_edition'].lower() == 'true',
+                    'issue_type': item_data['publication_type'],
+                    'publication_id': publication_id,
+                    'on_sale': item_data['on_sale'].lower() == 'true',
+                    'name': item_data['name'],
+                    'description': item_data['description'],
+                    'pg': int(float(item_data['pg'])) if item_data['pg'] else None,
+                    'cost': float(item_data['cost']) if item_data['cost'] else None,
+                    'is_discount': item_data['is_discount'].lower() == 'true' if item_data['is_discount'] else False,
+                    'discount': int(float(item_data['discount'])) if item_data['discount'] else None
+                })
+            # Выпуск определяется изданием и номером
+            import_by_key(show_item_repo, show_items, ['publication_id', 'issue_number'])
+            print("Выпуски добавлены в БД")
+
+        if tx.failed:
+            print('Ошибка загрузки данных, изменения отменены')
+            return
 
     print('Данные успешно загружены в базу данных')